@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Set
+from app.settings import settings
+from app.helpers.cache.invalidation import InvalidationBus, invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# Sent instead of the buffered events when a client fell behind or events may
+# have been lost; the client catches up through GET /api/contacts/changes/
+RESYNC = {"type": "resync"}
+
+
+class EventStream:
+    """
+    Bounded buffer of events for one open event stream.
+
+    Events may be pushed from any thread; they are consumed on the event loop
+    the stream was opened on.
+    """
+
+    def __init__(self, user_id: int, loop: asyncio.AbstractEventLoop, size: int):
+        self.user_id = user_id
+        self._loop = loop
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=size)
+        self.overflows = 0
+
+    def push(self, event: dict) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The loop is closed, the stream is going away with it
+            pass
+
+    def _put(self, event: dict) -> None:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Rather than blocking publishers or growing without bound, drop
+            # what the client has not read yet and ask it to resync
+            self.overflows += 1
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(RESYNC)
+
+    async def get(self, timeout: float) -> Optional[dict]:
+        """
+        Return the next event, or None if there was none within ``timeout``.
+        """
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ContactEventBroker:
+    """
+    Fans contact create/update/delete events out to open event streams.
+
+    Events published by this worker are delivered to its own streams directly
+    and carried to the other workers by the invalidation bus, so each worker
+    holds one Redis subscription however many clients are connected.
+    """
+
+    TOPIC = "contact-events"
+
+    def __init__(self, bus: InvalidationBus, buffer_size: int):
+        self.bus = bus
+        self.buffer_size = buffer_size
+        self._streams: Dict[int, Set[EventStream]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        bus.subscribe(self.TOPIC, self._on_event)
+
+    def publish(self, user_id: int, event_type: str, contact_ids: List[int]) -> None:
+        """
+        Notify every stream of the user, on any worker, of a change.
+        """
+        event = {"user_id": user_id, "type": event_type, "ids": contact_ids}
+        self.published += 1
+        self._deliver(event)
+        self.bus.publish(self.TOPIC, event)
+
+    def open(self, user_id: int) -> EventStream:
+        """
+        Open a stream of the user's events; must run on the event loop.
+        """
+        stream = EventStream(user_id, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            self._streams.setdefault(user_id, set()).add(stream)
+        return stream
+
+    def close(self, stream: EventStream) -> None:
+        with self._lock:
+            streams = self._streams.get(stream.user_id)
+            if streams is not None:
+                streams.discard(stream)
+                if not streams:
+                    del self._streams[stream.user_id]
+
+    def _deliver(self, event: dict) -> None:
+        with self._lock:
+            streams = list(self._streams.get(event.get("user_id"), ()))
+        for stream in streams:
+            stream.push({"type": event["type"], "ids": event["ids"]})
+        self.delivered += len(streams)
+
+    def _on_event(self, payload: Optional[dict]) -> None:
+        if payload is not None:
+            self._deliver(payload)
+            return
+        # The bus lost its connection, events of other workers may be missing
+        with self._lock:
+            streams = [s for streams in self._streams.values() for s in streams]
+        for stream in streams:
+            stream.push(RESYNC)
+
+    def stats(self) -> dict:
+        with self._lock:
+            streams = [s for streams in self._streams.values() for s in streams]
+        return {
+            "streams": len(streams),
+            "users": len(self._streams),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": sum(stream.overflows for stream in streams),
+        }
+
+
+def format_event(event: dict) -> str:
+    """
+    Render an event as a Server-Sent Events message.
+    """
+    data = json.dumps({"ids": event["ids"]} if "ids" in event else {})
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+async def stream_events(
+    broker: ContactEventBroker, user_id: int, heartbeat: float
+) -> AsyncIterator[str]:
+    """
+    Yield the user's events as Server-Sent Events until the client goes away.
+
+    A comment line is sent every ``heartbeat`` seconds without events, so
+    proxies keep the connection open and dead clients are noticed.
+    """
+    stream = broker.open(user_id)
+    try:
+        # Ask EventSource clients to reconnect after 5 s if the stream drops
+        yield "retry: 5000\n\n"
+        while True:
+            event = await stream.get(heartbeat)
+            yield ": heartbeat\n\n" if event is None else format_event(event)
+    finally:
+        broker.close(stream)
+
+
+contact_events = ContactEventBroker(
+    invalidation_bus, settings.CONTACTS_EVENTS_BUFFER_SIZE
+)
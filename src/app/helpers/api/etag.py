@@ -0,0 +1,62 @@
+from typing import Optional
+from fastapi import Response, status
+
+# Response header carrying the ETag; exposed to cross-origin clients so they
+# can send it back in If-None-Match
+ETAG_HEADER = "ETag"
+
+# Sent with every ETag: clients may keep the response, but must revalidate it
+# and shared caches must not store it
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(user_id: int, version: Optional[int], *parts) -> Optional[str]:
+    """
+    Build a weak ETag from the version of the user's contacts.
+
+    Args:
+        user_id (int): The owner of the resource.
+        version (Optional[int]): The version of the user's contacts, None when
+            it is unknown.
+        *parts: Anything else the response depends on, such as today's date.
+
+    Returns:
+        Optional[str]: The ETag, or None when no version is known.
+    """
+    if version is None:
+        return None
+    return 'W/"' + ".".join(str(part) for part in (user_id, version, *parts)) + '"'
+
+
+def etag_headers(etag: Optional[str]) -> dict:
+    """
+    Return the response headers advertising ``etag``, if any.
+    """
+    if etag is None:
+        return {}
+    return {ETAG_HEADER: etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(
+    etag: Optional[str], if_none_match: Optional[str]
+) -> Optional[Response]:
+    """
+    Return a 304 response when the client already holds ``etag``.
+
+    Args:
+        etag (Optional[str]): The current ETag of the resource.
+        if_none_match (Optional[str]): The If-None-Match request header.
+
+    Returns:
+        Optional[Response]: An empty 304 response, or None if the resource has
+        to be sent.
+    """
+    if etag is None or if_none_match is None:
+        return None
+    # Weak comparison, as required for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=etag_headers(etag)
+        )
+    return None
@@ -0,0 +1,139 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+from fastapi import HTTPException, status
+
+# Response header that carries the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Encode the position after the last returned row as an opaque cursor.
+
+    Args:
+        last_id (int): The ID of the last row of the current page.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): The opaque cursor received from the client.
+
+    Returns:
+        int: The ID of the last row of the previous page.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = payload["id"]
+        if not isinstance(last_id, int):
+            raise ValueError("cursor id must be an integer")
+        return last_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+class SyncPosition(NamedTuple):
+    """
+    Where a delta sync cut short by its page size resumes.
+    """
+
+    # Database time the next sync starts from, once every page is sent
+    until: datetime
+    # Last contact sent, in (updated_at, id) order
+    updated_at: Optional[datetime]
+    contact_id: Optional[int]
+    # Last tombstone sent
+    tombstone_id: Optional[int]
+
+
+def encode_sync_token(
+    since: Optional[datetime], position: Optional[SyncPosition] = None
+) -> str:
+    """
+    Encode the point a delta sync resumes from as an opaque token.
+
+    Args:
+        since (Optional[datetime]): Database time from which changes are sent
+            next, None for a full sync.
+        position (Optional[SyncPosition]): Where the next page starts, when
+            the changes since ``since`` did not fit in one response.
+
+    Returns:
+        str: A URL-safe token string.
+    """
+    payload = {"since": since.isoformat() if since else None}
+    if position is not None:
+        payload["until"] = position.until.isoformat()
+        payload["after"] = [
+            position.updated_at.isoformat() if position.updated_at else None,
+            position.contact_id,
+        ]
+        payload["deleted_after"] = position.tombstone_id
+    encoded = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(encoded).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> Tuple[Optional[datetime], Optional[SyncPosition]]:
+    """
+    Decode a token produced by encode_sync_token.
+
+    Args:
+        token (str): The opaque token received from the client.
+
+    Returns:
+        Tuple[Optional[datetime], Optional[SyncPosition]]: The database time
+        changes are requested from, and where the next page starts if any.
+
+    Raises:
+        HTTPException: If the token is malformed or its times have no offset.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        since = payload["since"]
+        if since is not None:
+            since = _aware(payload["since"])
+        if "until" not in payload:
+            if since is None:
+                raise ValueError("sync token without a start")
+            return since, None
+        updated_at, contact_id = payload["after"]
+        tombstone_id = payload["deleted_after"]
+        for value in (contact_id, tombstone_id):
+            if value is not None and not isinstance(value, int):
+                raise ValueError("sync token ids must be integers")
+        return since, SyncPosition(
+            _aware(payload["until"]),
+            datetime.fromisoformat(updated_at) if updated_at else None,
+            contact_id,
+            tombstone_id,
+        )
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync token"
+        )
+
+
+def _aware(value: str) -> datetime:
+    # Times compared with now() in Python must carry an offset
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        raise ValueError("sync token times must have an offset")
+    return moment
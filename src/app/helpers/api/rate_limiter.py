@@ -1,11 +1,359 @@
-from slowapi import Limiter
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
+import inspect
+import logging
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, Optional
+import redis
 from fastapi import Request
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
 from starlette import status
+from app.settings import settings
+from app.helpers.cache.redis_client import redis_client
 
-limiter = Limiter(key_func=get_remote_address)
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_HEADERS = ["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset"]
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_RATE = re.compile(r"^\s*(\d+)\s*/\s*(\d+)?\s*(second|minute|hour|day)s?\s*$")
+
+# Sliding-window log: one sorted-set member per admitted request, scored by
+# its timestamp in ms. Trimming, counting and admitting happen in one atomic
+# call, so every worker sees the same window for a key.
+# KEYS[1] = window key; ARGV = limit, window_ms, member
+# Returns {allowed, remaining, reset_ms}
+SLIDING_WINDOW_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+local allowed = 0
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    count = count + 1
+    allowed = 1
+end
+redis.call('PEXPIRE', KEYS[1], window)
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local reset = window
+if oldest[2] then
+    reset = tonumber(oldest[2]) + window - now
+end
+return {allowed, limit - count, reset}
+"""
+
+
+@dataclass
+class RateLimitState:
+    """
+    Outcome of one rate limit check, rendered as ``RateLimit-*`` headers.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_seconds: int
+
+    def headers(self) -> dict:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(max(self.remaining, 0)),
+            "RateLimit-Reset": str(self.reset_seconds),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.reset_seconds)
+        return headers
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a client has used up its quota for an endpoint.
+    """
+
+    def __init__(self, rate: str, state: RateLimitState):
+        super().__init__(rate)
+        self.detail = f"{rate} exceeded"
+        self.state = state
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Parse a rate such as ``"5/minute"`` or ``"100/15 minutes"``.
+
+    Returns:
+        tuple: The number of requests and the window length in seconds.
+    """
+    match = _RATE.match(rate)
+    if match is None:
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+    amount, multiplier, period = match.groups()
+    return int(amount), int(multiplier or 1) * _PERIODS[period]
+
+
+class RedisRateLimitStorage:
+    """
+    Sliding-window counters shared by every worker through Redis.
+
+    Each check is a single EVALSHA of SLIDING_WINDOW_SCRIPT. Keys expire with
+    their window, so idle clients cost no memory.
+    """
+
+    def __init__(self, client: redis.Redis, prefix: str = "ratelimit"):
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(SLIDING_WINDOW_SCRIPT)
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitState:
+        allowed, remaining, reset_ms = self._script(
+            keys=[f"{self.prefix}:{key}"],
+            args=[limit, window_seconds * 1000, uuid.uuid4().hex],
+        )
+        return RateLimitState(
+            allowed=bool(allowed),
+            limit=limit,
+            remaining=int(remaining),
+            reset_seconds=max(1, -(-int(reset_ms) // 1000)),
+        )
+
+
+class _LocalWindow:
+    __slots__ = ("index", "window_seconds", "pending", "global_count")
+
+    def __init__(self, index: int, window_seconds: int):
+        self.index = index
+        self.window_seconds = window_seconds
+        # Hits admitted here and not yet pushed to Redis
+        self.pending = 0
+        # Hits of every worker in this window as of the last sync
+        self.global_count = 0
+
+
+class HybridRateLimitStorage:
+    """
+    Fixed-window counters decided in-process and reconciled with Redis in batches.
+
+    Each worker admits requests against its last known global count plus the
+    hits it has admitted since. A background thread pushes those hits to Redis
+    every ``sync_interval`` seconds with one pipelined INCRBY per active key,
+    and the replies bring back what the other workers consumed. A check never
+    touches the network; the price is that the global limit may be overshot by
+    what the other workers admit within one sync interval.
+    """
+
+    def __init__(
+        self, client: redis.Redis, sync_interval: float, prefix: str = "ratelimit"
+    ):
+        self.client = client
+        self.sync_interval = sync_interval
+        self.prefix = prefix
+        self._windows: dict[str, _LocalWindow] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def hit(self, key: str, limit: int, window_seconds: int) -> RateLimitState:
+        now = time.time()
+        index = int(now // window_seconds)
+        reset_seconds = max(1, int((index + 1) * window_seconds - now))
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window.index != index:
+                window = self._windows[key] = _LocalWindow(index, window_seconds)
+            used = window.global_count + window.pending
+            if used >= limit:
+                return RateLimitState(False, limit, 0, reset_seconds)
+            window.pending += 1
+        return RateLimitState(True, limit, limit - used - 1, reset_seconds)
+
+    def sync(self) -> None:
+        """
+        Push pending hits to Redis and pull the global counts, in one round trip.
+        """
+        current = int(time.time())
+        with self._lock:
+            batch = []
+            for key, window in list(self._windows.items()):
+                if (window.index + 1) * window.window_seconds <= current:
+                    # The window is over; forget it so memory stays bounded
+                    del self._windows[key]
+                    continue
+                batch.append((key, window, window.pending))
+                window.pending = 0
+        if not batch:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, window, pending in batch:
+            redis_key = f"{self.prefix}:{key}:{window.index}"
+            pipe.incrby(redis_key, pending)
+            pipe.expireat(redis_key, (window.index + 1) * window.window_seconds + 1)
+        try:
+            replies = pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Rate limit sync failed: %s", err)
+            with self._lock:
+                for key, window, pending in batch:
+                    window.pending += pending
+            return
+        with self._lock:
+            for (key, window, pending), total in zip(batch, replies[::2]):
+                window.global_count = int(total)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="rate-limit-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.sync()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.sync_interval):
+            self.sync()
+
+
+def get_rate_limit_key(request: Request) -> str:
+    """
+    Rate limit authenticated requests per user and anonymous ones per IP.
+
+    Limited endpoints resolve the current user before their body runs, and the
+    auth dependency leaves the user's ID on ``request.state``, so the key costs
+    no lookup. Requests without a resolved user are limited by IP.
+    """
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is not None:
+        return f"user:{user_id}"
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+class RateLimiter:
+    """
+    Per-endpoint rate limits checked against a shared storage.
+
+    Used as ``@limiter.limit("5/minute")`` on endpoints that take a
+    ``request: Request`` argument. The outcome is stored on ``request.state``
+    and RateLimitHeadersMiddleware adds the ``RateLimit-*`` headers to the
+    response. When the storage is unreachable requests are let through, so a
+    Redis outage does not take the API down with it.
+    """
+
+    def __init__(self, storage, key_func: Callable[[Request], str]):
+        self.storage = storage
+        self.key_func = key_func
+
+    def start(self) -> None:
+        """
+        Start background reconciliation when the storage needs it.
+        """
+        if hasattr(self.storage, "start"):
+            self.storage.start()
+
+    def stop(self) -> None:
+        if hasattr(self.storage, "stop"):
+            self.storage.stop()
+
+    def check(self, request: Request, scope: str, rate: str) -> None:
+        limit, window = parse_rate(rate)
+        key = f"{scope}:{self.key_func(request)}"
+        try:
+            state = self.storage.hit(key, limit, window)
+        except redis.RedisError as err:
+            logger.warning("Rate limit check failed: %s", err)
+            return
+        if not state.allowed:
+            raise RateLimitExceeded(rate, state)
+        request.state.rate_limit = state
+
+    def limit(self, rate: str):
+        parse_rate(rate)  # fail at import time on a malformed rate
+
+        def decorator(func):
+            scope = f"{func.__module__}.{func.__name__}"
+
+            if inspect.iscoroutinefunction(func):
+
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    request = _find_request(func, kwargs)
+                    await run_in_threadpool(self.check, request, scope, rate)
+                    return await func(*args, **kwargs)
+
+                return async_wrapper
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                self.check(_find_request(func, kwargs), scope, rate)
+                return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+
+def _find_request(func, kwargs: dict) -> Request:
+    for value in kwargs.values():
+        if isinstance(value, Request):
+            return value
+    raise RuntimeError(f"{func.__name__} must take a 'request: Request' argument")
+
+
+class RateLimitHeadersMiddleware:
+    """
+    ASGI middleware adding ``RateLimit-*`` headers to rate limited responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                state: Optional[RateLimitState] = scope.get("state", {}).get(
+                    "rate_limit"
+                )
+                if state is not None:
+                    headers = list(message.get("headers", []))
+                    headers.extend(
+                        (name.lower().encode(), value.encode())
+                        for name, value in state.headers().items()
+                    )
+                    message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def build_rate_limit_storage(mode: str, client: redis.Redis):
+    if mode == "hybrid":
+        return HybridRateLimitStorage(
+            client, sync_interval=settings.RATE_LIMIT_SYNC_INTERVAL_SECONDS
+        )
+    return RedisRateLimitStorage(client)
+
+
+limiter = RateLimiter(
+    build_rate_limit_storage(settings.RATE_LIMIT_MODE, redis_client),
+    key_func=get_rate_limit_key,
+)
 
 
 def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
@@ -19,8 +367,8 @@ def rate_limit_exception_handler(request: Request, exc: RateLimitExceeded):
     Returns:
         JSONResponse: A JSON response with an error message and 429 status code.
     """
-    print(f"Client IP: {request.client.host}")
     return JSONResponse(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-        content={"error": "Resource limit exceeded", "message": str(exc.detail)},
+        content={"error": "Resource limit exceeded", "message": exc.detail},
+        headers=exc.state.headers(),
     )
@@ -0,0 +1,42 @@
+import json
+from datetime import date
+from typing import Any
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional, the stdlib encoder is used without it
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Encode plain Python data (dicts, lists, dates) as compact JSON.
+
+    Uses orjson when it is installed, which is several times faster than the
+    standard library on contact lists.
+
+    Args:
+        content (Any): The data to encode.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, separators=(",", ":"), default=_default).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dump_json.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
@@ -0,0 +1,121 @@
+import json
+import logging
+import time
+from datetime import date, datetime, timedelta
+from typing import List, Optional
+import redis
+from app.settings import settings
+from app.helpers.cache.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class BirthdayDigestCache:
+    """
+    Ids of each user's contacts with a birthday in the upcoming window, per day.
+
+    The window only moves at midnight, so a digest is keyed by user and date
+    and expires shortly after the day is over. It is also keyed by the version
+    of the user's contacts (see ResponseCache.version), taken before the
+    contacts are queried: a digest computed before a write is stored under the
+    version that write replaced, so it is never read, however late it lands.
+    Only ids are kept, and the contacts themselves are loaded by primary key.
+    Reads also record the user as active, which is what the nightly warm-up
+    works from.
+    """
+
+    KEY_PREFIX = "birthday-digest"
+
+    def __init__(self, client: redis.Redis, active_days: int):
+        self.client = client
+        self.active_days = active_days
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, user_id: int, version: int, day: date) -> str:
+        return f"{self.KEY_PREFIX}:{user_id}:{version}:{day.isoformat()}"
+
+    @property
+    def _active_key(self) -> str:
+        return f"{self.KEY_PREFIX}:active"
+
+    @staticmethod
+    def _ttl(day: date) -> int:
+        # Until one hour after the end of ``day``, so late readers still hit
+        midnight = datetime.combine(day + timedelta(days=1), datetime.min.time())
+        return max(1, int(midnight.timestamp() - time.time()) + 3600)
+
+    def get(self, user_id: int, version: int, day: date) -> Optional[List[int]]:
+        """
+        Return the digest of the user for ``day``, or None on a miss.
+        """
+        try:
+            pipe = self.client.pipeline()
+            pipe.get(self._key(user_id, version, day))
+            pipe.zadd(self._active_key, {user_id: time.time()})
+            raw, _ = pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Birthday digest read failed: %s", err)
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    def set(
+        self, user_id: int, version: int, day: date, contact_ids: List[int]
+    ) -> None:
+        """
+        Store a digest under the version read before the contacts were queried.
+        """
+        try:
+            self.client.set(
+                self._key(user_id, version, day),
+                json.dumps(contact_ids),
+                ex=self._ttl(day),
+            )
+        except redis.RedisError as err:
+            logger.warning("Birthday digest write failed: %s", err)
+
+    def active_users(self) -> List[int]:
+        """
+        Return users who read their digest within the last ``active_days``.
+
+        Users idle for longer are forgotten so the set stays bounded.
+        """
+        cutoff = time.time() - self.active_days * 86400
+        try:
+            pipe = self.client.pipeline()
+            pipe.zremrangebyscore(self._active_key, "-inf", cutoff)
+            pipe.zrange(self._active_key, 0, -1)
+            _, members = pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Birthday digest active users not readable: %s", err)
+            return []
+        return [int(member) for member in members]
+
+    def claim_warm_up(self, day: date) -> bool:
+        """
+        Return True for the first worker asking to warm the digests of ``day``.
+        """
+        try:
+            return bool(
+                self.client.set(
+                    f"{self.KEY_PREFIX}:warmed:{day.isoformat()}",
+                    1,
+                    nx=True,
+                    ex=self._ttl(day),
+                )
+            )
+        except redis.RedisError as err:
+            logger.warning("Birthday digest warm-up not claimed: %s", err)
+            return False
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+birthday_digest_cache = BirthdayDigestCache(
+    redis_client, settings.BIRTHDAY_DIGEST_ACTIVE_DAYS
+)
@@ -0,0 +1,95 @@
+import json
+import logging
+import time
+import uuid
+from typing import Callable, Dict, List, Optional
+import redis
+from app.helpers.cache.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Receives the published payload, or None when local state must be dropped
+# entirely because messages may have been missed
+InvalidationHandler = Callable[[Optional[dict]], None]
+
+
+class InvalidationBus:
+    """
+    Broadcasts cache invalidations to every worker over Redis pub/sub.
+
+    Each worker runs one listener thread that dispatches messages to the
+    handlers subscribed to the message topic. Messages published by the worker
+    itself are skipped: the publisher already invalidated its own state.
+    """
+
+    def __init__(self, client: redis.Redis, channel: str):
+        self.client = client
+        self.channel = channel
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[InvalidationHandler]] = {}
+        self._pubsub = None
+        self._thread = None
+
+    def subscribe(self, topic: str, handler: InvalidationHandler) -> None:
+        self._handlers.setdefault(topic, []).append(handler)
+
+    def publish(self, topic: str, payload: dict) -> None:
+        message = json.dumps(
+            {"topic": topic, "origin": self.origin, "payload": payload},
+            separators=(",", ":"),
+        )
+        try:
+            self.client.publish(self.channel, message)
+        except redis.RedisError as err:
+            logger.warning("Invalidation publish failed: %s", err)
+
+    def start(self) -> None:
+        """
+        Start the listener thread of this worker.
+        """
+        if self._thread is not None:
+            return
+        try:
+            self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub.subscribe(**{self.channel: self._on_message})
+            self._thread = self._pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_error
+            )
+        except redis.RedisError as err:
+            logger.warning("Invalidation listener not started: %s", err)
+            self._pubsub = None
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+    def _on_message(self, message: dict) -> None:
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            logger.warning("Ignoring malformed invalidation message")
+            return
+        if data.get("origin") == self.origin:
+            return
+        self._dispatch(data.get("topic"), data.get("payload"))
+
+    def _on_error(self, err: Exception, pubsub, thread) -> None:
+        # Messages published while disconnected are lost, so drop everything
+        logger.warning("Invalidation listener error: %s", err)
+        for topic in self._handlers:
+            self._dispatch(topic, None)
+        time.sleep(1.0)
+
+    def _dispatch(self, topic: str, payload: Optional[dict]) -> None:
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Invalidation handler failed for %s", topic)
+
+
+invalidation_bus = InvalidationBus(redis_client, channel="cache-invalidation")
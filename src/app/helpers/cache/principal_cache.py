@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Optional
+import redis
+from app.settings import settings
+from app.helpers.cache.redis_client import redis_client
+from app.helpers.cache.lru import LRUCache
+from app.helpers.cache.invalidation import InvalidationBus, invalidation_bus
+from db.models.user import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """
+    Two-tier cache of the authenticated user behind an access token.
+
+    Entries are keyed by a hash of the token and hold a compact JSON snapshot
+    of the user (never the password hash). They expire with the token, capped
+    by PRINCIPAL_CACHE_TTL_SECONDS. Every user keeps a set of its entry keys
+    so a write to the user drops all of its cached principals at once.
+
+    A bounded in-process LRU sits in front of Redis so hot tokens are resolved
+    without a network round trip. Invalidations are broadcast on the
+    invalidation bus so every worker drops its local copies.
+    """
+
+    KEY_PREFIX = "principal"
+    TOPIC = "principal"
+    FIELDS = ("id", "username", "email", "avatar", "created_at", "confirmed", "role")
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int,
+        local: LRUCache,
+        bus: InvalidationBus,
+    ):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.local = local
+        self.bus = bus
+        self.redis_hits = 0
+        self.redis_misses = 0
+        bus.subscribe(self.TOPIC, self._on_invalidation)
+
+    def _token_key(self, token: str) -> str:
+        digest = hashlib.sha256(token.encode()).hexdigest()
+        return f"{self.KEY_PREFIX}:token:{digest}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:user:{user_id}"
+
+    def _ttl(self, expires_at: Optional[float]) -> int:
+        if expires_at is None:
+            return self.ttl_seconds
+        return min(self.ttl_seconds, int(expires_at - time.time()))
+
+    @classmethod
+    def serialize(cls, user: User) -> str:
+        data = {field: getattr(user, field) for field in cls.FIELDS}
+        if data["created_at"] is not None:
+            data["created_at"] = data["created_at"].isoformat()
+        if data["role"] is not None:
+            data["role"] = UserRole(data["role"]).value
+        return json.dumps(data, separators=(",", ":"))
+
+    @classmethod
+    def deserialize(cls, raw) -> User:
+        data = json.loads(raw)
+        if data["created_at"] is not None:
+            data["created_at"] = datetime.fromisoformat(data["created_at"])
+        if data["role"] is not None:
+            data["role"] = UserRole(data["role"])
+        # Transient instance: never attached to a session, so it cannot lazy-load
+        return User(**data)
+
+    def get(self, token: str) -> Optional[User]:
+        """
+        Return the cached user for the token, or None on a miss.
+        """
+        token_key = self._token_key(token)
+        raw = self.local.get(token_key)
+        if raw is not None:
+            return self.deserialize(raw)
+        try:
+            pipe = self.client.pipeline()
+            pipe.get(token_key)
+            pipe.ttl(token_key)
+            raw, ttl = pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Principal cache read failed: %s", err)
+            return None
+        if raw is None:
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        user = self.deserialize(raw)
+        # Never keep the local copy longer than the Redis entry
+        if ttl > 0:
+            self.local.set(token_key, raw, tag=user.id, ttl_seconds=ttl)
+        return user
+
+    def set(self, token: str, user: User, expires_at: Optional[float] = None) -> None:
+        """
+        Cache the user for the token until the token expires.
+        """
+        ttl = self._ttl(expires_at)
+        if ttl <= 0:
+            return
+        token_key = self._token_key(token)
+        user_key = self._user_key(user.id)
+        raw = self.serialize(user)
+        self.local.set(token_key, raw, tag=user.id, ttl_seconds=ttl)
+        try:
+            pipe = self.client.pipeline()
+            pipe.set(token_key, raw, ex=ttl)
+            pipe.sadd(user_key, token_key)
+            # The index only has to outlive the longest-lived entry
+            pipe.expire(user_key, self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Principal cache write failed: %s", err)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop every cached principal of the user, on every worker.
+        """
+        self.local.delete_tag(user_id)
+        user_key = self._user_key(user_id)
+        try:
+            token_keys = self.client.smembers(user_key)
+            self.client.delete(user_key, *token_keys)
+        except redis.RedisError as err:
+            logger.warning("Principal cache invalidation failed: %s", err)
+        self.bus.publish(self.TOPIC, {"user_id": user_id})
+
+    def stats(self) -> dict:
+        return {
+            "local": self.local.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+        }
+
+    def _on_invalidation(self, payload: Optional[dict]) -> None:
+        if payload is None:
+            self.local.clear()
+        else:
+            self.local.delete_tag(payload["user_id"])
+
+
+principal_cache = PrincipalCache(
+    redis_client,
+    settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    local=LRUCache(
+        settings.PRINCIPAL_CACHE_LOCAL_SIZE, settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS
+    ),
+    bus=invalidation_bus,
+)
@@ -0,0 +1,149 @@
+import json
+import logging
+from typing import Optional
+from urllib.parse import urlencode
+import redis
+from fastapi import Response
+from app.settings import settings
+from app.helpers.cache.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Read a user's version, seeding a missing one from the Redis clock in ms so
+# a lost key never hands out a version that was already used.
+# KEYS[1] = version key
+VERSION_SCRIPT = """
+local version = redis.call('GET', KEYS[1])
+if not version then
+    local time = redis.call('TIME')
+    version = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    redis.call('SET', KEYS[1], version)
+end
+return version
+"""
+
+# Increment an existing version only; a missing one is seeded on next read
+# KEYS[1] = version key
+BUMP_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCR', KEYS[1])
+end
+return 0
+"""
+
+
+class ResponseCache:
+    """
+    Rendered contact responses, keyed by user and version of their contacts.
+
+    Every write to a user's contacts increments the user's version, so entries
+    rendered for an older version are simply never read again and expire on
+    their own: invalidation is one INCR, with no keys to find or delete.
+
+    The version also serves as the ETag of the user's contact resources, so it
+    is kept even when response caching is disabled.
+
+    Readers must take the version before querying. A write commits before it
+    bumps the version, so a response stored under the version a reader saw can
+    only be newer than that version, never older.
+    """
+
+    KEY_PREFIX = "contacts-response"
+
+    def __init__(self, client: redis.Redis, ttl: int):
+        self.client = client
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.bumps = 0
+        self._version_script = client.register_script(VERSION_SCRIPT)
+        self._bump_script = client.register_script(BUMP_SCRIPT)
+
+    def _version_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}:version:{user_id}"
+
+    def _key(self, user_id: int, version: int, name: str, params: dict) -> str:
+        query = urlencode(sorted((k, v) for k, v in params.items() if v is not None))
+        return f"{self.KEY_PREFIX}:{user_id}:{version}:{name}:{query}"
+
+    def version(self, user_id: int) -> Optional[int]:
+        """
+        Return the version of the user's contacts, or None if Redis is down.
+        """
+        try:
+            return int(self._version_script(keys=[self._version_key(user_id)]))
+        except redis.RedisError as err:
+            logger.warning("Response cache version not readable: %s", err)
+            return None
+
+    def bump(self, user_id: int) -> None:
+        """
+        Make every cached response and ETag of the user stale.
+        """
+        try:
+            self._bump_script(keys=[self._version_key(user_id)])
+        except redis.RedisError as err:
+            # Stale entries can then be served until they expire
+            logger.warning("Response cache version not bumped: %s", err)
+            return
+        self.bumps += 1
+
+    def get(
+        self, user_id: int, version: Optional[int], name: str, params: dict
+    ) -> Optional[Response]:
+        """
+        Return the cached response, or None on a miss.
+        """
+        if version is None or self.ttl <= 0:
+            return None
+        try:
+            raw = self.client.get(self._key(user_id, version, name, params))
+        except redis.RedisError as err:
+            logger.warning("Response cache read failed: %s", err)
+            return None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        headers, _, body = raw.partition(b"\n")
+        return Response(
+            body, media_type="application/json", headers=json.loads(headers)
+        )
+
+    def store(
+        self,
+        user_id: int,
+        version: Optional[int],
+        name: str,
+        params: dict,
+        body: bytes,
+        headers: Optional[dict] = None,
+    ) -> Response:
+        """
+        Cache a rendered JSON body and return it as a response.
+        """
+        headers = headers or {}
+        if version is not None and self.ttl > 0:
+            try:
+                self.client.set(
+                    self._key(user_id, version, name, params),
+                    json.dumps(headers).encode() + b"\n" + body,
+                    ex=self.ttl,
+                )
+            except redis.RedisError as err:
+                logger.warning("Response cache write failed: %s", err)
+        return Response(body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "version_bumps": self.bumps,
+        }
+
+
+contacts_response_cache = ResponseCache(
+    redis_client, settings.CONTACTS_RESPONSE_CACHE_TTL
+)
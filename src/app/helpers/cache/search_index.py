@@ -0,0 +1,298 @@
+import heapq
+import logging
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from sqlalchemy.orm import Session, sessionmaker
+from app.settings import settings
+from app.helpers.cache.invalidation import InvalidationBus, invalidation_bus
+from db.database import SessionLocal
+from db.models.contact import Contact
+
+logger = logging.getLogger(__name__)
+
+NGRAM = 3
+
+# Streams a user's contacts, with their children, in batches
+ContactLoader = Callable[[Session, int, int], Iterator[List[Contact]]]
+
+
+def ngrams(text: str) -> set:
+    return {text[i : i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+@dataclass(frozen=True)
+class ContactDocument:
+    """
+    What the index keeps of a contact: its id and its lower-cased text.
+    """
+
+    id: int
+    # "first last", used for ranking
+    name: str
+    # name, emails, phones and additional data values, one per line
+    text: str
+
+    @classmethod
+    def from_contact(cls, contact: Contact) -> "ContactDocument":
+        name = f"{contact.first_name} {contact.last_name}".lower()
+        values = [
+            name,
+            *(email.email for email in contact.emails),
+            *(phone.phone for phone in contact.phones),
+            *(data.value for data in contact.additional_data_items if data.value),
+        ]
+        return cls(contact.id, name, "\n".join(values).lower())
+
+
+class _UserIndex:
+    __slots__ = ("documents", "postings")
+
+    def __init__(self):
+        self.documents: Dict[int, ContactDocument] = {}
+        # n-gram -> ids of the documents containing it
+        self.postings: Dict[str, set] = {}
+
+    def add(self, document: ContactDocument) -> None:
+        self.remove(document.id)
+        self.documents[document.id] = document
+        for gram in ngrams(document.text):
+            self.postings.setdefault(gram, set()).add(document.id)
+
+    def remove(self, contact_id: int) -> None:
+        document = self.documents.pop(contact_id, None)
+        if document is None:
+            return
+        for gram in ngrams(document.text):
+            ids = self.postings[gram]
+            ids.discard(contact_id)
+            if not ids:
+                del self.postings[gram]
+
+    def search(self, term: str, limit: int, min_similarity: float) -> List[int]:
+        grams = ngrams(term)
+        if not grams:
+            # Shorter than an n-gram: check every document
+            scores = {
+                contact_id: 1.0
+                for contact_id, document in self.documents.items()
+                if term in document.text
+            }
+        else:
+            postings = sorted(
+                (self.postings.get(gram, set()) for gram in grams), key=len
+            )
+            scores = {
+                contact_id: 1.0
+                for contact_id in set.intersection(*postings)
+                if term in self.documents[contact_id].text
+            }
+            if len(scores) < limit:
+                # Not enough substrings: add documents sharing most n-grams,
+                # which tolerates a typo or two
+                hits = Counter()
+                for ids in postings:
+                    hits.update(ids)
+                for contact_id, count in hits.items():
+                    score = count / len(grams)
+                    if contact_id not in scores and score >= min_similarity:
+                        scores[contact_id] = score
+
+        def rank(contact_id: int) -> tuple:
+            # Same order as the SQL search: name prefix, then word prefix
+            name = self.documents[contact_id].name
+            prefix = 2 if name.startswith(term) else 1 if f" {term}" in name else 0
+            return -prefix, -scores[contact_id], contact_id
+
+        return heapq.nsmallest(limit, scores, key=rank)
+
+
+class ContactSearchIndex:
+    """
+    Per-worker inverted index of contacts over n-grams of their text.
+
+    A user's index is built from the database the first time the user
+    searches; until it is ready ``search`` returns None and the caller falls
+    back to SQL. Repository writes keep warm indexes up to date, and the
+    changed documents or removed ids go to the other workers over the
+    invalidation bus, so their copies stay warm too. Only writes too large
+    to send, such as a bulk import, make every worker drop the user.
+
+    Memory is bounded by ``max_documents`` across users: the least recently
+    searched users are evicted first, and a user with more contacts than the
+    budget is never indexed.
+    """
+
+    TOPIC = "contact-search"
+
+    def __init__(
+        self,
+        max_documents: int,
+        session_factory: sessionmaker,
+        bus: InvalidationBus,
+        min_similarity: float = 0.5,
+        batch_size: int = 1000,
+        background: bool = True,
+    ):
+        self.max_documents = max_documents
+        self.session_factory = session_factory
+        self.bus = bus
+        self.min_similarity = min_similarity
+        self.batch_size = batch_size
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="contact-index")
+            if background
+            else None
+        )
+        self._users: "OrderedDict[int, _UserIndex]" = OrderedDict()
+        self._documents = 0
+        # Users being built; True once a write makes the build stale
+        self._building: Dict[int, bool] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.evictions = 0
+        bus.subscribe(self.TOPIC, self._on_invalidation)
+
+    def search(
+        self, user_id: int, term: str, limit: int, load: ContactLoader
+    ) -> Optional[List[int]]:
+        """
+        Return the ids of the best matches for ``term``, or None when cold.
+
+        ``term`` must already be stripped and lower-cased.
+        """
+        with self._lock:
+            index = self._users.get(user_id)
+            if index is not None:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+                return index.search(term, limit, self.min_similarity)
+            self.misses += 1
+            if user_id in self._building:
+                return None
+            self._building[user_id] = False
+        if self._executor is not None:
+            self._executor.submit(self._build, user_id, load)
+            return None
+        self._build(user_id, load)
+        with self._lock:
+            index = self._users.get(user_id)
+            return index.search(term, limit, self.min_similarity) if index else None
+
+    def upsert(self, user_id: int, contacts: Iterable[Contact]) -> None:
+        """
+        Index new or changed contacts of the user; they must have their children.
+        """
+        documents = [ContactDocument.from_contact(contact) for contact in contacts]
+        self._apply(user_id, documents, [])
+        self.bus.publish(
+            self.TOPIC,
+            {"user_id": user_id, "upsert": [asdict(doc) for doc in documents]},
+        )
+
+    def remove(self, user_id: int, contact_id: int) -> None:
+        self._apply(user_id, [], [contact_id])
+        self.bus.publish(self.TOPIC, {"user_id": user_id, "remove": [contact_id]})
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop the user's index on every worker, for writes too large to apply.
+        """
+        self._drop(user_id)
+        self.bus.publish(self.TOPIC, {"user_id": user_id})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "users": len(self._users),
+                "documents": self._documents,
+                "max_documents": self.max_documents,
+                "hits": self.hits,
+                "misses": self.misses,
+                "builds": self.builds,
+                "evictions": self.evictions,
+            }
+
+    def _build(self, user_id: int, load: ContactLoader) -> None:
+        index = _UserIndex()
+        try:
+            with self.session_factory() as db:
+                for batch in load(db, user_id, self.batch_size):
+                    for contact in batch:
+                        index.add(ContactDocument.from_contact(contact))
+                    if len(index.documents) > self.max_documents:
+                        logger.info("User %s has too many contacts to index", user_id)
+                        index = None
+                        break
+        except Exception:
+            logger.exception("Contact index build failed for user %s", user_id)
+            index = None
+        with self._lock:
+            stale = self._building.pop(user_id, True)
+            if index is None or stale:
+                return
+            self._users[user_id] = index
+            self._documents += len(index.documents)
+            self.builds += 1
+            self._evict()
+
+    def _apply(
+        self, user_id: int, documents: List[ContactDocument], removed: List[int]
+    ) -> None:
+        with self._lock:
+            self._mark_stale(user_id)
+            index = self._users.get(user_id)
+            if index is None:
+                return
+            self._documents -= len(index.documents)
+            for document in documents:
+                index.add(document)
+            for contact_id in removed:
+                index.remove(contact_id)
+            self._documents += len(index.documents)
+            self._evict()
+
+    def _drop(self, user_id: int) -> None:
+        with self._lock:
+            self._mark_stale(user_id)
+            index = self._users.pop(user_id, None)
+            if index is not None:
+                self._documents -= len(index.documents)
+
+    def _mark_stale(self, user_id: int) -> None:
+        # Caller holds the lock
+        if user_id in self._building:
+            self._building[user_id] = True
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        while self._documents > self.max_documents and self._users:
+            _, index = self._users.popitem(last=False)
+            self._documents -= len(index.documents)
+            self.evictions += 1
+
+    def _on_invalidation(self, payload: Optional[dict]) -> None:
+        if payload is None:
+            # Messages may have been lost: every user could be stale
+            with self._lock:
+                self._users.clear()
+                self._documents = 0
+                for user_id in self._building:
+                    self._building[user_id] = True
+            return
+        if "upsert" in payload or "remove" in payload:
+            documents = [ContactDocument(**doc) for doc in payload.get("upsert", [])]
+            self._apply(payload["user_id"], documents, payload.get("remove", []))
+        else:
+            self._drop(payload["user_id"])
+
+
+contact_search_index = ContactSearchIndex(
+    settings.CONTACTS_SEARCH_INDEX_MAX_DOCUMENTS,
+    session_factory=SessionLocal,
+    bus=invalidation_bus,
+)
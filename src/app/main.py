@@ -4,23 +4,52 @@ from pathlib import Path
 # Add the 'src' directory to the Python path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
-from app.routers.contacts import contacts
+from contextlib import asynccontextmanager
+from app.routers.contacts import contacts, async_contacts
 from fastapi import FastAPI, status, Request
+from fastapi.responses import JSONResponse
 from app.routers.users import users
 from app.routers.auth import auth
-from app.helpers.api.rate_limiter import limiter, rate_limit_exception_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+from app.routers.internal import internal
+from app.helpers.api.rate_limiter import (
+    RATE_LIMIT_HEADERS,
+    RateLimitExceeded,
+    RateLimitHeadersMiddleware,
+    limiter,
+    rate_limit_exception_handler,
+)
 from starlette.middleware.cors import CORSMiddleware
 from app.settings import settings
+from app.helpers.api.pagination import NEXT_CURSOR_HEADER
+from app.helpers.api.etag import ETAG_HEADER
+from app.helpers.api.responses import FastJSONResponse
+from app.helpers.cache.invalidation import invalidation_bus
+from app.services.contacts.birthday_digest import birthday_digest_warmer
 
-# Init fastapi app
-app = FastAPI()
 
-app.state.limiter = limiter
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each worker listens for cache invalidations published by the others
+    invalidation_bus.start()
+    limiter.start()
+    if settings.BIRTHDAY_DIGEST_WARM_UP:
+        birthday_digest_warmer.start()
+    yield
+    birthday_digest_warmer.stop()
+    limiter.stop()
+    invalidation_bus.stop()
+
+
+# Init fastapi app
+app = FastAPI(
+    lifespan=lifespan,
+    default_response_class=(
+        FastJSONResponse if settings.CONTACTS_FAST_JSON else JSONResponse
+    ),
+)
 
-# Add SlowAPI middleware
-app.add_middleware(SlowAPIMiddleware)
+# Add RateLimit-* headers to rate limited responses
+app.add_middleware(RateLimitHeadersMiddleware)
 
 # Add the rate limit exception handler
 app.add_exception_handler(RateLimitExceeded, rate_limit_exception_handler)
@@ -33,11 +62,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, *RATE_LIMIT_HEADERS],
 )
 
-app.include_router(contacts.router)
+if settings.DB_ASYNC_MODE:
+    app.include_router(async_contacts.router)
+else:
+    app.include_router(contacts.router)
 app.include_router(users.router)
 app.include_router(auth.router)
+app.include_router(internal.router)
 
 if __name__ == "__main__":
     import uvicorn
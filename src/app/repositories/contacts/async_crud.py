@@ -0,0 +1,148 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.contact import Contact
+from app.repositories.contacts.crud import ContactChange, ContactsRepository
+from app.helpers.api.pagination import SyncPosition
+from app.routers.contacts.schemas import ContactCreate
+from datetime import date, datetime
+from typing import List, Optional
+
+
+class AsyncContactsRepository:
+    """
+    Asyncio counterpart of ContactsRepository.
+
+    Each call runs the synchronous repository method on the AsyncSession via
+    run_sync, so both modes share the same queries while the database I/O is
+    awaited on the event loop instead of blocking a threadpool slot.
+    """
+
+    def __init__(self):
+        self.contacts_repository = ContactsRepository()
+
+    async def create_contact(
+        self, db: AsyncSession, contact: ContactCreate, user_id: int
+    ) -> Contact:
+        return await db.run_sync(
+            self.contacts_repository.create_contact, contact, user_id
+        )
+
+    async def create_contacts_bulk(
+        self, db: AsyncSession, contacts: List[ContactCreate], user_id: int
+    ) -> dict:
+        return await db.run_sync(
+            self.contacts_repository.create_contacts_bulk, contacts, user_id
+        )
+
+    async def get_contacts(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contacts, user_id, skip, limit
+        )
+
+    async def get_contacts_after(
+        self, db: AsyncSession, user_id: int, after_id: Optional[int], limit: int = 10
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contacts_after, user_id, after_id, limit
+        )
+
+    async def get_contact_rows(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        return await db.run_sync(
+            self.contacts_repository.get_contact_rows, user_id, skip, limit, after_id
+        )
+
+    async def get_contact(
+        self, db: AsyncSession, contact_id: int, user_id: int
+    ) -> Optional[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contact, contact_id, user_id
+        )
+
+    async def update_contact(
+        self, db: AsyncSession, contact_id: int, contact: ContactCreate, user_id: int
+    ) -> Optional[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.update_contact, contact_id, contact, user_id
+        )
+
+    async def delete_contact(
+        self, db: AsyncSession, contact_id: int, user_id: int
+    ) -> Optional[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.delete_contact, contact_id, user_id
+        )
+
+    async def get_contact_by_name_lastname_email(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        name: Optional[str] = None,
+        lastname: Optional[str] = None,
+        email: Optional[str] = None,
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contact_by_name_lastname_email,
+            user_id,
+            name,
+            lastname,
+            email,
+        )
+
+    def pop_changes(self, db: AsyncSession) -> List[ContactChange]:
+        # Reads the session's info only, so there is nothing to await
+        return self.contacts_repository.pop_changes(db.sync_session)
+
+    async def get_contacts_by_attribute(
+        self, db: AsyncSession, user_id: int, key: str, value: Optional[str]
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contacts_by_attribute, user_id, key, value
+        )
+
+    async def get_changes(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        since: Optional[datetime],
+        limit: int = 100,
+        position: Optional[SyncPosition] = None,
+    ) -> Optional[dict]:
+        return await db.run_sync(
+            self.contacts_repository.get_changes, user_id, since, limit, position
+        )
+
+    async def search_contacts(
+        self, db: AsyncSession, user_id: int, term: str, limit: int = 20
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.search_contacts, user_id, term, limit
+        )
+
+    async def get_contacts_with_upcoming_birthdays(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        days: Optional[int] = None,
+        today: Optional[date] = None,
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contacts_with_upcoming_birthdays,
+            user_id,
+            days,
+            today,
+        )
+
+    async def get_contacts_by_ids(
+        self, db: AsyncSession, user_id: int, contact_ids: List[int]
+    ) -> List[Contact]:
+        return await db.run_sync(
+            self.contacts_repository.get_contacts_by_ids, user_id, contact_ids
+        )
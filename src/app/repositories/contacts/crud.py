@@ -1,13 +1,73 @@
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy import select, extract
-from db.models.contact import Contact, Email, Phone, AdditionalData
+from sqlalchemy.orm import sessionmaker, Session, Query
+from sqlalchemy.orm import selectinload, joinedload, subqueryload
+from sqlalchemy import select, insert, delete, case, literal, type_coerce, union
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import IntegrityError
+from db.models.contact import (
+    Contact,
+    ContactTombstone,
+    Email,
+    Phone,
+    AdditionalData,
+)
 from app.routers.contacts.schemas import ContactCreate, AdditionalDataCreate
-from typing import List, Optional
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from app.settings import settings
+from app.helpers.api.pagination import SyncPosition
+from app.helpers.cache.search_index import contact_search_index
+from typing import Iterator, List, NamedTuple, Optional
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import func, tuple_
+
+# Relationship loaders available for the contact children
+LOADER_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+}
+
+# Session.info key of the changes committed and not yet handed to the caller
+PENDING_CHANGES = "contact_changes"
+
+
+class ContactChange(NamedTuple):
+    """
+    A committed write to a user's contacts, for what has to follow it.
+    """
+
+    user_id: int
+    # "created", "updated" or "deleted"
+    event: str
+    contact_ids: List[int]
+    # Created or updated contacts with their children, for the search index;
+    # None when too many changed to index them one by one
+    contacts: Optional[list]
 
 
 class ContactsRepository:
+    # Strategy used to load emails, phones and additional_data with the contact
+    load_strategy: str = settings.CONTACTS_LOAD_STRATEGY
+    # "memory" serves free-text search from the in-process index when warm
+    search_backend: str = settings.CONTACTS_SEARCH_BACKEND
+    search_index = contact_search_index
+    # "rows" or "jsonb": where writes put the key/value pairs of a contact
+    additional_data_storage: str = settings.CONTACTS_ADDITIONAL_DATA_STORAGE
+
+    def _load_options(self) -> list:
+        loader = LOADER_STRATEGIES[self.load_strategy]
+        return [
+            loader(Contact.emails),
+            loader(Contact.phones),
+            loader(Contact.additional_data),
+        ]
+
+    def _contacts_query(self, db: Session, user_id: int) -> Query:
+        # Every read path goes through here so the children are loaded eagerly
+        return (
+            db.query(Contact)
+            .options(*self._load_options())
+            .filter(Contact.user_id == user_id)
+        )
+
     def create_contact(
         self, db: Session, contact: ContactCreate, user_id: int
     ) -> Contact:
@@ -19,96 +79,493 @@ class ContactsRepository:
             user_id=user_id,  # Associate the contact with the authenticated user
             emails=[Email(email=email.email) for email in contact.emails],
             phones=[Phone(phone=phone.phone) for phone in contact.phones],
-            additional_data=[
-                AdditionalData(key=data.key, value=data.value)
-                for data in contact.additional_data
-            ],
         )
+        self._store_additional_data(db_contact, contact.additional_data)
         db.add(db_contact)
         db.commit()
-        db.refresh(db_contact)
+        db_contact = self.get_contact(db, db_contact.id, user_id)
+        self._record_change(
+            db, ContactChange(user_id, "created", [db_contact.id], [db_contact])
+        )
         return db_contact
 
+    def create_contacts_bulk(
+        self, db: Session, contacts: List[ContactCreate], user_id: int
+    ) -> dict:
+        """
+        Insert many contacts and their children in one transaction.
+
+        Items whose email or phone already exists, or repeats one of an earlier
+        item of the batch, are reported as conflicts and skipped; the rest of
+        the batch is still created.
+        """
+        conflicts = self._find_bulk_conflicts(db, contacts)
+        accepted = [
+            (index, contact)
+            for index, contact in enumerate(contacts)
+            if index not in conflicts
+        ]
+        try:
+            with db.begin_nested():
+                created = self._insert_contacts(db, accepted, user_id)
+        except IntegrityError:
+            # A concurrent request took one of the values after the check above;
+            # retry item by item so only the offending ones are rejected
+            created = []
+            for index, contact in accepted:
+                try:
+                    with db.begin_nested():
+                        created += self._insert_contacts(
+                            db, [(index, contact)], user_id
+                        )
+                except IntegrityError:
+                    conflicts[index] = {
+                        "index": index,
+                        "field": None,
+                        "value": None,
+                        "detail": "Email or phone already exists",
+                    }
+        db.commit()
+        if created:
+            # A bulk insert reindexes the user rather than each contact
+            self._record_change(
+                db,
+                ContactChange(
+                    user_id, "created", [item["id"] for item in created], None
+                ),
+            )
+        return {
+            "created": created,
+            "conflicts": [conflicts[index] for index in sorted(conflicts)],
+        }
+
+    @staticmethod
+    def _find_bulk_conflicts(db: Session, contacts: List[ContactCreate]) -> dict:
+        # One query per unique column instead of one per item
+        values = {
+            "email": [e.email for c in contacts for e in c.emails],
+            "phone": [p.phone for c in contacts for p in c.phones],
+        }
+        columns = {"email": Email.email, "phone": Phone.phone}
+        taken = {
+            field: (
+                set(db.scalars(select(column).where(column.in_(values[field]))))
+                if values[field]
+                else set()
+            )
+            for field, column in columns.items()
+        }
+        conflicts = {}
+        for index, contact in enumerate(contacts):
+            item_values = {
+                "email": [e.email for e in contact.emails],
+                "phone": [p.phone for p in contact.phones],
+            }
+            for field, field_values in item_values.items():
+                duplicate = next((v for v in field_values if v in taken[field]), None)
+                if duplicate is not None:
+                    conflicts[index] = {
+                        "index": index,
+                        "field": field,
+                        "value": duplicate,
+                        "detail": f"{field.capitalize()} already exists",
+                    }
+                    break
+            if index not in conflicts:
+                for field, field_values in item_values.items():
+                    taken[field].update(field_values)
+        return conflicts
+
+    def _insert_contacts(self, db: Session, accepted: list, user_id: int) -> List[dict]:
+        if not accepted:
+            return []
+        as_json = self.additional_data_storage == "jsonb"
+        rows = []
+        for _, contact in accepted:
+            row = {
+                "first_name": contact.first_name,
+                "last_name": contact.last_name,
+                "birthday": contact.birthday,
+                "user_id": user_id,
+            }
+            if as_json:
+                row["attributes"] = [
+                    {"key": d.key, "value": d.value} for d in contact.additional_data
+                ]
+            rows.append(row)
+        contact_ids = db.scalars(
+            insert(Contact).returning(Contact.id, sort_by_parameter_order=True), rows
+        ).all()
+        pairs = list(zip((contact for _, contact in accepted), contact_ids))
+        children = {
+            Email: [
+                {"email": e.email, "contact_id": contact_id}
+                for contact, contact_id in pairs
+                for e in contact.emails
+            ],
+            Phone: [
+                {"phone": p.phone, "contact_id": contact_id}
+                for contact, contact_id in pairs
+                for p in contact.phones
+            ],
+            AdditionalData: [
+                {"key": d.key, "value": d.value, "contact_id": contact_id}
+                for contact, contact_id in pairs
+                for d in contact.additional_data
+                if not as_json
+            ],
+        }
+        for model, rows in children.items():
+            if rows:
+                db.execute(insert(model), rows)
+        return [
+            {"index": index, "id": contact_id}
+            for (index, _), contact_id in zip(accepted, contact_ids)
+        ]
+
     def get_contacts(
         self, db: Session, user_id: int, skip: int = 0, limit: int = 10
     ) -> List[Contact]:
         # Retrieve all contacts for the given user
         return (
-            db.query(Contact)
-            .filter(Contact.user_id == user_id)
+            self._contacts_query(db, user_id)
+            .order_by(Contact.id)
             .offset(skip)
             .limit(limit)
             .all()
         )
 
+    def get_contacts_after(
+        self, db: Session, user_id: int, after_id: Optional[int], limit: int = 10
+    ) -> List[Contact]:
+        # Keyset pagination over the (user_id, id) index
+        query = self._contacts_query(db, user_id)
+        if after_id is not None:
+            query = query.filter(Contact.id > after_id)
+        return query.order_by(Contact.id).limit(limit).all()
+
+    def get_contact_rows(
+        self,
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        """
+        A page of contacts as plain dicts shaped like schemas.Contact.
+
+        Columns are read with one Core query for the page and one per child
+        table, so no ORM objects are built and nothing needs validating before
+        the page is encoded. ``after_id`` switches to keyset pagination, as in
+        get_contacts_after.
+        """
+        query = (
+            select(
+                Contact.id,
+                Contact.first_name,
+                Contact.last_name,
+                Contact.birthday,
+                Contact.attributes,
+            )
+            .where(Contact.user_id == user_id)
+            .order_by(Contact.id)
+            .limit(limit)
+        )
+        if after_id is not None:
+            query = query.where(Contact.id > after_id)
+        else:
+            query = query.offset(skip)
+        contacts = {}
+        for contact_id, first_name, last_name, birthday, attributes in db.execute(
+            query
+        ):
+            contacts[contact_id] = {
+                "first_name": first_name,
+                "last_name": last_name,
+                "birthday": birthday,
+                "id": contact_id,
+                "emails": [],
+                "phones": [],
+                "additional_data": (
+                    None
+                    if attributes is None
+                    else [
+                        {"key": item["key"], "value": item.get("value"), "id": None}
+                        for item in attributes
+                    ]
+                ),
+            }
+        if not contacts:
+            return []
+        ids = list(contacts)
+        for contact_id, email_id, email in db.execute(
+            select(Email.contact_id, Email.id, Email.email)
+            .where(Email.contact_id.in_(ids))
+            .order_by(Email.id)
+        ):
+            contacts[contact_id]["emails"].append(
+                {"email": email, "id": email_id, "contact_id": contact_id}
+            )
+        for contact_id, phone_id, phone in db.execute(
+            select(Phone.contact_id, Phone.id, Phone.phone)
+            .where(Phone.contact_id.in_(ids))
+            .order_by(Phone.id)
+        ):
+            contacts[contact_id]["phones"].append(
+                {"phone": phone, "id": phone_id, "contact_id": contact_id}
+            )
+        # Rows only count for contacts whose pairs are not stored as JSON yet
+        unmigrated = [i for i in ids if contacts[i]["additional_data"] is None]
+        for contact_id in unmigrated:
+            contacts[contact_id]["additional_data"] = []
+        if unmigrated:
+            for contact_id, data_id, key, value in db.execute(
+                select(
+                    AdditionalData.contact_id,
+                    AdditionalData.id,
+                    AdditionalData.key,
+                    AdditionalData.value,
+                )
+                .where(AdditionalData.contact_id.in_(unmigrated))
+                .order_by(AdditionalData.id)
+            ):
+                contacts[contact_id]["additional_data"].append(
+                    {"key": key, "value": value, "id": data_id}
+                )
+        return list(contacts.values())
+
+    def iter_contacts(
+        self, db: Session, user_id: int, batch_size: int
+    ) -> Iterator[List[Contact]]:
+        """
+        Yield all contacts of the user in batches read from a server-side cursor.
+
+        Each batch is expunged once the caller moves on, so memory stays flat
+        however large the address book is.
+        """
+        stmt = (
+            select(Contact)
+            .options(
+                # selectin is the only collection loader that works with yield_per
+                selectinload(Contact.emails),
+                selectinload(Contact.phones),
+                selectinload(Contact.additional_data),
+            )
+            .where(Contact.user_id == user_id)
+            .order_by(Contact.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for batch in db.scalars(stmt).partitions():
+            yield batch
+            for contact in batch:
+                db.expunge(contact)
+
     def get_contact(
         self, db: Session, contact_id: int, user_id: int
     ) -> Optional[Contact]:
         # Retrieve a specific contact by ID for the given user
         return (
-            db.query(Contact)
-            .filter(Contact.id == contact_id, Contact.user_id == user_id)
-            .first()
+            self._contacts_query(db, user_id).filter(Contact.id == contact_id).first()
         )
 
     def update_contact(
         self, db: Session, contact_id: int, contact: ContactCreate, user_id: int
     ) -> Optional[Contact]:
-        db_contact = (
-            db.query(Contact)
-            .filter(Contact.id == contact_id, Contact.user_id == user_id)
-            .first()
-        )
+        db_contact = self.get_contact(db, contact_id, user_id)
         if db_contact:
-
             for key, value in contact.model_dump(exclude_unset=True).items():
                 if key not in ["emails", "phones", "additional_data"]:
                     setattr(db_contact, key, value)
 
-            # Replace emails
+            # Children are diffed against the loaded rows, so unchanged ones
+            # cost no writes and everything lands in a single commit
             if contact.emails:
-                db_contact.emails.clear()  # Clear existing emails
-                db.commit()  # Commit to ensure old emails are deleted
-                db_contact.emails.extend(
-                    [Email(email=email.email) for email in contact.emails]
+                self._sync_values(
+                    db_contact.emails, Email, "email", [e.email for e in contact.emails]
                 )
-
-            # Replace phones
             if contact.phones:
-                db_contact.phones.clear()  # Clear existing phones
-                db.commit()  # Commit to ensure old phones are deleted
-                db_contact.phones.extend(
-                    [Phone(phone=phone.phone) for phone in contact.phones]
+                self._sync_values(
+                    db_contact.phones, Phone, "phone", [p.phone for p in contact.phones]
                 )
-
-            # Replace additional_data
             if contact.additional_data:
-                db_contact.additional_data.clear()  # Clear existing additional_data
-                db.commit()  # Commit to ensure old additional_data is deleted
-                db_contact.additional_data.extend(
-                    [
-                        AdditionalData(key=data.key, value=data.value)
-                        for data in contact.additional_data
-                    ]
-                )
+                self._store_additional_data(db_contact, contact.additional_data)
 
+            if not db.is_modified(db_contact) and not any(
+                db.is_modified(row) for row in db_contact.additional_data
+            ):
+                # A no-op PUT: nothing to commit, invalidate or announce
+                return db_contact
+            # Child rows only touch their own tables, so stamp the parent here
+            db_contact.updated_at = func.now()
             db.commit()
-            db.refresh(db_contact)
+            db_contact = self.get_contact(db, contact_id, user_id)
+            self._record_change(
+                db, ContactChange(user_id, "updated", [contact_id], [db_contact])
+            )
         return db_contact
 
+    @staticmethod
+    def _sync_values(collection: list, model, field: str, values: List[str]) -> None:
+        # Keep rows whose value is still wanted, delete the rest, add the new ones
+        wanted = list(dict.fromkeys(values))
+        existing = {getattr(row, field) for row in collection}
+        for row in list(collection):
+            if getattr(row, field) not in wanted:
+                collection.remove(row)  # delete-orphan issues the DELETE
+        for value in wanted:
+            if value not in existing:
+                collection.append(model(**{field: value}))
+
+    def _store_additional_data(
+        self, db_contact: Contact, incoming: List[AdditionalDataCreate]
+    ) -> None:
+        # Writes move the contact to the configured storage; reads handle both
+        if self.additional_data_storage == "jsonb":
+            pairs = [{"key": item.key, "value": item.value} for item in incoming]
+            if db_contact.attributes != pairs:
+                db_contact.attributes = pairs
+            db_contact.additional_data.clear()
+            return
+        if db_contact.attributes is not None:
+            db_contact.attributes = None
+        self._sync_additional_data(db_contact.additional_data, incoming)
+
+    @staticmethod
+    def _sync_additional_data(
+        collection: list, incoming: List[AdditionalDataCreate]
+    ) -> None:
+        unmatched = list(collection)
+        changed = []
+        # Identical key/value pairs stay untouched
+        for item in incoming:
+            row = next(
+                (r for r in unmatched if r.key == item.key and r.value == item.value),
+                None,
+            )
+            if row is None:
+                changed.append(item)
+            else:
+                unmatched.remove(row)
+        # A remaining row with the same key is updated in place
+        for item in changed:
+            row = next((r for r in unmatched if r.key == item.key), None)
+            if row is None:
+                collection.append(AdditionalData(key=item.key, value=item.value))
+            else:
+                unmatched.remove(row)
+                row.value = item.value
+        for row in unmatched:
+            collection.remove(row)
+
     def delete_contact(
         self, db: Session, contact_id: int, user_id: int
     ) -> Optional[Contact]:
-        db_contact = (
-            db.query(Contact)
-            .filter(Contact.id == contact_id, Contact.user_id == user_id)
-            .first()
-        )
+        db_contact = self.get_contact(db, contact_id, user_id)
         if db_contact:
             db.delete(db_contact)
+            self._add_tombstone(db, contact_id, user_id)
             db.commit()
+            self._record_change(db, ContactChange(user_id, "deleted", [contact_id], []))
         return db_contact
 
+    @staticmethod
+    def _record_change(db: Session, change: ContactChange) -> None:
+        # Cache, index and event stream updates are left to the caller, which
+        # can run them off the event loop
+        db.info.setdefault(PENDING_CHANGES, []).append(change)
+
+    @staticmethod
+    def pop_changes(db: Session) -> List[ContactChange]:
+        """
+        Take the changes committed through ``db`` since the last call.
+
+        Write methods record a ContactChange after each commit; the caller
+        hands them to app.services.contacts.changes.apply_changes.
+        """
+        return db.info.pop(PENDING_CHANGES, [])
+
+    @staticmethod
+    def _add_tombstone(db: Session, contact_id: int, user_id: int) -> None:
+        # Recorded in the delete's transaction; expired ones of the user go too
+        now = db.scalar(select(func.now()))
+        retention = timedelta(days=settings.CONTACTS_TOMBSTONE_RETENTION_DAYS)
+        db.execute(
+            delete(ContactTombstone).where(
+                ContactTombstone.user_id == user_id,
+                ContactTombstone.deleted_at < now - retention,
+            )
+        )
+        db.add(ContactTombstone(user_id=user_id, contact_id=contact_id, deleted_at=now))
+
+    def get_changes(
+        self,
+        db: Session,
+        user_id: int,
+        since: Optional[datetime],
+        limit: int = 100,
+        position: Optional[SyncPosition] = None,
+    ) -> Optional[dict]:
+        """
+        Contacts changed and IDs of contacts deleted since ``since``, a page
+        of at most ``limit`` of each.
+
+        Without ``since`` every contact is returned. ``until`` is where the
+        next sync should resume, CONTACTS_CHANGES_LAG_SECONDS before now in
+        database time; it is fixed by the first page and carried in
+        ``position`` by the rest, which resume after the last contact in
+        (updated_at, id) order and after the last tombstone. ``position`` is
+        None once nothing is left. Returns None when ``since`` is older than
+        the tombstones kept, so deletions may have been forgotten.
+        """
+        now = db.scalar(select(func.now()))
+        if now.tzinfo is None:
+            # SQLite returns CURRENT_TIMESTAMP, in UTC, without an offset
+            now = now.replace(tzinfo=timezone.utc)
+        if position is None:
+            until = now - timedelta(seconds=settings.CONTACTS_CHANGES_LAG_SECONDS)
+            position = SyncPosition(until, None, None, None)
+        query = self._contacts_query(db, user_id)
+        if since is not None:
+            retention = timedelta(days=settings.CONTACTS_TOMBSTONE_RETENTION_DAYS)
+            if since < now - retention:
+                return None
+            query = query.filter(Contact.updated_at >= since)
+        if position.contact_id is not None:
+            query = query.filter(
+                tuple_(Contact.updated_at, Contact.id)
+                > (position.updated_at, position.contact_id)
+            )
+        changed = query.order_by(Contact.updated_at, Contact.id).limit(limit + 1).all()
+        deleted = []
+        if since is not None:
+            tombstones = select(ContactTombstone.id, ContactTombstone.contact_id).where(
+                ContactTombstone.user_id == user_id,
+                ContactTombstone.deleted_at >= since,
+            )
+            if position.tombstone_id is not None:
+                tombstones = tombstones.where(
+                    ContactTombstone.id > position.tombstone_id
+                )
+            deleted = db.execute(
+                tombstones.order_by(ContactTombstone.id).limit(limit + 1)
+            ).all()
+        if len(changed) <= limit and len(deleted) <= limit:
+            next_position = None
+        else:
+            changed, deleted = changed[:limit], deleted[:limit]
+            next_position = position._replace(
+                updated_at=changed[-1].updated_at if changed else position.updated_at,
+                contact_id=changed[-1].id if changed else position.contact_id,
+                tombstone_id=deleted[-1].id if deleted else position.tombstone_id,
+            )
+        return {
+            "changed": changed,
+            "deleted": [row.contact_id for row in deleted],
+            "until": position.until,
+            "position": next_position,
+        }
+
     def get_contact_by_name_lastname_email(
         self,
         db: Session,
@@ -117,7 +574,7 @@ class ContactsRepository:
         lastname: Optional[str] = None,
         email: Optional[str] = None,
     ) -> List[Contact]:
-        query = db.query(Contact).filter(Contact.user_id == user_id)
+        query = self._contacts_query(db, user_id)
         if name:
             query = query.filter(func.lower(Contact.first_name) == name.lower())
         if lastname:
@@ -128,64 +585,150 @@ class ContactsRepository:
             )
         return query.all()
 
-    def get_contacts_with_upcoming_birthdays(
-        self, db: Session, user_id: int
+    def get_contacts_by_attribute(
+        self, db: Session, user_id: int, key: str, value: Optional[str]
     ) -> List[Contact]:
-        today = datetime.today()
-        next_week = today + timedelta(days=7)
+        """
+        Contacts having the key/value pair, whichever way it is stored.
 
-        today_month = today.month
-        today_day = today.day
-        next_week_month = next_week.month
-        next_week_day = next_week.day
-
-        if today_month == next_week_month:
-            # If the range is within the same month
-            res = self._get_birthdays_same_month(
-                db, user_id, today_month, today_day, next_week_day
+        On PostgreSQL the JSON side is a GIN containment lookup; the rows side
+        only matters until every contact has been migrated.
+        """
+        if db.get_bind().dialect.name == "postgresql":
+            pair = type_coerce(Contact.attributes, JSONB).contains(
+                [{"key": key, "value": value}]
             )
         else:
-            # If the range is e.g. March 30 to April 5
-            res = self._get_birthdays_months_overlap(
-                db, user_id, today_month, today_day, next_week_month, next_week_day
+            items = func.json_each(Contact.attributes).table_valued("value")
+            pair = (
+                select(1)
+                .select_from(items)
+                .where(
+                    func.json_extract(items.c.value, "$.key") == key,
+                    func.json_extract(items.c.value, "$.value") == value,
+                )
+                .exists()
             )
-        return res
+        matching = union(
+            select(Contact.id).where(Contact.user_id == user_id, pair),
+            select(AdditionalData.contact_id).where(
+                AdditionalData.key == key, AdditionalData.value == value
+            ),
+        )
+        return (
+            self._contacts_query(db, user_id)
+            .filter(Contact.id.in_(matching))
+            .order_by(Contact.id)
+            .all()
+        )
 
-    def _get_birthdays_same_month(
-        self,
-        db: Session,
-        user_id: int,
-        today_month: int,
-        today_day: int,
-        next_week_day: int,
+    def search_contacts(
+        self, db: Session, user_id: int, term: str, limit: int = 20
     ) -> List[Contact]:
+        """
+        Contacts whose name or email contains ``term``, best matches first.
+
+        Names starting with the term rank first, then names with a word
+        starting with it. On PostgreSQL the pg_trgm indexes also match names
+        with a typo, ranked by word similarity; other databases only match
+        substrings. With the "memory" backend a warm in-process index picks
+        the contacts instead, also matching phones and additional data.
+        """
+        term = term.strip().lower()
+        if self.search_backend == "memory":
+            ids = self.search_index.search(user_id, term, limit, self.iter_contacts)
+            if ids is not None:
+                found = {
+                    contact.id: contact
+                    for contact in self._contacts_query(db, user_id).filter(
+                        Contact.id.in_(ids)
+                    )
+                }
+                return [found[contact_id] for contact_id in ids if contact_id in found]
+        where, rank = self._search_criteria(term, db.get_bind().dialect.name)
         return (
-            db.query(Contact)
-            .filter(
-                Contact.user_id == user_id,
-                extract("month", Contact.birthday) == today_month,
-                extract("day", Contact.birthday).between(today_day, next_week_day),
-            )
+            self._contacts_query(db, user_id)
+            .filter(where)
+            .order_by(*rank, Contact.id)
+            .limit(limit)
             .all()
         )
 
-    def _get_birthdays_months_overlap(
+    @staticmethod
+    def _search_criteria(term: str, dialect: str) -> tuple:
+        by_email = Contact.id.in_(
+            select(Email.contact_id).where(
+                func.lower(Email.email).contains(term, autoescape=True)
+            )
+        )
+        prefix = case(
+            (Contact.search_text.startswith(term, autoescape=True), 2),
+            (Contact.search_text.contains(" " + term, autoescape=True), 1),
+            else_=0,
+        )
+        where = Contact.search_text.contains(term, autoescape=True) | by_email
+        if dialect != "postgresql":
+            return where, [prefix.desc()]
+        # term <% search_text: some word of the name is similar to the term
+        fuzzy = literal(term).op("<%")(Contact.search_text)
+        similarity = func.word_similarity(term, Contact.search_text)
+        return where | fuzzy, [prefix.desc(), similarity.desc()]
+
+    def get_contacts_with_upcoming_birthdays(
         self,
         db: Session,
         user_id: int,
-        today_month: int,
-        today_day: int,
-        next_week_month: int,
-        next_week_day: int,
+        days: Optional[int] = None,
+        today: Optional[date] = None,
     ) -> List[Contact]:
+        """
+        Contacts with a birthday from ``today`` to ``days`` days ahead, both
+        included; UPCOMING_BIRTHDAYS_DAYS from the current date by default.
+        """
+        window = self._upcoming_birthdays_filter(
+            today or date.today(),
+            settings.UPCOMING_BIRTHDAYS_DAYS if days is None else days,
+        )
         return (
-            db.query(Contact)
-            .filter(
-                Contact.user_id == user_id,
-                (extract("month", Contact.birthday) == today_month)
-                & (extract("day", Contact.birthday) >= today_day)
-                | (extract("month", Contact.birthday) == next_week_month)
-                & (extract("day", Contact.birthday) <= next_week_day),
-            )
+            self._contacts_query(db, user_id).filter(window).order_by(Contact.id).all()
+        )
+
+    def get_contacts_by_ids(
+        self, db: Session, user_id: int, contact_ids: List[int]
+    ) -> List[Contact]:
+        # Contacts listed in a birthday digest, by primary key
+        if not contact_ids:
+            return []
+        return (
+            self._contacts_query(db, user_id)
+            .filter(Contact.id.in_(contact_ids))
+            .order_by(Contact.id)
             .all()
         )
+
+    def get_upcoming_birthday_ids(
+        self, db: Session, user_id: int, today: date
+    ) -> List[int]:
+        # Digest of one user, without loading the contacts
+        window = self._upcoming_birthdays_filter(
+            today, settings.UPCOMING_BIRTHDAYS_DAYS
+        )
+        return list(
+            db.scalars(
+                select(Contact.id)
+                .where(Contact.user_id == user_id, window)
+                .order_by(Contact.id)
+            )
+        )
+
+    @staticmethod
+    def _upcoming_birthdays_filter(today: date, days: int):
+        end = today + timedelta(days=days)
+        start_md = today.month * 100 + today.day
+        end_md = end.month * 100 + end.day
+        if days >= 365:
+            return Contact.birthday_md.is_not(None)
+        if start_md <= end_md:
+            return Contact.birthday_md.between(start_md, end_md)
+        # The window wraps from December into January
+        return (Contact.birthday_md >= start_md) | (Contact.birthday_md <= end_md)
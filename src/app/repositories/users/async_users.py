@@ -0,0 +1,31 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.models.user import User
+from app.repositories.users.users import UsersRepository
+
+
+class AsyncUsersRepository:
+    """
+    Asyncio counterpart of UsersRepository, sharing its queries via run_sync.
+
+    Writes that invalidate the principal cache in Redis stay on the sync stack,
+    so no Redis call runs on the event loop.
+    """
+
+    def __init__(self):
+        self.users_repository = UsersRepository()
+
+    async def get_user_by_username(self, db: AsyncSession, username: str) -> User:
+        return await db.run_sync(self.users_repository.get_user_by_username, username)
+
+    async def get_user_by_email(self, db: AsyncSession, email: str) -> User:
+        return await db.run_sync(self.users_repository.get_user_by_email, email)
+
+    async def get_user_by_id(self, db: AsyncSession, id: int) -> User:
+        return await db.run_sync(self.users_repository.get_user_by_id, id)
+
+    async def create_user(
+        self, db: AsyncSession, username: str, hashed_password: str, email: str
+    ) -> User:
+        return await db.run_sync(
+            self.users_repository.create_user, username, hashed_password, email
+        )
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from db.models.user import User
 from sqlalchemy import func
+from app.helpers.cache.principal_cache import principal_cache
 
 
 class UsersRepository:
@@ -28,12 +29,14 @@ class UsersRepository:
         user = self.get_user_by_email(db, email)
         user.confirmed = True
         db.commit()
+        principal_cache.invalidate_user(user.id)
 
     def update_avatar_url(self, db: Session, email: str, url: str) -> User:
         user = self.get_user_by_email(db, email)
         user.avatar = url
         db.commit()
         db.refresh(user)
+        principal_cache.invalidate_user(user.id)
         return user
 
     def update_password(self, db: Session, email: str, new_password: str):
@@ -42,4 +45,5 @@ class UsersRepository:
             user.password = new_password
             db.commit()
             db.refresh(user)
+            principal_cache.invalidate_user(user.id)
         return user
@@ -8,10 +8,11 @@ from fastapi import (
     Form,
 )
 from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from app.routers.auth import schemas
 from db.database import get_db
-from app.services.auth.jwt_manager import Hash
+from app.services.auth.password_hasher import password_hasher
 from app.services.user.user_service import UserService
 from app.helpers.email_sender.email import send_email, send_password_reset_email
 from app.routers.auth.schemas import UserResponse
@@ -21,8 +22,6 @@ from fastapi.templating import Jinja2Templates
 from fastapi.responses import HTMLResponse
 from pathlib import Path
 
-hash_handler = Hash()
-
 router = APIRouter(
     prefix="/api/auth",
     tags=["auth"],
@@ -39,7 +38,7 @@ templates = Jinja2Templates(
 @router.post(
     "/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED
 )
-def register_user(
+async def register_user(
     body: schemas.UserModel,
     background_tasks: BackgroundTasks,
     request: Request,
@@ -61,7 +60,7 @@ def register_user(
     """
 
     # Check if the email is already registered
-    email_user = user_service.get_user_by_email(db, body.email)
+    email_user = await run_in_threadpool(user_service.get_user_by_email, db, body.email)
     if email_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -69,7 +68,9 @@ def register_user(
         )
 
     # Check if the username is already taken
-    username_user = user_service.get_user_by_username(db, body.username)
+    username_user = await run_in_threadpool(
+        user_service.get_user_by_username, db, body.username
+    )
     if username_user:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
@@ -77,10 +78,12 @@ def register_user(
         )
 
     # Create a new user
-    new_user = user_service.create_user(
+    hashed_password = await password_hasher.get_password_hash_async(body.password)
+    new_user = await run_in_threadpool(
+        user_service.create_user,
         db,
         username=body.username,
-        hashed_password=hash_handler.get_password_hash(body.password),
+        hashed_password=hashed_password,
         email=body.email,
     )
 
@@ -94,7 +97,7 @@ def register_user(
 @router.post(
     "/login", response_model=schemas.TokenModel, status_code=status.HTTP_200_OK
 )
-def login(
+async def login(
     body: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
     user_service: UserService = Depends(UserService),
@@ -118,18 +121,25 @@ def login(
         HTTPException: If the user's email is not confirmed.
     """
     # Fetch the user by username
-    user = user_service.get_user_by_username(db, body.username)
+    user = await run_in_threadpool(user_service.get_user_by_username, db, body.username)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid username"
         )
 
     # Verify the password
-    if not hash_handler.verify_password(body.password, user.password):
+    verified, new_hash = await password_hasher.verify_and_update_async(
+        body.password, user.password
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password"
         )
 
+    # Rehash with the current cost when the stored hash is outdated
+    if new_hash is not None:
+        await run_in_threadpool(user_service.update_password, db, user.email, new_hash)
+
     # Check if the email is confirmed
     if not user.confirmed:
         raise HTTPException(
@@ -182,7 +192,7 @@ def request_password_reset(
 
 
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
-def reset_password(
+async def reset_password(
     token: str = Form(...),
     new_password: str = Form(...),
     db: Session = Depends(get_db),
@@ -206,15 +216,15 @@ def reset_password(
     email = jwt_manager.validate_password_reset_token(token)
 
     # Get the user by email
-    user = user_service.get_user_by_email(db, email)
+    user = await run_in_threadpool(user_service.get_user_by_email, db, email)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
         )
 
     # Update the user's password
-    hashed_password = Hash().get_password_hash(new_password)
-    user_service.update_password(db, email, hashed_password)
+    hashed_password = await password_hasher.get_password_hash_async(new_password)
+    await run_in_threadpool(user_service.update_password, db, email, hashed_password)
 
     return {"message": "Password reset successfully."}
 
@@ -0,0 +1,446 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import List, Optional
+from app.routers.contacts import schemas
+from app.routers.contacts import contacts
+from db.database import get_async_db
+from app.services.contacts.async_contact_service import AsyncContactService
+from app.dependencies.auth import jwt_manager
+from app.settings import settings
+from app.helpers.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    decode_cursor,
+    encode_sync_token,
+    decode_sync_token,
+)
+from app.helpers.cache.response_cache import contacts_response_cache
+from app.helpers.api.etag import etag_headers, make_etag, not_modified
+from app.helpers.api.responses import dump_json
+from db.models.user import User
+
+# Served instead of the sync contacts router when DB_ASYNC_MODE is enabled
+router = APIRouter(
+    prefix="/api/contacts",
+    tags=["contacts"],
+    responses={404: {"description": "Not found"}},
+)
+
+
+@router.post("/", response_model=schemas.Contact, status_code=status.HTTP_201_CREATED)
+async def create_contact(
+    contact: schemas.ContactCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Create a new contact for the current user.
+
+    Args:
+        contact (schemas.ContactCreate): The contact data to create.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.Contact: The created contact.
+    """
+    return await contact_service.create_contact(
+        db=db, contact_data=contact, user_id=current_user.id
+    )
+
+
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+async def create_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Create many contacts for the current user in one transaction.
+
+    Items whose email or phone is already taken are reported in ``conflicts``
+    and skipped without aborting the rest of the batch.
+
+    Args:
+        contacts (List[schemas.ContactCreate]): The contacts to create.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.BulkCreateResult: The IDs of the created contacts and the
+        rejected items, both by their index in the request.
+
+    Raises:
+        HTTPException: If the batch is larger than CONTACTS_BULK_MAX_ITEMS.
+    """
+    if len(contacts) > settings.CONTACTS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.CONTACTS_BULK_MAX_ITEMS} contacts per request",
+        )
+    return await contact_service.create_contacts_bulk(
+        db, contacts_data=contacts, user_id=current_user.id
+    )
+
+
+@router.get("/", response_model=List[schemas.Contact])
+async def read_contacts(
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Retrieve a list of contacts for the current user.
+
+    Contacts are ordered by ID. When a full page is returned, the cursor of the
+    next page is sent in the X-Next-Cursor response header; passing it back as
+    ``cursor`` switches to keyset pagination and ``skip`` is ignored. Pages are
+    served from the user's response cache until one of their contacts changes,
+    and a matching If-None-Match is answered with 304 before any query.
+
+    Args:
+        skip (int): The number of records to skip (default: 0).
+        limit (int): The maximum number of records to return (default: 10).
+        cursor (Optional[str]): The opaque cursor returned by the previous page.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        List[schemas.Contact]: A list of contacts.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
+    """
+    params = {"skip": skip, "limit": limit, "cursor": cursor}
+    version = await run_in_threadpool(contacts_response_cache.version, current_user.id)
+    etag = make_etag(current_user.id, version)
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    cached = await run_in_threadpool(
+        contacts_response_cache.get, current_user.id, version, "list", params
+    )
+    if cached is not None:
+        return cached
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    if settings.CONTACTS_FAST_JSON:
+        rows = await contact_service.get_contact_rows(
+            db, current_user.id, skip=skip, limit=limit, after_id=after_id
+        )
+        ids = [row["id"] for row in rows]
+        body = dump_json(rows)
+    else:
+        if cursor is not None:
+            contacts = await contact_service.get_contacts_after(
+                db, user_id=current_user.id, after_id=after_id, limit=limit
+            )
+        else:
+            contacts = await contact_service.get_contacts(
+                db, user_id=current_user.id, skip=skip, limit=limit
+            )
+        ids = [contact.id for contact in contacts]
+        body = schemas.ContactList.dump_json(contacts)
+    headers = etag_headers(etag)
+    if ids and len(ids) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(ids[-1])
+    return await run_in_threadpool(
+        contacts_response_cache.store,
+        current_user.id,
+        version,
+        "list",
+        params,
+        body,
+        headers,
+    )
+
+
+@router.get("/{contact_id}", response_model=schemas.Contact)
+async def read_contact(
+    contact_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Retrieve a specific contact by ID for the current user.
+
+    Answers 304 when If-None-Match still matches the ETag, which changes with
+    any write to the user's contacts.
+
+    Args:
+        contact_id (int): The ID of the contact to retrieve.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.Contact: The requested contact.
+
+    Raises:
+        HTTPException: If the contact is not found.
+    """
+    params = {"id": contact_id}
+    version = await run_in_threadpool(contacts_response_cache.version, current_user.id)
+    etag = make_etag(current_user.id, version)
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    cached = await run_in_threadpool(
+        contacts_response_cache.get, current_user.id, version, "detail", params
+    )
+    if cached is not None:
+        return cached
+    db_contact = await contact_service.get_contact(
+        db, contact_id=contact_id, user_id=current_user.id
+    )
+    if db_contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    body = schemas.ContactDetail.dump_json(db_contact)
+    return await run_in_threadpool(
+        contacts_response_cache.store,
+        current_user.id,
+        version,
+        "detail",
+        params,
+        body,
+        etag_headers(etag),
+    )
+
+
+@router.put("/{contact_id}", response_model=schemas.Contact)
+async def update_contact(
+    contact_id: int,
+    contact: schemas.ContactUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Update a specific contact by ID for the current user.
+
+    Args:
+        contact_id (int): The ID of the contact to update.
+        contact (schemas.ContactUpdate): The updated contact data.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.Contact: The updated contact.
+
+    Raises:
+        HTTPException: If the contact is not found.
+    """
+    db_contact = await contact_service.update_contact(
+        db, contact_id=contact_id, contact_data=contact, user_id=current_user.id
+    )
+    if db_contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return db_contact
+
+
+@router.delete("/{contact_id}", response_model=schemas.Contact)
+async def delete_contact(
+    contact_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Delete a specific contact by ID for the current user.
+
+    Args:
+        contact_id (int): The ID of the contact to delete.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.Contact: The deleted contact.
+
+    Raises:
+        HTTPException: If the contact is not found.
+    """
+    db_contact = await contact_service.delete_contact(
+        db, contact_id=contact_id, user_id=current_user.id
+    )
+    if db_contact is None:
+        raise HTTPException(status_code=404, detail="Contact not found")
+    return db_contact
+
+
+@router.get("/search/", response_model=List[schemas.Contact])
+async def search_contacts(
+    name: Optional[str] = None,
+    lastname: Optional[str] = None,
+    email: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    attribute: Optional[str] = Query(None, pattern=r"^[^=]+=", max_length=255),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Search for contacts by name, lastname, or email for the current user.
+
+    With ``q`` the other filters are ignored and contacts are matched by
+    prefix, substring or (on PostgreSQL) a close spelling of their name or
+    email, best matches first, which suits autocomplete. Otherwise
+    ``attribute`` ("key=value") returns the contacts having that pair in their
+    additional data.
+
+    Args:
+        name (Optional[str]): The first name to search for.
+        lastname (Optional[str]): The last name to search for.
+        email (Optional[str]): The email to search for.
+        q (Optional[str]): Free text to search names and emails for.
+        limit (int): The maximum number of contacts returned for ``q``.
+        attribute (Optional[str]): A "key=value" additional data pair.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        List[schemas.Contact]: A list of matching contacts.
+    """
+    params = {
+        "name": name,
+        "lastname": lastname,
+        "email": email,
+        "q": q,
+        "limit": limit,
+        "attribute": attribute,
+    }
+    version = await run_in_threadpool(contacts_response_cache.version, current_user.id)
+    cached = await run_in_threadpool(
+        contacts_response_cache.get, current_user.id, version, "search", params
+    )
+    if cached is not None:
+        return cached
+    if q is not None:
+        contacts = await contact_service.search_contacts(db, current_user.id, q, limit)
+    elif attribute is not None:
+        key, value = attribute.split("=", 1)
+        contacts = await contact_service.get_contacts_by_attribute(
+            db, current_user.id, key, value
+        )
+    else:
+        contacts = await contact_service.get_contact_by_name_lastname_email(
+            db, user_id=current_user.id, name=name, lastname=lastname, email=email
+        )
+    body = schemas.ContactList.dump_json(contacts)
+    return await run_in_threadpool(
+        contacts_response_cache.store, current_user.id, version, "search", params, body
+    )
+
+
+@router.get("/changes/", response_model=schemas.ContactChanges)
+async def contact_changes(
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Return what changed in the current user's contacts since the last sync.
+
+    Without ``since`` every contact is returned. Each response carries the
+    token to pass as ``since`` next time; contacts changed just before it may
+    be sent again, so clients should apply changes by contact ID. Changes are
+    sent ``limit`` contacts and ``limit`` deletions at a time: while ``more``
+    is true, the token fetches the next page of the same sync.
+
+    Args:
+        since (Optional[str]): The ``next_token`` of the previous response.
+        limit (int): The maximum number of changed and of deleted contacts
+            returned.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.ContactChanges: Changed contacts, IDs of deleted contacts,
+        the next sync token and whether more pages follow.
+
+    Raises:
+        HTTPException: If the token is invalid, or too old to know every
+        deletion since, in which case the client has to sync from scratch.
+    """
+    start, position = decode_sync_token(since) if since else (None, None)
+    changes = await contact_service.get_changes(
+        db, current_user.id, start, limit, position
+    )
+    if changes is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync token expired, sync again without since",
+        )
+    return {
+        "changed": changes["changed"],
+        "deleted": changes["deleted"],
+        "next_token": (
+            encode_sync_token(start, changes["position"])
+            if changes["position"]
+            else encode_sync_token(changes["until"])
+        ),
+        "more": changes["position"] is not None,
+    }
+
+
+@router.get("/birthdays/", response_model=List[schemas.Contact])
+async def contacts_with_upcoming_birthdays(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(jwt_manager.get_current_user_async),
+    contact_service: AsyncContactService = Depends(AsyncContactService),
+):
+    """
+    Retrieve contacts with upcoming birthdays for the current user.
+
+    Answers 304 when If-None-Match still matches: the ETag changes with the
+    user's contacts and with the date.
+
+    Args:
+        response (Response): The outgoing response, used to set the ETag.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
+        db (AsyncSession): The async database session.
+        current_user (User): The currently authenticated user.
+        contact_service (AsyncContactService): The contact service for interacting with the database.
+
+    Returns:
+        List[schemas.Contact]: A list of contacts with upcoming birthdays.
+    """
+    version = await run_in_threadpool(contacts_response_cache.version, current_user.id)
+    etag = make_etag(current_user.id, version, date.today())
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    contacts = await contact_service.get_contacts_with_upcoming_birthdays(
+        db, user_id=current_user.id, version=version
+    )
+    response.headers.update(etag_headers(etag))
+    return contacts
+
+
+# Endpoints without an async variant keep being served by the sync router
+_async_routes = {(route.path, frozenset(route.methods)) for route in router.routes}
+for route in contacts.router.routes:
+    if (route.path, frozenset(route.methods)) not in _async_routes:
+        router.routes.append(route)
@@ -1,12 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session, sessionmaker
+from datetime import date
+from typing import List, Literal, Optional
 from app.routers.contacts import schemas
-from db.database import get_db
+from db.database import get_db, get_session_factory
 from app.services.contacts.contact_service import ContactService
+from app.services.contacts.export import EXPORT_MEDIA_TYPES
+from app.services.contacts.importer import detect_format
 from app.services.user.user_service import UserService
 from app.services.auth.jwt_manager import JWTManager
 from app.dependencies.auth import jwt_manager
+from app.settings import settings
+from app.helpers.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    encode_cursor,
+    decode_cursor,
+    encode_sync_token,
+    decode_sync_token,
+)
+from app.helpers.cache.response_cache import contacts_response_cache
+from app.helpers.api.contact_events import contact_events, stream_events
+from app.helpers.api.etag import etag_headers, make_etag, not_modified
+from app.helpers.api.responses import dump_json
 from db.models.user import User
 
 router = APIRouter(
@@ -40,10 +67,48 @@ def create_contact(
     )
 
 
+@router.post("/bulk", response_model=schemas.BulkCreateResult)
+def create_contacts_bulk(
+    contacts: List[schemas.ContactCreate],
+    db: Session = Depends(get_db),
+    current_user: User = Depends(jwt_manager.get_current_user),
+    contact_service: ContactService = Depends(ContactService),
+):
+    """
+    Create many contacts for the current user in one transaction.
+
+    Items whose email or phone is already taken are reported in ``conflicts``
+    and skipped without aborting the rest of the batch.
+
+    Args:
+        contacts (List[schemas.ContactCreate]): The contacts to create.
+        db (Session): The database session.
+        current_user (User): The currently authenticated user.
+        contact_service (ContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.BulkCreateResult: The IDs of the created contacts and the
+        rejected items, both by their index in the request.
+
+    Raises:
+        HTTPException: If the batch is larger than CONTACTS_BULK_MAX_ITEMS.
+    """
+    if len(contacts) > settings.CONTACTS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {settings.CONTACTS_BULK_MAX_ITEMS} contacts per request",
+        )
+    return contact_service.create_contacts_bulk(
+        db, contacts_data=contacts, user_id=current_user.id
+    )
+
+
 @router.get("/", response_model=List[schemas.Contact])
 def read_contacts(
     skip: int = 0,
     limit: int = 10,
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(jwt_manager.get_current_user),
     contact_service: ContactService = Depends(ContactService),
@@ -51,25 +116,177 @@ def read_contacts(
     """
     Retrieve a list of contacts for the current user.
 
+    Contacts are ordered by ID. When a full page is returned, the cursor of the
+    next page is sent in the X-Next-Cursor response header; passing it back as
+    ``cursor`` switches to keyset pagination and ``skip`` is ignored. Pages are
+    served from the user's response cache until one of their contacts changes,
+    and a matching If-None-Match is answered with 304 before any query.
+
     Args:
         skip (int): The number of records to skip (default: 0).
         limit (int): The maximum number of records to return (default: 10).
+        cursor (Optional[str]): The opaque cursor returned by the previous page.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
         db (Session): The database session.
         current_user (User): The currently authenticated user.
         contact_service (ContactService): The contact service for interacting with the database.
 
     Returns:
         List[schemas.Contact]: A list of contacts.
+
+    Raises:
+        HTTPException: If the cursor is invalid.
     """
-    contacts = contact_service.get_contacts(
-        db, user_id=current_user.id, skip=skip, limit=limit
+    params = {"skip": skip, "limit": limit, "cursor": cursor}
+    version = contacts_response_cache.version(current_user.id)
+    etag = make_etag(current_user.id, version)
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    cached = contacts_response_cache.get(current_user.id, version, "list", params)
+    if cached is not None:
+        return cached
+    after_id = decode_cursor(cursor) if cursor is not None else None
+    if settings.CONTACTS_FAST_JSON:
+        rows = contact_service.get_contact_rows(
+            db, current_user.id, skip=skip, limit=limit, after_id=after_id
+        )
+        ids = [row["id"] for row in rows]
+        body = dump_json(rows)
+    else:
+        if cursor is not None:
+            contacts = contact_service.get_contacts_after(
+                db, user_id=current_user.id, after_id=after_id, limit=limit
+            )
+        else:
+            contacts = contact_service.get_contacts(
+                db, user_id=current_user.id, skip=skip, limit=limit
+            )
+        ids = [contact.id for contact in contacts]
+        body = schemas.ContactList.dump_json(contacts)
+    headers = etag_headers(etag)
+    if ids and len(ids) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(ids[-1])
+    return contacts_response_cache.store(
+        current_user.id, version, "list", params, body, headers
     )
-    return contacts
+
+
+@router.get("/export/", response_class=StreamingResponse)
+def export_contacts(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(jwt_manager.get_current_user),
+    contact_service: ContactService = Depends(ContactService),
+):
+    """
+    Export all contacts of the current user as NDJSON or CSV.
+
+    The body is streamed from a server-side cursor, so the first bytes are sent
+    right away and memory use does not grow with the number of contacts.
+
+    Args:
+        export_format (str): ``ndjson`` (default) or ``csv``.
+        session_factory (sessionmaker): Opens the session the stream reads from.
+        current_user (User): The currently authenticated user.
+        contact_service (ContactService): The contact service for interacting with the database.
+
+    Returns:
+        StreamingResponse: The contacts with their emails, phones and
+        additional data.
+    """
+    return StreamingResponse(
+        contact_service.export_contacts(
+            session_factory, user_id=current_user.id, export_format=export_format
+        ),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="contacts.{export_format}"'
+        },
+    )
+
+
+@router.post(
+    "/import/", response_model=schemas.ImportJob, status_code=status.HTTP_202_ACCEPTED
+)
+def import_contacts(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    import_format: Optional[Literal["csv", "vcard"]] = Query(None, alias="format"),
+    session_factory: sessionmaker = Depends(get_session_factory),
+    current_user: User = Depends(jwt_manager.get_current_user),
+    contact_service: ContactService = Depends(ContactService),
+):
+    """
+    Import contacts from a CSV or vCard file in the background.
+
+    The file is parsed row by row and written in chunks of
+    CONTACTS_IMPORT_CHUNK_SIZE contacts, so large files are imported within a
+    fixed memory budget. Progress is reported by ``GET /import/{job_id}``.
+
+    Args:
+        background_tasks (BackgroundTasks): Runs the import after the response.
+        file (UploadFile): The CSV (export layout) or vCard file.
+        import_format (Optional[str]): ``csv`` or ``vcard``; taken from the file
+            extension when omitted.
+        session_factory (sessionmaker): Opens the session the import writes with.
+        current_user (User): The currently authenticated user.
+        contact_service (ContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.ImportJob: The job ID and its initial counters.
+
+    Raises:
+        HTTPException: If the file type cannot be determined.
+    """
+    import_format = import_format or detect_format(file.filename)
+    if import_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Unsupported file type, upload a .csv or .vcf file",
+        )
+    job, path = contact_service.stage_import(file.file, user_id=current_user.id)
+    background_tasks.add_task(
+        contact_service.import_contacts,
+        session_factory,
+        job["job_id"],
+        path,
+        import_format,
+        current_user.id,
+    )
+    return job
+
+
+@router.get("/import/{job_id}", response_model=schemas.ImportJob)
+def read_import_job(
+    job_id: str,
+    current_user: User = Depends(jwt_manager.get_current_user),
+    contact_service: ContactService = Depends(ContactService),
+):
+    """
+    Report the progress of an import started by the current user.
+
+    Args:
+        job_id (str): The ID returned when the import was started.
+        current_user (User): The currently authenticated user.
+        contact_service (ContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.ImportJob: The job status and its counters.
+
+    Raises:
+        HTTPException: If the job is not found.
+    """
+    job = contact_service.get_import_job(job_id, user_id=current_user.id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
 
 @router.get("/{contact_id}", response_model=schemas.Contact)
 def read_contact(
     contact_id: int,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(jwt_manager.get_current_user),
     contact_service: ContactService = Depends(ContactService),
@@ -77,8 +294,12 @@ def read_contact(
     """
     Retrieve a specific contact by ID for the current user.
 
+    Answers 304 when If-None-Match still matches the ETag, which changes with
+    any write to the user's contacts.
+
     Args:
         contact_id (int): The ID of the contact to retrieve.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
         db (Session): The database session.
         current_user (User): The currently authenticated user.
         contact_service (ContactService): The contact service for interacting with the database.
@@ -89,12 +310,24 @@ def read_contact(
     Raises:
         HTTPException: If the contact is not found.
     """
+    params = {"id": contact_id}
+    version = contacts_response_cache.version(current_user.id)
+    etag = make_etag(current_user.id, version)
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
+    cached = contacts_response_cache.get(current_user.id, version, "detail", params)
+    if cached is not None:
+        return cached
     db_contact = contact_service.get_contact(
         db, contact_id=contact_id, user_id=current_user.id
     )
     if db_contact is None:
         raise HTTPException(status_code=404, detail="Contact not found")
-    return db_contact
+    body = schemas.ContactDetail.dump_json(db_contact)
+    return contacts_response_cache.store(
+        current_user.id, version, "detail", params, body, etag_headers(etag)
+    )
 
 
 @router.put("/{contact_id}", response_model=schemas.Contact)
@@ -164,6 +397,9 @@ def search_contacts(
     name: Optional[str] = None,
     lastname: Optional[str] = None,
     email: Optional[str] = None,
+    q: Optional[str] = Query(None, min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    attribute: Optional[str] = Query(None, pattern=r"^[^=]+=", max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(jwt_manager.get_current_user),
     contact_service: ContactService = Depends(ContactService),
@@ -171,10 +407,19 @@ def search_contacts(
     """
     Search for contacts by name, lastname, or email for the current user.
 
+    With ``q`` the other filters are ignored and contacts are matched by
+    prefix, substring or (on PostgreSQL) a close spelling of their name or
+    email, best matches first, which suits autocomplete. Otherwise
+    ``attribute`` ("key=value") returns the contacts having that pair in their
+    additional data.
+
     Args:
         name (Optional[str]): The first name to search for.
         lastname (Optional[str]): The last name to search for.
         email (Optional[str]): The email to search for.
+        q (Optional[str]): Free text to search names and emails for.
+        limit (int): The maximum number of contacts returned for ``q``.
+        attribute (Optional[str]): A "key=value" additional data pair.
         db (Session): The database session.
         current_user (User): The currently authenticated user.
         contact_service (ContactService): The contact service for interacting with the database.
@@ -182,14 +427,119 @@ def search_contacts(
     Returns:
         List[schemas.Contact]: A list of matching contacts.
     """
-    contacts = contact_service.get_contact_by_name_lastname_email(
-        db, user_id=current_user.id, name=name, lastname=lastname, email=email
+    params = {
+        "name": name,
+        "lastname": lastname,
+        "email": email,
+        "q": q,
+        "limit": limit,
+        "attribute": attribute,
+    }
+    version = contacts_response_cache.version(current_user.id)
+    cached = contacts_response_cache.get(current_user.id, version, "search", params)
+    if cached is not None:
+        return cached
+    if q is not None:
+        contacts = contact_service.search_contacts(db, current_user.id, q, limit)
+    elif attribute is not None:
+        key, value = attribute.split("=", 1)
+        contacts = contact_service.get_contacts_by_attribute(
+            db, current_user.id, key, value
+        )
+    else:
+        contacts = contact_service.get_contact_by_name_lastname_email(
+            db, user_id=current_user.id, name=name, lastname=lastname, email=email
+        )
+    body = schemas.ContactList.dump_json(contacts)
+    return contacts_response_cache.store(
+        current_user.id, version, "search", params, body
     )
-    return contacts
+
+
+@router.get("/events/", response_class=StreamingResponse)
+async def contact_event_stream(
+    current_user: User = Depends(jwt_manager.get_current_user),
+):
+    """
+    Stream create, update and delete events of the current user's contacts.
+
+    Events are Server-Sent Events named ``created``, ``updated`` or
+    ``deleted`` whose data lists the contact IDs; ``resync`` means events were
+    dropped and the client should catch up through ``/changes/``. Idle streams
+    get a heartbeat comment every CONTACTS_EVENTS_HEARTBEAT_SECONDS.
+
+    Args:
+        current_user (User): The currently authenticated user.
+
+    Returns:
+        StreamingResponse: A text/event-stream response that stays open.
+    """
+    return StreamingResponse(
+        stream_events(
+            contact_events, current_user.id, settings.CONTACTS_EVENTS_HEARTBEAT_SECONDS
+        ),
+        media_type="text/event-stream",
+        # Keep proxies from buffering or caching the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/changes/", response_model=schemas.ContactChanges)
+def contact_changes(
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(jwt_manager.get_current_user),
+    contact_service: ContactService = Depends(ContactService),
+):
+    """
+    Return what changed in the current user's contacts since the last sync.
+
+    Without ``since`` every contact is returned. Each response carries the
+    token to pass as ``since`` next time; contacts changed just before it may
+    be sent again, so clients should apply changes by contact ID. Changes are
+    sent ``limit`` contacts and ``limit`` deletions at a time: while ``more``
+    is true, the token fetches the next page of the same sync.
+
+    Args:
+        since (Optional[str]): The ``next_token`` of the previous response.
+        limit (int): The maximum number of changed and of deleted contacts
+            returned.
+        db (Session): The database session.
+        current_user (User): The currently authenticated user.
+        contact_service (ContactService): The contact service for interacting with the database.
+
+    Returns:
+        schemas.ContactChanges: Changed contacts, IDs of deleted contacts,
+        the next sync token and whether more pages follow.
+
+    Raises:
+        HTTPException: If the token is invalid, or too old to know every
+        deletion since, in which case the client has to sync from scratch.
+    """
+    start, position = decode_sync_token(since) if since else (None, None)
+    changes = contact_service.get_changes(db, current_user.id, start, limit, position)
+    if changes is None:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync token expired, sync again without since",
+        )
+    return {
+        "changed": changes["changed"],
+        "deleted": changes["deleted"],
+        "next_token": (
+            encode_sync_token(start, changes["position"])
+            if changes["position"]
+            else encode_sync_token(changes["until"])
+        ),
+        "more": changes["position"] is not None,
+    }
 
 
 @router.get("/birthdays/", response_model=List[schemas.Contact])
 def contacts_with_upcoming_birthdays(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(jwt_manager.get_current_user),
     contact_service: ContactService = Depends(ContactService),
@@ -197,7 +547,12 @@ def contacts_with_upcoming_birthdays(
     """
     Retrieve contacts with upcoming birthdays for the current user.
 
+    Answers 304 when If-None-Match still matches: the ETag changes with the
+    user's contacts and with the date.
+
     Args:
+        response (Response): The outgoing response, used to set the ETag.
+        if_none_match (Optional[str]): ETag of the copy the client holds.
         db (Session): The database session.
         current_user (User): The currently authenticated user.
         contact_service (ContactService): The contact service for interacting with the database.
@@ -205,7 +560,13 @@ def contacts_with_upcoming_birthdays(
     Returns:
         List[schemas.Contact]: A list of contacts with upcoming birthdays.
     """
+    version = contacts_response_cache.version(current_user.id)
+    etag = make_etag(current_user.id, version, date.today())
+    unchanged = not_modified(etag, if_none_match)
+    if unchanged is not None:
+        return unchanged
     contacts = contact_service.get_contacts_with_upcoming_birthdays(
-        db, user_id=current_user.id
+        db, user_id=current_user.id, version=version
     )
+    response.headers.update(etag_headers(etag))
     return contacts
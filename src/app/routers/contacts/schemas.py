@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import AliasChoices, BaseModel, EmailStr, Field, TypeAdapter
 from typing import List, Optional
 from datetime import date
 
@@ -45,7 +45,8 @@ class AdditionalDataCreate(AdditionalDataBase):
 
 
 class AdditionalData(AdditionalDataBase):
-    id: int
+    # Pairs stored as JSON have no row id
+    id: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -76,7 +77,51 @@ class Contact(ContactBase):
     id: int
     emails: List[Email] = []
     phones: List[Phone] = []
-    additional_data: List[AdditionalData] = []
+    # Read from the JSON attributes or the additional_data rows of the model
+    additional_data: List[AdditionalData] = Field(
+        [], validation_alias=AliasChoices("additional_data_items", "additional_data")
+    )
 
     class Config:
         from_attributes = True
+
+
+class ContactChanges(BaseModel):
+    changed: List[Contact] = []
+    deleted: List[int] = []
+    # Pass back as ``since`` to get the changes made after this response,
+    # or the next page of this sync while ``more`` is true
+    next_token: str
+    more: bool = False
+
+
+class BulkCreated(BaseModel):
+    index: int
+    id: int
+
+
+class BulkConflict(BaseModel):
+    index: int
+    field: Optional[str] = None
+    value: Optional[str] = None
+    detail: str
+
+
+class BulkCreateResult(BaseModel):
+    created: List[BulkCreated] = []
+    conflicts: List[BulkConflict] = []
+
+
+class ImportJob(BaseModel):
+    job_id: str
+    status: str
+    rows_read: int = 0
+    created: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    errors: List[str] = []
+
+
+# Render responses that bypass response_model, such as cached reads
+ContactList = TypeAdapter(List[Contact])
+ContactDetail = TypeAdapter(Contact)
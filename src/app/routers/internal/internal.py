@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends
+from app.dependencies.auth import jwt_manager
+from db.database import get_pool_stats
+from app.helpers.cache.principal_cache import principal_cache
+from app.helpers.cache.birthday_digest import birthday_digest_cache
+from app.helpers.cache.search_index import contact_search_index
+from app.helpers.cache.response_cache import contacts_response_cache
+from app.helpers.api.contact_events import contact_events
+from app.services.auth.password_hasher import password_hasher
+from db.models.user import User
+
+# Operational endpoints for admins; kept out of the public OpenAPI schema
+router = APIRouter(
+    prefix="/api/internal",
+    tags=["internal"],
+    include_in_schema=False,
+)
+
+
+@router.get("/db/pool")
+def db_pool_stats(
+    current_user: User = Depends(jwt_manager.get_current_admin_user),
+):
+    """
+    Report connection pool usage for sizing the pool against real traffic.
+
+    Args:
+        current_user (User): The currently authenticated admin user.
+
+    Returns:
+        dict: Checked-out and overflow connections plus the checkout wait-time
+        histogram for each engine.
+    """
+    return get_pool_stats()
+
+
+@router.get("/cache")
+def cache_stats(
+    current_user: User = Depends(jwt_manager.get_current_admin_user),
+):
+    """
+    Report hit, miss and eviction counters of this worker's caches.
+
+    Args:
+        current_user (User): The currently authenticated admin user.
+
+    Returns:
+        dict: Counters for each cache tier.
+    """
+    return {
+        "principal": principal_cache.stats(),
+        "birthday_digest": birthday_digest_cache.stats(),
+        "contact_search_index": contact_search_index.stats(),
+        "contacts_response": contacts_response_cache.stats(),
+    }
+
+
+@router.get("/password-hasher")
+def password_hasher_stats(
+    current_user: User = Depends(jwt_manager.get_current_admin_user),
+):
+    """
+    Report load on this worker's password hashing executor.
+
+    Args:
+        current_user (User): The currently authenticated admin user.
+
+    Returns:
+        dict: Running and queued calls, rejections and hashing latency.
+    """
+    return password_hasher.stats()
+
+
+@router.get("/events")
+def contact_events_stats(
+    current_user: User = Depends(jwt_manager.get_current_admin_user),
+):
+    """
+    Report this worker's open contact event streams.
+
+    Args:
+        current_user (User): The currently authenticated admin user.
+
+    Returns:
+        dict: Open streams and users, events published and delivered, and
+        buffer overflows of the open streams.
+    """
+    return contact_events.stats()
@@ -0,0 +1,91 @@
+"""
+Pick a bcrypt cost for this machine.
+
+Run from ``src``::
+
+    python -m app.services.auth.hash_calibration --target-ms 250
+
+and put the printed ``PASSWORD_HASH_ROUNDS`` into ``.env``. Users whose stored
+hash was made with another cost are rehashed transparently on their next login.
+"""
+
+import argparse
+import statistics
+import time
+from typing import Callable
+from passlib.hash import bcrypt
+
+# bcrypt accepts 4..31; below 10 is too cheap to be worth storing
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure_hash_ms(rounds: int, samples: int = 3) -> float:
+    """
+    Return the median time in milliseconds to hash a password at ``rounds``.
+    """
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate_rounds(
+    target_ms: float,
+    min_rounds: int = MIN_ROUNDS,
+    max_rounds: int = MAX_ROUNDS,
+    measure: Callable[[int], float] = measure_hash_ms,
+) -> tuple[int, dict[int, float]]:
+    """
+    Find the highest cost whose hashing time stays within ``target_ms``.
+
+    Every extra round doubles the work, so the search stops at the first cost
+    over the target. ``min_rounds`` is returned even when it is already too
+    slow, the floor is a security decision rather than a performance one.
+
+    Returns:
+        tuple: The chosen cost and the measured milliseconds for each cost tried.
+    """
+    chosen = min_rounds
+    timings = {}
+    for rounds in range(min_rounds, max_rounds + 1):
+        timings[rounds] = measure(rounds)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+    return chosen, timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark bcrypt and pick a cost meeting a target latency."
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250.0,
+        help="Upper bound for one hash on this machine (default: 250)",
+    )
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=MAX_ROUNDS)
+    parser.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    rounds, timings = calibrate_rounds(
+        args.target_ms,
+        min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds,
+        measure=lambda r: measure_hash_ms(r, samples=args.samples),
+    )
+    for tried, elapsed in timings.items():
+        print(f"rounds={tried:<3} {elapsed:8.1f} ms")
+    if timings[rounds] > args.target_ms:
+        print(f"warning: even rounds={rounds} exceeds {args.target_ms} ms")
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+
+
+if __name__ == "__main__":
+    main()
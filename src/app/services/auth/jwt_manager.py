@@ -1,28 +1,38 @@
 from datetime import datetime, timedelta, UTC
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from app.settings import settings
-from db.database import get_db
+from db.database import get_db, get_async_db
 from app.services.user.user_service import UserService
+from app.services.user.async_user_service import AsyncUserService
 from fastapi.security import OAuth2PasswordBearer
 from app.settings import settings
 from db.models.user import User, UserRole
-import redis
-from redis_lru import RedisLRU
+from app.helpers.cache.principal_cache import principal_cache
+from starlette.concurrency import run_in_threadpool
 
 SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = settings.ALGORITHM
 JWT_EXPIRATION_SECONDS = settings.JWT_EXPIRATION_SECONDS
 
-# Initialize Redis connection
-redis_client = redis.StrictRedis(
-    host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB
-)
-cache = RedisLRU(redis_client)
+
+def build_crypt_context(rounds: int) -> CryptContext:
+    """
+    Build a bcrypt context that hashes with the given cost and treats any hash
+    made with a different cost as outdated.
+    """
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
 
 
 class Hash:
@@ -30,7 +40,11 @@ class Hash:
     Utility class for hashing and verifying passwords.
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = build_crypt_context(settings.PASSWORD_HASH_ROUNDS)
+
+    def __init__(self, rounds: Optional[int] = None):
+        if rounds is not None:
+            self.pwd_context = build_crypt_context(rounds)
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -38,6 +52,22 @@ class Hash:
     def get_password_hash(self, password: str):
         return self.pwd_context.hash(password)
 
+    def needs_update(self, hashed_password: str) -> bool:
+        return self.pwd_context.needs_update(hashed_password)
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Verify a password and, when the stored hash uses outdated parameters,
+        return a new hash of it made with the current ones.
+        """
+        if not self.verify_password(plain_password, hashed_password):
+            return False, None
+        if self.needs_update(hashed_password):
+            return True, self.get_password_hash(plain_password)
+        return True, None
+
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=settings.OAUTH2_SCHEME)
 
@@ -63,47 +93,88 @@ class JWTManager:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
-    @cache
     def get_current_user(
         self,
         token: str = Depends(oauth2_scheme),
         db: Session = Depends(get_db),
         user_service: UserService = Depends(UserService),  # Resolve dependency here
+        request: Request = None,
     ):
         """
         Retrieve the current authenticated user from the token.
+
+        The user is served from the principal cache when the token was seen
+        before; the database is only queried on a miss. Its ID is kept on
+        ``request.state`` for the rate limiter.
+        """
+        user = principal_cache.get(token)
+        if user is None:
+            payload = self._decode_access_token(token)
+            user = user_service.get_user_by_username(db, payload["sub"])
+            if user is None:
+                raise self._credentials_exception()
+            principal_cache.set(token, user, payload.get("exp"))
+        if request is not None:
+            request.state.user_id = user.id
+        return user
+
+    async def get_current_user_async(
+        self,
+        token: str = Depends(oauth2_scheme),
+        db: AsyncSession = Depends(get_async_db),
+        user_service: AsyncUserService = Depends(AsyncUserService),
+        request: Request = None,
+    ):
+        """
+        Retrieve the current authenticated user from the token using the async
+        database stack.
         """
-        credentials_exception = HTTPException(
+        user = await run_in_threadpool(principal_cache.get, token)
+        if user is None:
+            payload = self._decode_access_token(token)
+            user = await user_service.get_user_by_username(db, payload["sub"])
+            if user is None:
+                raise self._credentials_exception()
+            await run_in_threadpool(
+                principal_cache.set, token, user, payload.get("exp")
+            )
+        if request is not None:
+            request.state.user_id = user.id
+        return user
+
+    @staticmethod
+    def _credentials_exception() -> HTTPException:
+        return HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    def _decode_access_token(self, token: str) -> dict:
+        """
+        Decode an access token, making sure it carries a subject.
+        """
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            username = payload.get("sub")
-            if username is None:
-                raise credentials_exception
         except JWTError:
-            raise credentials_exception
-
-        user = user_service.get_user_by_username(db, username)
-        if user is None:
-            raise credentials_exception
-        return user
+            raise self._credentials_exception()
+        if payload.get("sub") is None:
+            raise self._credentials_exception()
+        return payload
 
     def get_current_admin_user(
         self,
         token: str = Depends(oauth2_scheme),
         db: Session = Depends(get_db),
         user_service: UserService = Depends(UserService),
+        request: Request = None,
     ):
         """
         Retrieve the current authenticated admin user from the token.
         """
         # Call get_current_user explicitly
         current_user = self.get_current_user(
-            token=token, db=db, user_service=user_service
+            token=token, db=db, user_service=user_service, request=request
         )
 
         if current_user.role != UserRole.admin.value:
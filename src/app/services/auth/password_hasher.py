@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+from fastapi import HTTPException, status
+from app.settings import settings
+from app.services.auth.jwt_manager import Hash
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated, bounded executor.
+
+    bcrypt releases the GIL, so a small thread pool hashes in parallel without
+    the pickling and start-up cost of a process pool. At most
+    ``max_workers + max_queue`` calls are admitted at a time; any call beyond
+    that is rejected with 503 straight away. The ``_async`` methods await the
+    executor from the event loop, so a login burst holds no request thread at
+    all while bcrypt runs.
+    """
+
+    def __init__(self, hasher: Hash, max_workers: int, max_queue: int):
+        self.hasher = hasher
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(self.hasher.verify_password, plain_password, hashed_password)
+
+    def get_password_hash(self, password: str) -> str:
+        return self._run(self.hasher.get_password_hash, password)
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        return self._run(self.hasher.verify_and_update, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        return await self._run_async(self.hasher.get_password_hash, password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        return await self._run_async(
+            self.hasher.verify_and_update, plain_password, hashed_password
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self.running,
+                "queued": self.in_flight - self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": (
+                    self.total_seconds / self.completed * 1000
+                    if self.completed
+                    else 0.0
+                ),
+                "max_ms": self.max_seconds * 1000,
+            }
+
+    def _run(self, func: Callable, *args):
+        self._admit()
+        try:
+            return self._executor.submit(self._timed, func, *args).result()
+        finally:
+            self._leave()
+
+    async def _run_async(self, func: Callable, *args):
+        # Awaits the executor, so no request thread is held while bcrypt runs
+        self._admit()
+        try:
+            return await asyncio.wrap_future(
+                self._executor.submit(self._timed, func, *args)
+            )
+        finally:
+            self._leave()
+
+    def _admit(self) -> None:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests, please retry",
+                headers={"Retry-After": "1"},
+            )
+        with self._lock:
+            self.in_flight += 1
+
+    def _leave(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _timed(self, func: Callable, *args):
+        with self._lock:
+            self.running += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+
+password_hasher = PasswordHasher(
+    Hash(),
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,150 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.contacts.async_crud import AsyncContactsRepository
+from app.services.contacts.changes import apply_changes
+from app.helpers.cache.birthday_digest import birthday_digest_cache
+from app.helpers.api.pagination import SyncPosition
+from fastapi import Depends
+from fastapi.concurrency import run_in_threadpool
+from datetime import date, datetime
+from typing import List, Optional
+from db.models.contact import Contact
+
+
+class AsyncContactService:
+    """
+    Service layer for contact-related operations on the async database stack.
+    """
+
+    def __init__(self, contacts_repository: AsyncContactsRepository = Depends()):
+        self.contacts_repository = contacts_repository
+
+    async def get_contact_rows(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        return await self.contacts_repository.get_contact_rows(
+            db, user_id, skip, limit, after_id
+        )
+
+    async def get_contact(
+        self, db: AsyncSession, contact_id: int, user_id: int
+    ) -> Contact:
+        return await self.contacts_repository.get_contact(db, contact_id, user_id)
+
+    async def get_contacts(
+        self, db: AsyncSession, user_id: int, skip: int = 0, limit: int = 10
+    ) -> List[Contact]:
+        return await self.contacts_repository.get_contacts(db, user_id, skip, limit)
+
+    async def get_contacts_after(
+        self, db: AsyncSession, user_id: int, after_id: Optional[int], limit: int = 10
+    ) -> List[Contact]:
+        return await self.contacts_repository.get_contacts_after(
+            db, user_id, after_id, limit
+        )
+
+    async def create_contact(
+        self, db: AsyncSession, contact_data: dict, user_id: int
+    ) -> Contact:
+        contact = await self.contacts_repository.create_contact(
+            db, contact_data, user_id
+        )
+        await self._apply_changes(db)
+        return contact
+
+    async def create_contacts_bulk(
+        self, db: AsyncSession, contacts_data: list, user_id: int
+    ) -> dict:
+        result = await self.contacts_repository.create_contacts_bulk(
+            db, contacts_data, user_id
+        )
+        await self._apply_changes(db)
+        return result
+
+    async def update_contact(
+        self, db: AsyncSession, contact_id: int, contact_data: dict, user_id: int
+    ) -> Optional[Contact]:
+        contact = await self.contacts_repository.update_contact(
+            db, contact_id, contact_data, user_id
+        )
+        await self._apply_changes(db)
+        return contact
+
+    async def delete_contact(
+        self, db: AsyncSession, contact_id: int, user_id: int
+    ) -> Optional[Contact]:
+        contact = await self.contacts_repository.delete_contact(db, contact_id, user_id)
+        await self._apply_changes(db)
+        return contact
+
+    async def _apply_changes(self, db: AsyncSession) -> None:
+        # Cache and index updates wait on Redis: keep them off the event loop
+        changes = self.contacts_repository.pop_changes(db)
+        if changes:
+            await run_in_threadpool(
+                apply_changes, changes, self.contacts_repository.contacts_repository
+            )
+
+    async def get_contact_by_name_lastname_email(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        name: Optional[str],
+        lastname: Optional[str],
+        email: Optional[str],
+    ) -> List[Contact]:
+        return await self.contacts_repository.get_contact_by_name_lastname_email(
+            db, user_id, name, lastname, email
+        )
+
+    async def get_contacts_by_attribute(
+        self, db: AsyncSession, user_id: int, key: str, value: str
+    ) -> List[Contact]:
+        return await self.contacts_repository.get_contacts_by_attribute(
+            db, user_id, key, value
+        )
+
+    async def get_changes(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        since: Optional[datetime],
+        limit: int,
+        position: Optional[SyncPosition] = None,
+    ) -> Optional[dict]:
+        return await self.contacts_repository.get_changes(
+            db, user_id, since, limit, position
+        )
+
+    async def search_contacts(
+        self, db: AsyncSession, user_id: int, term: str, limit: int
+    ) -> List[Contact]:
+        return await self.contacts_repository.search_contacts(db, user_id, term, limit)
+
+    async def get_contacts_with_upcoming_birthdays(
+        self, db: AsyncSession, user_id: int, version: Optional[int] = None
+    ) -> List[Contact]:
+        """
+        Contacts with a birthday in the upcoming window, served from the daily
+        digest as in ContactService; Redis is read from the threadpool.
+        """
+        repository = self.contacts_repository
+        if version is None:
+            return await repository.get_contacts_with_upcoming_birthdays(db, user_id)
+        today = date.today()
+        contact_ids = await run_in_threadpool(
+            birthday_digest_cache.get, user_id, version, today
+        )
+        if contact_ids is not None:
+            return await repository.get_contacts_by_ids(db, user_id, contact_ids)
+        contacts = await repository.get_contacts_with_upcoming_birthdays(
+            db, user_id, today=today
+        )
+        await run_in_threadpool(
+            birthday_digest_cache.set, user_id, version, today, [c.id for c in contacts]
+        )
+        return contacts
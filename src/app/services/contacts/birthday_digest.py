@@ -0,0 +1,119 @@
+import logging
+import threading
+from datetime import date, datetime, time, timedelta
+from typing import Callable, Optional
+from sqlalchemy.orm import sessionmaker
+from app.settings import settings
+from app.helpers.cache.birthday_digest import (
+    BirthdayDigestCache,
+    birthday_digest_cache,
+)
+from app.helpers.cache.response_cache import ResponseCache, contacts_response_cache
+from app.repositories.contacts.crud import ContactsRepository
+from db.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+def warm_birthday_digests(
+    session_factory: sessionmaker,
+    contacts_repository: ContactsRepository,
+    cache: BirthdayDigestCache,
+    response_cache: ResponseCache,
+    day: date,
+) -> int:
+    """
+    Build the digest of ``day`` for every active user.
+
+    Only contact ids are selected, one indexed range scan per user, so the job
+    stays cheap however many contacts the users have. Each digest is stored
+    under the version of the user's contacts read before its query, so one
+    racing a write is never served.
+
+    Returns:
+        int: The number of digests written.
+    """
+    warmed = 0
+    with session_factory() as db:
+        for user_id in cache.active_users():
+            version = response_cache.version(user_id)
+            if version is None:
+                continue
+            cache.set(
+                user_id,
+                version,
+                day,
+                contacts_repository.get_upcoming_birthday_ids(db, user_id, day),
+            )
+            warmed += 1
+    return warmed
+
+
+class BirthdayDigestWarmer:
+    """
+    Rebuilds the birthday digests once a night, at ``warm_at`` local time.
+
+    Every worker runs the timer; the first one to claim the day in Redis does
+    the work, so the digests are built once whatever the number of workers.
+    """
+
+    def __init__(
+        self,
+        warm_at: time,
+        job: Callable[[date], int],
+        cache: BirthdayDigestCache,
+    ):
+        self.warm_at = warm_at
+        self.job = job
+        self.cache = cache
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def seconds_until_next_run(self, now: datetime) -> float:
+        run_at = datetime.combine(now.date(), self.warm_at)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        return (run_at - now).total_seconds()
+
+    def run_once(self, day: date) -> None:
+        if not self.cache.claim_warm_up(day):
+            return
+        try:
+            warmed = self.job(day)
+        except Exception:
+            logger.exception("Birthday digest warm-up failed")
+            return
+        logger.info("Warmed %s birthday digests for %s", warmed, day)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="birthday-digest-warmer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.seconds_until_next_run(datetime.now())):
+            self.run_once(date.today())
+
+
+birthday_digest_warmer = BirthdayDigestWarmer(
+    settings.BIRTHDAY_DIGEST_WARM_AT,
+    job=lambda day: warm_birthday_digests(
+        SessionLocal,
+        ContactsRepository(),
+        birthday_digest_cache,
+        contacts_response_cache,
+        day,
+    ),
+    cache=birthday_digest_cache,
+)
@@ -0,0 +1,34 @@
+from typing import List
+from app.helpers.api.contact_events import contact_events
+from app.helpers.cache.response_cache import contacts_response_cache
+from app.repositories.contacts.crud import ContactChange, ContactsRepository
+
+
+def apply_changes(
+    changes: List[ContactChange], contacts_repository: ContactsRepository
+) -> None:
+    """
+    Run what follows committed writes to contacts.
+
+    The user's cached responses and ETags go stale, open event streams are
+    told and a warm search index is updated. Each of these may wait on Redis,
+    so async callers run this in the threadpool.
+
+    Args:
+        changes (List[ContactChange]): Changes popped from the session.
+        contacts_repository (ContactsRepository): The repository that made
+            them, for its search backend and index.
+    """
+    for change in changes:
+        contacts_response_cache.bump(change.user_id)
+        contact_events.publish(change.user_id, change.event, change.contact_ids)
+        if contacts_repository.search_backend != "memory":
+            continue
+        index = contacts_repository.search_index
+        if change.event == "deleted":
+            for contact_id in change.contact_ids:
+                index.remove(change.user_id, contact_id)
+        elif change.contacts is None:
+            index.invalidate_user(change.user_id)
+        else:
+            index.upsert(change.user_id, change.contacts)
@@ -1,7 +1,16 @@
-from sqlalchemy.orm import Session
+import shutil
+import tempfile
+from sqlalchemy.orm import Session, sessionmaker
 from app.repositories.contacts.crud import ContactsRepository
+from app.services.contacts.changes import apply_changes
+from app.helpers.cache.birthday_digest import birthday_digest_cache
+from app.helpers.api.pagination import SyncPosition
+from app.services.contacts.export import stream_contacts
+from app.services.contacts.importer import import_jobs, run_import
+from app.settings import settings
 from fastapi import Depends
-from typing import List, Optional
+from datetime import date, datetime
+from typing import IO, Iterator, List, Optional
 from db.models.contact import Contact
 
 
@@ -13,6 +22,18 @@ class ContactService:
     def __init__(self, contacts_repository: ContactsRepository = Depends()):
         self.contacts_repository = contacts_repository
 
+    def get_contact_rows(
+        self,
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+    ) -> List[dict]:
+        return self.contacts_repository.get_contact_rows(
+            db, user_id, skip, limit, after_id
+        )
+
     def get_contact(self, db: Session, contact_id: int, user_id: int) -> Contact:
         return self.contacts_repository.get_contact(db, contact_id, user_id)
 
@@ -21,20 +42,96 @@ class ContactService:
     ) -> List[Contact]:
         return self.contacts_repository.get_contacts(db, user_id, skip, limit)
 
+    def get_contacts_after(
+        self, db: Session, user_id: int, after_id: Optional[int], limit: int = 10
+    ) -> List[Contact]:
+        return self.contacts_repository.get_contacts_after(db, user_id, after_id, limit)
+
+    def export_contacts(
+        self, session_factory: sessionmaker, user_id: int, export_format: str
+    ) -> Iterator[str]:
+        return stream_contacts(
+            session_factory,
+            self.contacts_repository,
+            user_id,
+            export_format,
+            settings.CONTACTS_EXPORT_BATCH_SIZE,
+        )
+
+    def stage_import(self, upload: IO[bytes], user_id: int) -> tuple[dict, str]:
+        """
+        Spool the upload to a temporary file and register the import job.
+
+        Returns:
+            tuple: The initial job report and the path of the spooled file.
+        """
+        with tempfile.NamedTemporaryFile(delete=False, prefix="import-") as spool:
+            shutil.copyfileobj(upload, spool, 1024 * 1024)
+        job_id = import_jobs.create(user_id)
+        job = {
+            "job_id": job_id,
+            "status": "pending",
+            **{counter: 0 for counter in import_jobs.COUNTERS},
+            "errors": [],
+        }
+        return job, spool.name
+
+    def import_contacts(
+        self,
+        session_factory: sessionmaker,
+        job_id: str,
+        path: str,
+        import_format: str,
+        user_id: int,
+    ) -> None:
+        run_import(
+            session_factory,
+            self.contacts_repository,
+            import_jobs,
+            job_id,
+            path,
+            import_format,
+            user_id,
+            settings.CONTACTS_IMPORT_CHUNK_SIZE,
+        )
+
+    def get_import_job(self, job_id: str, user_id: int) -> Optional[dict]:
+        return import_jobs.get(job_id, user_id)
+
     def create_contact(self, db: Session, contact_data: dict, user_id: int) -> Contact:
-        return self.contacts_repository.create_contact(db, contact_data, user_id)
+        contact = self.contacts_repository.create_contact(db, contact_data, user_id)
+        self._apply_changes(db)
+        return contact
+
+    def create_contacts_bulk(
+        self, db: Session, contacts_data: list, user_id: int
+    ) -> dict:
+        result = self.contacts_repository.create_contacts_bulk(
+            db, contacts_data, user_id
+        )
+        self._apply_changes(db)
+        return result
 
     def update_contact(
         self, db: Session, contact_id: int, contact_data: dict, user_id: int
     ) -> Optional[Contact]:
-        return self.contacts_repository.update_contact(
+        contact = self.contacts_repository.update_contact(
             db, contact_id, contact_data, user_id
         )
+        self._apply_changes(db)
+        return contact
 
     def delete_contact(
         self, db: Session, contact_id: int, user_id: int
     ) -> Optional[Contact]:
-        return self.contacts_repository.delete_contact(db, contact_id, user_id)
+        contact = self.contacts_repository.delete_contact(db, contact_id, user_id)
+        self._apply_changes(db)
+        return contact
+
+    def _apply_changes(self, db: Session) -> None:
+        apply_changes(
+            self.contacts_repository.pop_changes(db), self.contacts_repository
+        )
 
     def get_contact_by_name_lastname_email(
         self,
@@ -48,9 +145,50 @@ class ContactService:
             db, user_id, name, lastname, email
         )
 
+    def get_contacts_by_attribute(
+        self, db: Session, user_id: int, key: str, value: str
+    ) -> List[Contact]:
+        return self.contacts_repository.get_contacts_by_attribute(
+            db, user_id, key, value
+        )
+
+    def get_changes(
+        self,
+        db: Session,
+        user_id: int,
+        since: Optional[datetime],
+        limit: int,
+        position: Optional[SyncPosition] = None,
+    ) -> Optional[dict]:
+        return self.contacts_repository.get_changes(db, user_id, since, limit, position)
+
+    def search_contacts(
+        self, db: Session, user_id: int, term: str, limit: int
+    ) -> List[Contact]:
+        return self.contacts_repository.search_contacts(db, user_id, term, limit)
+
     def get_contacts_with_upcoming_birthdays(
-        self, db: Session, user_id: int
+        self, db: Session, user_id: int, version: Optional[int] = None
     ) -> List[Contact]:
-        return self.contacts_repository.get_contacts_with_upcoming_birthdays(
-            db, user_id
+        """
+        Contacts with a birthday in the upcoming window.
+
+        Given the version of the user's contacts, read before anything else,
+        the window is served from the user's daily birthday digest: on a hit
+        only the listed contacts are loaded, by primary key.
+        """
+        if version is None:
+            return self.contacts_repository.get_contacts_with_upcoming_birthdays(
+                db, user_id
+            )
+        today = date.today()
+        contact_ids = birthday_digest_cache.get(user_id, version, today)
+        if contact_ids is not None:
+            return self.contacts_repository.get_contacts_by_ids(
+                db, user_id, contact_ids
+            )
+        contacts = self.contacts_repository.get_contacts_with_upcoming_birthdays(
+            db, user_id, today=today
         )
+        birthday_digest_cache.set(user_id, version, today, [c.id for c in contacts])
+        return contacts
@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+from typing import Iterator, List
+from sqlalchemy.orm import sessionmaker
+from app.repositories.contacts.crud import ContactsRepository
+from app.routers.contacts.schemas import Contact as ContactSchema
+from db.models.contact import Contact
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+CSV_COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "birthday",
+    "emails",
+    "phones",
+    "additional_data",
+]
+
+
+def ndjson_chunk(contacts: List[Contact]) -> str:
+    return "".join(
+        ContactSchema.model_validate(contact).model_dump_json() + "\n"
+        for contact in contacts
+    )
+
+
+def csv_chunk(contacts: List[Contact]) -> str:
+    # Emails and phones are ';'-separated; additional_data keeps its key/value
+    # pairs as JSON so the file can be imported back without loss
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for contact in contacts:
+        writer.writerow(
+            [
+                contact.id,
+                contact.first_name,
+                contact.last_name,
+                contact.birthday.isoformat() if contact.birthday else "",
+                ";".join(email.email for email in contact.emails),
+                ";".join(phone.phone for phone in contact.phones),
+                json.dumps(
+                    [
+                        {"key": d.key, "value": d.value}
+                        for d in contact.additional_data_items
+                    ]
+                ),
+            ]
+        )
+    return buffer.getvalue()
+
+
+def stream_contacts(
+    session_factory: sessionmaker,
+    contacts_repository: ContactsRepository,
+    user_id: int,
+    export_format: str,
+    batch_size: int,
+) -> Iterator[str]:
+    """
+    Yield the user's contacts as NDJSON lines or CSV rows, one chunk per batch.
+
+    The generator owns its session: a streaming response is still being sent
+    after the request scoped session has been closed.
+    """
+    if export_format == "csv":
+        header = io.StringIO()
+        csv.writer(header).writerow(CSV_COLUMNS)
+        yield header.getvalue()
+        render = csv_chunk
+    else:
+        render = ndjson_chunk
+    with session_factory() as db:
+        for batch in contacts_repository.iter_contacts(db, user_id, batch_size):
+            yield render(batch)
@@ -0,0 +1,258 @@
+import csv
+import io
+import json
+import logging
+import os
+import uuid
+from typing import IO, Iterator, List, Optional
+import redis
+from pydantic import ValidationError
+from sqlalchemy.orm import sessionmaker
+from app.settings import settings
+from app.helpers.cache.redis_client import redis_client
+from app.repositories.contacts.crud import ContactsRepository
+from app.services.contacts.changes import apply_changes
+from app.routers.contacts.schemas import ContactCreate
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = {".csv": "csv", ".vcf": "vcard", ".vcard": "vcard"}
+
+# Only the first few row errors are kept for the job report
+MAX_REPORTED_ERRORS = 20
+
+
+class ImportJobStore:
+    """
+    Progress of contact imports, kept in Redis so any worker can report it.
+
+    Jobs are Redis hashes that expire IMPORT_JOB_TTL_SECONDS after their last
+    update. Redis errors are logged and never fail the import itself.
+    """
+
+    KEY_PREFIX = "import-job"
+    COUNTERS = ("rows_read", "created", "conflicts", "invalid")
+
+    def __init__(self, client: redis.Redis, ttl_seconds: int):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{job_id}"
+
+    def create(self, user_id: int) -> str:
+        job_id = uuid.uuid4().hex
+        self._write(
+            job_id,
+            {
+                "user_id": user_id,
+                "status": "pending",
+                **{counter: 0 for counter in self.COUNTERS},
+                "errors": "[]",
+            },
+        )
+        return job_id
+
+    def update(self, job_id: str, errors: Optional[List[str]] = None, **fields):
+        if errors is not None:
+            fields["errors"] = json.dumps(errors)
+        self._write(job_id, fields)
+
+    def get(self, job_id: str, user_id: int) -> Optional[dict]:
+        """
+        Return the job of the user, or None when unknown or owned by someone else.
+        """
+        data = self._read(job_id)
+        if not data or int(data["user_id"]) != user_id:
+            return None
+        return {
+            "job_id": job_id,
+            "status": data["status"],
+            **{counter: int(data[counter]) for counter in self.COUNTERS},
+            "errors": json.loads(data["errors"]),
+        }
+
+    def _write(self, job_id: str, mapping: dict) -> None:
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(self._key(job_id), mapping=mapping)
+            pipe.expire(self._key(job_id), self.ttl_seconds)
+            pipe.execute()
+        except redis.RedisError as err:
+            logger.warning("Import job %s not recorded: %s", job_id, err)
+
+    def _read(self, job_id: str) -> dict:
+        try:
+            raw = self.client.hgetall(self._key(job_id))
+        except redis.RedisError as err:
+            logger.warning("Import job %s not readable: %s", job_id, err)
+            return {}
+        return {key.decode(): value.decode() for key, value in raw.items()}
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    _, extension = os.path.splitext(filename or "")
+    return IMPORT_FORMATS.get(extension.lower())
+
+
+def _split(value: Optional[str]) -> List[str]:
+    return [part.strip() for part in (value or "").split(";") if part.strip()]
+
+
+def parse_csv(stream: IO[bytes]) -> Iterator[dict]:
+    """
+    Yield one raw contact per CSV row, in the layout written by the export.
+
+    Emails and phones are ';'-separated and additional_data is a JSON list of
+    key/value pairs; any other column is ignored.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    for row in csv.DictReader(text):
+        additional_data = row.get("additional_data") or "[]"
+        try:
+            additional_data = json.loads(additional_data)
+        except ValueError:
+            pass  # left as is so validation reports the row
+        yield {
+            "first_name": row.get("first_name"),
+            "last_name": row.get("last_name"),
+            "birthday": row.get("birthday") or None,
+            "emails": [{"email": email} for email in _split(row.get("emails"))],
+            "phones": [{"phone": phone} for phone in _split(row.get("phones"))],
+            "additional_data": additional_data,
+        }
+
+
+def _vcard_lines(stream: IO[bytes]) -> Iterator[str]:
+    # Unfold continuation lines (RFC 6350, 3.2) without reading ahead more
+    # than one line
+    current = None
+    for raw in io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace"):
+        line = raw.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current is not None:
+        yield current
+
+
+def _unescape(value: str) -> str:
+    return (
+        value.replace("\\n", "\n")
+        .replace("\\N", "\n")
+        .replace("\\,", ",")
+        .replace("\\;", ";")
+        .replace("\\\\", "\\")
+    )
+
+
+def _vcard_birthday(value: str) -> Optional[str]:
+    digits = value.replace("-", "")
+    if len(digits) == 8 and digits.isdigit():
+        return f"{digits[:4]}-{digits[4:6]}-{digits[6:]}"
+    return value or None
+
+
+def parse_vcard(stream: IO[bytes]) -> Iterator[dict]:
+    """
+    Yield one raw contact per vCard (N, FN, BDAY, EMAIL, TEL, NOTE and ORG).
+    """
+    card = None
+    for line in _vcard_lines(stream):
+        name, _, value = line.partition(":")
+        prop = name.split(";", 1)[0].split(".")[-1].upper()
+        if prop == "BEGIN" and value.upper() == "VCARD":
+            card = {
+                "first_name": None,
+                "last_name": None,
+                "birthday": None,
+                "emails": [],
+                "phones": [],
+                "additional_data": [],
+            }
+        elif card is None:
+            continue
+        elif prop == "END":
+            yield card
+            card = None
+        elif prop == "N":
+            parts = value.split(";")
+            card["last_name"] = _unescape(parts[0]) or None
+            card["first_name"] = _unescape(parts[1]) if len(parts) > 1 else None
+        elif prop == "FN" and card["first_name"] is None:
+            first, _, last = _unescape(value).partition(" ")
+            card["first_name"] = first
+            card["last_name"] = card["last_name"] or last or first
+        elif prop == "BDAY":
+            card["birthday"] = _vcard_birthday(value)
+        elif prop == "EMAIL":
+            card["emails"].append({"email": value.strip()})
+        elif prop == "TEL":
+            card["phones"].append({"phone": value.strip()})
+        elif prop in ("NOTE", "ORG"):
+            card["additional_data"].append(
+                {"key": prop.lower(), "value": _unescape(value)}
+            )
+
+
+PARSERS = {"csv": parse_csv, "vcard": parse_vcard}
+
+
+def run_import(
+    session_factory: sessionmaker,
+    contacts_repository: ContactsRepository,
+    jobs: ImportJobStore,
+    job_id: str,
+    path: str,
+    import_format: str,
+    user_id: int,
+    chunk_size: int,
+) -> None:
+    """
+    Import the uploaded file at ``path`` in chunks of ``chunk_size`` contacts.
+
+    Rows are parsed and validated one at a time; each full chunk is written
+    with one bulk insert and committed, then the job counters are updated. At
+    most one chunk is held in memory, whatever the size of the file. The file
+    is removed when the import ends.
+    """
+    progress = {counter: 0 for counter in ImportJobStore.COUNTERS}
+    errors: List[str] = []
+
+    def flush(db, chunk: List[ContactCreate]) -> None:
+        result = contacts_repository.create_contacts_bulk(db, chunk, user_id)
+        apply_changes(contacts_repository.pop_changes(db), contacts_repository)
+        progress["created"] += len(result["created"])
+        progress["conflicts"] += len(result["conflicts"])
+        jobs.update(job_id, status="running", errors=errors, **progress)
+
+    try:
+        with open(path, "rb") as stream, session_factory() as db:
+            jobs.update(job_id, status="running")
+            chunk: List[ContactCreate] = []
+            for row_number, raw in enumerate(PARSERS[import_format](stream), 1):
+                progress["rows_read"] += 1
+                try:
+                    chunk.append(ContactCreate.model_validate(raw))
+                except ValidationError as err:
+                    progress["invalid"] += 1
+                    if len(errors) < MAX_REPORTED_ERRORS:
+                        errors.append(f"Row {row_number}: {err.errors()[0]['msg']}")
+                    continue
+                if len(chunk) >= chunk_size:
+                    flush(db, chunk)
+                    chunk = []
+            if chunk:
+                flush(db, chunk)
+        jobs.update(job_id, status="done", errors=errors, **progress)
+    except Exception:
+        logger.exception("Import job %s failed", job_id)
+        jobs.update(job_id, status="failed", errors=errors, **progress)
+    finally:
+        os.remove(path)
+
+
+import_jobs = ImportJobStore(redis_client, settings.IMPORT_JOB_TTL_SECONDS)
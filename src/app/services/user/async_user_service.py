@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends
+from app.repositories.users.async_users import AsyncUsersRepository
+
+
+class AsyncUserService:
+    """
+    Service layer for user-related operations on the async database stack.
+    """
+
+    def __init__(self, users_repository: AsyncUsersRepository = Depends()):
+        self.users_repository = users_repository
+
+    async def get_user_by_username(self, db: AsyncSession, username: str):
+        return await self.users_repository.get_user_by_username(db, username)
+
+    async def get_user_by_email(self, db: AsyncSession, email: str):
+        return await self.users_repository.get_user_by_email(db, email)
+
+    async def get_user_by_id(self, db: AsyncSession, user_id: int):
+        return await self.users_repository.get_user_by_id(db, user_id)
+
+    async def create_user(
+        self, db: AsyncSession, username: str, hashed_password: str, email: str
+    ):
+        return await self.users_repository.create_user(
+            db, username, hashed_password, email
+        )
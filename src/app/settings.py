@@ -1,7 +1,8 @@
+from datetime import time
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import EmailStr
-from typing import ClassVar
+from typing import ClassVar, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -9,6 +10,74 @@ class Settings(BaseSettings):
     # Local DB configuration
     DATABASE_URL: str
 
+    # Serve the contacts API from AsyncEngine/AsyncSession instead of the threadpool
+    DB_ASYNC_MODE: bool = False
+    # Async driver URL; derived from DATABASE_URL when not set
+    DATABASE_ASYNC_URL: Optional[str] = None
+
+    # Connection pool configuration (applies to both sync and async engines)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Server-side statement timeout in milliseconds, 0 disables it (PostgreSQL only)
+    DB_STATEMENT_TIMEOUT_MS: int = 0
+
+    # Loader strategy for contact relationships (emails, phones, additional_data)
+    CONTACTS_LOAD_STRATEGY: Literal["selectin", "joined", "subquery"] = "selectin"
+
+    # Where new and updated contacts keep their key/value pairs: "rows" in the
+    # additional_data table, or "jsonb" in the indexed contacts.attributes column.
+    # Reads handle both, so contacts can be migrated while the API is running
+    CONTACTS_ADDITIONAL_DATA_STORAGE: Literal["rows", "jsonb"] = "rows"
+
+    # Render GET /api/contacts/ from a column projection encoded with orjson
+    # (when installed) instead of ORM objects serialized through Pydantic, and
+    # use the same encoder for every other JSON response
+    CONTACTS_FAST_JSON: bool = False
+
+    # Seconds a rendered contact list, detail or search response stays in Redis;
+    # any write to the user's contacts makes them stale at once. 0 disables it,
+    # ETags keep working
+    CONTACTS_RESPONSE_CACHE_TTL: int = 300
+
+    # GET /api/contacts/changes/ resends changes of the last
+    # CONTACTS_CHANGES_LAG_SECONDS, so rows stamped by transactions that were
+    # still committing during the previous sync are not missed
+    CONTACTS_CHANGES_LAG_SECONDS: int = 5
+    # Deletions are remembered this long; older sync tokens need a full resync
+    CONTACTS_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # GET /api/contacts/events/: events buffered per connection before the
+    # client is told to resync, and seconds between heartbeats when idle
+    CONTACTS_EVENTS_BUFFER_SIZE: int = 100
+    CONTACTS_EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Length of the window, in days after today, of GET /api/contacts/birthdays/
+    UPCOMING_BIRTHDAYS_DAYS: int = 7
+    # That window is cached per user and day; users who read it within the last
+    # BIRTHDAY_DIGEST_ACTIVE_DAYS get it rebuilt every night at the given time
+    BIRTHDAY_DIGEST_ACTIVE_DAYS: int = 7
+    BIRTHDAY_DIGEST_WARM_UP: bool = True
+    BIRTHDAY_DIGEST_WARM_AT: time = time(0, 5)
+
+    # "sql": free-text search runs in the database
+    # "memory": per-worker inverted index of the users who search, SQL until
+    # their index is built; the budget is the number of contacts indexed
+    CONTACTS_SEARCH_BACKEND: Literal["sql", "memory"] = "sql"
+    CONTACTS_SEARCH_INDEX_MAX_DOCUMENTS: int = 200000
+
+    # Contacts fetched per server-side cursor batch when exporting
+    CONTACTS_EXPORT_BATCH_SIZE: int = 1000
+
+    # Largest batch accepted by POST /api/contacts/bulk
+    CONTACTS_BULK_MAX_ITEMS: int = 1000
+
+    # Contacts written per commit by file imports, and how long job progress is kept
+    CONTACTS_IMPORT_CHUNK_SIZE: int = 500
+    IMPORT_JOB_TTL_SECONDS: int = 86400
+
     # Token configuration for JWT authentication
     SECRET_KEY: str
     ALGORITHM: str
@@ -19,6 +88,13 @@ class Settings(BaseSettings):
 
     OAUTH2_SCHEME: str = "/api/auth/login"
 
+    # bcrypt cost factor (log2 rounds); calibrate with app.services.auth.hash_calibration
+    PASSWORD_HASH_ROUNDS: int = 12
+
+    # Dedicated executor for bcrypt; calls beyond workers + queue get a 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+
     # Email configuration for sending emails
     MAIL_USERNAME: EmailStr
     MAIL_PASSWORD: str
@@ -45,6 +121,18 @@ class Settings(BaseSettings):
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_DB: int
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+
+    # "redis": one atomic sliding-window check per request against Redis
+    # "hybrid": per-worker counters reconciled with Redis every sync interval
+    RATE_LIMIT_MODE: Literal["redis", "hybrid"] = "redis"
+    RATE_LIMIT_SYNC_INTERVAL_SECONDS: float = 1.0
+
+    # Upper bound for caching the user behind an access token
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    # In-process tier in front of Redis, per worker
+    PRINCIPAL_CACHE_LOCAL_SIZE: int = 10000
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: int = 60
 
     class Config:
         env_file = str(Path(__file__).parent.parent / ".env")
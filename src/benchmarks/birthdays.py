@@ -0,0 +1,126 @@
+"""
+Compare the upcoming birthdays lookup before and after the birthday_md column.
+
+Seeds one throwaway user with ``--contacts`` contacts (1M by default), then
+times the former ``extract()`` filter against the range scan on the indexed
+``birthday_md`` column and prints the PostgreSQL plan of both. Run from
+``src`` against a migrated scratch database::
+
+    python -m benchmarks.birthdays --database-url postgresql://.../contacts_bench
+
+The user and its contacts are deleted when the benchmark ends.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+from sqlalchemy import create_engine, delete, extract, insert, select, text
+from sqlalchemy.orm import Session
+from db.models.contact import Contact
+from db.models.user import User
+
+
+def seed(db: Session, count: int, chunk_size: int) -> int:
+    name = f"bench-{uuid.uuid4().hex[:12]}"
+    user_id = db.execute(
+        insert(User)
+        .values(username=name, email=f"{name}@example.com", password="x")
+        .returning(User.id)
+    ).scalar_one()
+    first_day = date(1950, 1, 1)
+    for offset in range(0, count, chunk_size):
+        rows = [
+            {
+                "first_name": f"First{number}",
+                "last_name": f"Last{number}",
+                "birthday": first_day + timedelta(days=random.randrange(25000)),
+                "user_id": user_id,
+            }
+            for number in range(offset, min(offset + chunk_size, count))
+        ]
+        db.execute(insert(Contact), rows)
+        db.commit()
+    db.execute(text("ANALYZE contacts"))
+    db.commit()
+    return user_id
+
+
+def legacy_query(user_id: int, start: date, end: date):
+    # The filter get_contacts_with_upcoming_birthdays used to run
+    month, day = extract("month", Contact.birthday), extract("day", Contact.birthday)
+    query = select(Contact.id).where(Contact.user_id == user_id)
+    if start.month == end.month:
+        return query.where(month == start.month, day.between(start.day, end.day))
+    return query.where(
+        (month == start.month) & (day >= start.day)
+        | (month == end.month) & (day <= end.day)
+    )
+
+
+def indexed_query(user_id: int, start: date, end: date):
+    start_md = start.month * 100 + start.day
+    end_md = end.month * 100 + end.day
+    query = select(Contact.id).where(Contact.user_id == user_id)
+    if start_md <= end_md:
+        return query.where(Contact.birthday_md.between(start_md, end_md))
+    return query.where(
+        (Contact.birthday_md >= start_md) | (Contact.birthday_md <= end_md)
+    )
+
+
+def time_query(db: Session, query, repeat: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = db.execute(query).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--contacts", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=7, help="Window length")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    with Session(engine) as db:
+        print(f"seeding {args.contacts} contacts ...")
+        user_id = seed(db, args.contacts, args.chunk_size)
+        try:
+            # One window inside a month and one across the new year
+            windows = {
+                "same month": date(2025, 6, 10),
+                "dec -> jan": date(2025, 12, 28),
+            }
+            print(f"{'window':<12}{'query':<10}{'rows':>8}{'median ms':>12}")
+            for label, start in windows.items():
+                end = start + timedelta(days=args.days)
+                for name, build in (
+                    ("extract", legacy_query),
+                    ("indexed", indexed_query),
+                ):
+                    query = build(user_id, start, end)
+                    elapsed, rows = time_query(db, query, args.repeat)
+                    print(f"{label:<12}{name:<10}{rows:>8}{elapsed:>12.2f}")
+                    if engine.dialect.name == "postgresql":
+                        compiled = query.compile(
+                            engine, compile_kwargs={"literal_binds": True}
+                        )
+                        plan = db.execute(text(f"EXPLAIN {compiled}")).scalars()
+                        for line in plan:
+                            print(f"    {line}")
+        finally:
+            db.execute(delete(Contact).where(Contact.user_id == user_id))
+            db.execute(delete(User).where(User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
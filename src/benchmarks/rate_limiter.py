@@ -0,0 +1,108 @@
+"""
+Compare the "redis" and "hybrid" rate limiter modes.
+
+Simulates several workers, each with its own storage instance, hammering one
+key through a shared Redis, and reports how many requests each mode admitted
+against the configured limit and the per-check latency. Run from ``src``::
+
+    python -m benchmarks.rate_limiter --redis-url redis://localhost:6379/15
+
+Use a scratch Redis database: the benchmark writes under ``bench-ratelimit``.
+"""
+
+import argparse
+import statistics
+import threading
+import time
+import uuid
+import redis
+from app.helpers.api.rate_limiter import HybridRateLimitStorage, RedisRateLimitStorage
+
+
+def percentile(samples: list, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_mode(
+    storages: list, limit: int, window: int, requests: int, pause: float
+) -> dict:
+    key = f"bench:{uuid.uuid4().hex}"
+    admitted = [0] * len(storages)
+    timings = [[] for _ in storages]
+
+    def worker(index: int, storage) -> None:
+        for _ in range(requests):
+            start = time.perf_counter()
+            state = storage.hit(key, limit, window)
+            timings[index].append((time.perf_counter() - start) * 1e6)
+            admitted[index] += state.allowed
+            time.sleep(pause)
+
+    for storage in storages:
+        if hasattr(storage, "start"):
+            storage.start()
+    threads = [
+        threading.Thread(target=worker, args=(index, storage))
+        for index, storage in enumerate(storages)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for storage in storages:
+        if hasattr(storage, "stop"):
+            storage.stop()
+
+    samples = [sample for worker_timings in timings for sample in worker_timings]
+    return {
+        "admitted": sum(admitted),
+        "overshoot_pct": (sum(admitted) - limit) / limit * 100,
+        "p50_us": statistics.median(samples),
+        "p99_us": percentile(samples, 0.99),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379/15")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=5000, help="Per worker")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--window", type=int, default=60, help="Seconds")
+    parser.add_argument("--sync-interval", type=float, default=0.1)
+    parser.add_argument(
+        "--pause-ms", type=float, default=1.0, help="Think time between requests"
+    )
+    args = parser.parse_args(argv)
+
+    client = redis.Redis.from_url(args.redis_url)
+    modes = {
+        "redis": [
+            RedisRateLimitStorage(client, prefix="bench-ratelimit")
+            for _ in range(args.workers)
+        ],
+        "hybrid": [
+            HybridRateLimitStorage(
+                client, sync_interval=args.sync_interval, prefix="bench-ratelimit"
+            )
+            for _ in range(args.workers)
+        ],
+    }
+    print(
+        f"{args.workers} workers x {args.requests} requests, "
+        f"limit {args.limit}/{args.window}s"
+    )
+    print(f"{'mode':<8}{'admitted':>10}{'overshoot':>11}{'p50 us':>10}{'p99 us':>10}")
+    for mode, storages in modes.items():
+        result = run_mode(
+            storages, args.limit, args.window, args.requests, args.pause_ms / 1000
+        )
+        print(
+            f"{mode:<8}{result['admitted']:>10}{result['overshoot_pct']:>10.1f}%"
+            f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
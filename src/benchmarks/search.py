@@ -0,0 +1,157 @@
+"""
+Time free-text contact search on a large account, in SQL and in memory.
+
+Seeds one throwaway user with ``--contacts`` contacts (100k by default) and
+times ContactsRepository.search_contacts for prefix, substring, email and
+misspelled terms against the 20 ms autocomplete budget, once with the "sql"
+backend and once with a warm in-process index, printing the PostgreSQL plan
+of each SQL search. Run from ``src`` against a migrated scratch database::
+
+    python -m benchmarks.search --database-url postgresql://.../contacts_bench
+
+The user and its contacts are deleted when the benchmark ends.
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from sqlalchemy import create_engine, delete, insert, select, text
+from sqlalchemy.orm import Session, sessionmaker
+from app.helpers.cache.search_index import ContactSearchIndex
+from app.repositories.contacts.crud import ContactsRepository
+from db.models.contact import Contact, Email
+from db.models.user import User
+
+SYLLABLES = ["an", "ber", "cha", "do", "el", "fi", "gor", "ha", "jo", "ka", "li"]
+SYLLABLES += ["mar", "ne", "ol", "pe", "ra", "se", "ta", "vi", "wen", "za"]
+
+# term -> what it exercises
+TERMS = {
+    "jo": "short prefix",
+    "marne": "name prefix",
+    "rasel": "substring",
+    "@example": "email substring",
+    "jonh": "misspelling",
+}
+
+
+def make_name(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+
+
+def seed(db: Session, count: int, chunk_size: int) -> int:
+    rng = random.Random(42)
+    name = f"bench-{uuid.uuid4().hex[:12]}"
+    user_id = db.execute(
+        insert(User)
+        .values(username=name, email=f"{name}@example.com", password="x")
+        .returning(User.id)
+    ).scalar_one()
+    for offset in range(0, count, chunk_size):
+        rows = [
+            {
+                "first_name": make_name(rng),
+                "last_name": make_name(rng),
+                "user_id": user_id,
+            }
+            for _ in range(offset, min(offset + chunk_size, count))
+        ]
+        ids = db.scalars(insert(Contact).returning(Contact.id), rows).all()
+        db.execute(
+            insert(Email),
+            [
+                {"email": f"{name}.{contact_id}@example.com", "contact_id": contact_id}
+                for contact_id in ids
+            ],
+        )
+        db.commit()
+    db.execute(text("ANALYZE contacts"))
+    db.execute(text("ANALYZE emails"))
+    db.commit()
+    return user_id
+
+
+class LocalBus:
+    """
+    Stand-in for the invalidation bus: the benchmark runs a single worker.
+    """
+
+    def subscribe(self, topic, handler):
+        pass
+
+    def publish(self, topic, payload):
+        pass
+
+
+def time_search(db, repository, user_id, term, limit, repeat) -> tuple:
+    timings = []
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        rows = repository.search_contacts(db, user_id, term, limit)
+        timings.append((time.perf_counter() - start) * 1000)
+    p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+    return len(rows), statistics.median(timings), p95
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    sql = ContactsRepository()
+    sql.search_backend = "sql"
+    memory = ContactsRepository()
+    memory.search_backend = "memory"
+    memory.search_index = ContactSearchIndex(
+        args.contacts,
+        session_factory=sessionmaker(bind=engine),
+        bus=LocalBus(),
+        background=False,
+    )
+    with Session(engine) as db:
+        print(f"seeding {args.contacts} contacts ...")
+        user_id = seed(db, args.contacts, args.chunk_size)
+        try:
+            start = time.perf_counter()
+            memory.search_contacts(db, user_id, "warm up", args.limit)
+            print(f"index built in {time.perf_counter() - start:.1f} s")
+            print(
+                f"{'term':<10}{'case':<17}{'backend':<8}"
+                f"{'rows':>6}{'p50 ms':>9}{'p95 ms':>9}"
+            )
+            for term, label in TERMS.items():
+                for backend, repository in (("sql", sql), ("memory", memory)):
+                    rows, p50, p95 = time_search(
+                        db, repository, user_id, term, args.limit, args.repeat
+                    )
+                    print(
+                        f"{term:<10}{label:<17}{backend:<8}"
+                        f"{rows:>6}{p50:>9.2f}{p95:>9.2f}"
+                    )
+                if engine.dialect.name == "postgresql":
+                    where, rank = sql._search_criteria(term, "postgresql")
+                    query = (
+                        select(Contact.id)
+                        .where(Contact.user_id == user_id, where)
+                        .order_by(*rank, Contact.id)
+                        .limit(args.limit)
+                        .compile(engine, compile_kwargs={"literal_binds": True})
+                    )
+                    for line in db.execute(text(f"EXPLAIN {query}")).scalars():
+                        print(f"    {line}")
+        finally:
+            db.execute(delete(Contact).where(Contact.user_id == user_id))
+            db.execute(delete(User).where(User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Time loading and encoding a page of 1,000 contacts on each JSON path.
+
+Seeds one throwaway user with ``--contacts`` contacts (1,000 by default), each
+with two emails, a phone and two additional data pairs, and times one page of
+all of them three ways:
+
+* response_model: ORM objects validated and encoded the way FastAPI does for
+  ``response_model=List[schemas.Contact]``, then ``json.dumps``
+* pydantic: ORM objects encoded by ``schemas.ContactList.dump_json``, the
+  path of GET /api/contacts/ by default
+* projection: ``ContactsRepository.get_contact_rows`` encoded by
+  ``dump_json`` (orjson when installed), the CONTACTS_FAST_JSON path
+
+Times are per 1,000 contacts. Runs on an in-memory SQLite database unless a
+migrated scratch database is given; run from ``src``::
+
+    python -m benchmarks.serialization --database-url postgresql://.../contacts_bench
+
+The user and its contacts are deleted when the benchmark ends.
+"""
+
+import argparse
+import json
+import statistics
+import time
+import uuid
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import Session
+from app.helpers.api import responses
+from app.helpers.api.responses import dump_json
+from app.repositories.contacts.crud import ContactsRepository
+from app.routers.contacts import schemas
+from db.models.base import Base
+from db.models.contact import AdditionalData, Contact, Email, Phone
+from db.models.user import User
+
+
+def seed(db: Session, count: int) -> int:
+    name = f"bench-{uuid.uuid4().hex[:12]}"
+    user_id = db.execute(
+        insert(User)
+        .values(username=name, email=f"{name}@example.com", password="x")
+        .returning(User.id)
+    ).scalar_one()
+    ids = db.scalars(
+        insert(Contact).returning(Contact.id),
+        [
+            {"first_name": f"First{n}", "last_name": f"Last{n}", "user_id": user_id}
+            for n in range(count)
+        ],
+    ).all()
+    db.execute(
+        insert(Email),
+        [
+            {"email": f"{name}.{contact_id}.{n}@example.com", "contact_id": contact_id}
+            for contact_id in ids
+            for n in range(2)
+        ],
+    )
+    db.execute(
+        insert(Phone),
+        [
+            {"phone": f"{name}-{contact_id}", "contact_id": contact_id}
+            for contact_id in ids
+        ],
+    )
+    db.execute(
+        insert(AdditionalData),
+        [
+            {"key": key, "value": f"{key} {contact_id}", "contact_id": contact_id}
+            for contact_id in ids
+            for key in ("company", "note")
+        ],
+    )
+    db.commit()
+    return user_id
+
+
+def response_model_path(db, repository, user_id, count) -> tuple:
+    contacts = repository.get_contacts(db, user_id, limit=count)
+    loaded = time.perf_counter()
+    # What FastAPI does with response_model: validate, dump to JSON-able
+    # Python objects, then json.dumps in JSONResponse.render
+    validated = schemas.ContactList.validate_python(contacts, from_attributes=True)
+    content = schemas.ContactList.dump_python(validated, mode="json")
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    return loaded, body
+
+
+def pydantic_path(db, repository, user_id, count) -> tuple:
+    contacts = repository.get_contacts(db, user_id, limit=count)
+    loaded = time.perf_counter()
+    return loaded, schemas.ContactList.dump_json(contacts)
+
+
+def projection_path(db, repository, user_id, count) -> tuple:
+    rows = repository.get_contact_rows(db, user_id, limit=count)
+    loaded = time.perf_counter()
+    return loaded, dump_json(rows)
+
+
+PATHS = {
+    "response_model": response_model_path,
+    "pydantic": pydantic_path,
+    "projection": projection_path,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", default="sqlite://")
+    parser.add_argument("--contacts", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    engine = create_engine(args.database_url)
+    if engine.dialect.name == "sqlite":
+        Base.metadata.create_all(engine)
+    repository = ContactsRepository()
+    encoder = "orjson" if responses.orjson is not None else "json"
+    with Session(engine) as db:
+        user_id = seed(db, args.contacts)
+        try:
+            scale = 1_000 / args.contacts
+            print(f"{args.contacts} contacts, projection encoded with {encoder}")
+            print(
+                f"{'path':<16}{'load ms':>9}{'encode ms':>11}{'total ms':>10}"
+                f"{'bytes':>10}"
+            )
+            for name, path in PATHS.items():
+                loads, encodes = [], []
+                for _ in range(args.repeat):
+                    db.expunge_all()
+                    start = time.perf_counter()
+                    loaded, body = path(db, repository, user_id, args.contacts)
+                    end = time.perf_counter()
+                    loads.append((loaded - start) * 1000 * scale)
+                    encodes.append((end - loaded) * 1000 * scale)
+                load, encode = statistics.median(loads), statistics.median(encodes)
+                print(
+                    f"{name:<16}{load:>9.2f}{encode:>11.2f}{load + encode:>10.2f}"
+                    f"{len(body):>10}"
+                )
+        finally:
+            db.execute(delete(Contact).where(Contact.user_id == user_id))
+            db.execute(delete(User).where(User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
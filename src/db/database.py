@@ -1,11 +1,64 @@
 import os
+from typing import Optional
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from app.settings import settings
+from db.pool_metrics import PoolMetrics, timed_pool_class
 
-engine = create_engine(settings.DATABASE_URL)
+# Async drivers for the sync URLs we support
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+# Checkout wait times and timeouts, per engine
+pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+def engine_options(url: str, metrics: PoolMetrics, is_async: bool = False) -> dict:
+    """
+    Build create_engine keyword arguments from the DB_POOL_* settings.
+
+    SQLite keeps SQLAlchemy's default pool, which does not take sizing options.
+    """
+    if url.startswith("sqlite"):
+        return {}
+
+    options = {
+        "poolclass": timed_pool_class(
+            AsyncAdaptedQueuePool if is_async else QueuePool, metrics
+        ),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": timeout}
+            }
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+engine = create_engine(
+    settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, pool_metrics)
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is created on first use so the async driver is only
+# required when DB_ASYNC_MODE is enabled
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
 
 # metadata = MetaData()
 
@@ -16,3 +69,55 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_session_factory() -> sessionmaker:
+    """
+    Provide the session factory to endpoints whose work outlives the request
+    scoped session, such as streaming responses.
+    """
+    return SessionLocal
+
+
+def get_async_database_url() -> str:
+    """
+    Return the async driver URL, derived from DATABASE_URL when not configured.
+    """
+    if settings.DATABASE_ASYNC_URL:
+        return settings.DATABASE_ASYNC_URL
+    scheme, sep, rest = settings.DATABASE_URL.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global async_engine, AsyncSessionLocal
+    if AsyncSessionLocal is None:
+        url = get_async_database_url()
+        async_engine = create_async_engine(
+            url, **engine_options(url, async_pool_metrics, is_async=True)
+        )
+        # Objects stay usable after commit: lazy refreshes cannot run outside
+        # of the greenlet that owns the connection
+        AsyncSessionLocal = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+    return AsyncSessionLocal
+
+
+async def get_async_db():
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+def get_pool_stats() -> dict:
+    """
+    Return pool telemetry for the sync engine and, once created, the async one.
+    """
+    return {
+        "sync": pool_metrics.snapshot(engine.pool),
+        "async": (
+            async_pool_metrics.snapshot(async_engine.pool)
+            if async_engine is not None
+            else None
+        ),
+    }
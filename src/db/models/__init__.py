@@ -1,3 +1,9 @@
 from db.models.user import User
-from db.models.contact import Contact, Email, Phone, AdditionalData
+from db.models.contact import (
+    Contact,
+    ContactTombstone,
+    Email,
+    Phone,
+    AdditionalData,
+)
 from db.models.base import Base
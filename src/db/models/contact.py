@@ -1,8 +1,33 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Text
+from typing import NamedTuple, Optional
+from sqlalchemy import (
+    JSON,
+    Column,
+    Computed,
+    Integer,
+    SmallInteger,
+    String,
+    ForeignKey,
+    Date,
+    DateTime,
+    Text,
+    Index,
+    extract,
+    func,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from db.models.base import Base
 
 
+class Attribute(NamedTuple):
+    """
+    One key/value pair of Contact.attributes.
+    """
+
+    key: str
+    value: Optional[str]
+
+
 class Contact(Base):
     __tablename__ = "contacts"
 
@@ -10,9 +35,39 @@ class Contact(Base):
     first_name = Column(String, nullable=False)
     last_name = Column(String, nullable=False)
     birthday = Column(Date, nullable=True)
+    # month * 100 + day of the birthday, kept by the database so upcoming
+    # birthdays are an index range scan instead of extract() on every row
+    birthday_md = Column(
+        SmallInteger,
+        Computed(
+            extract("month", birthday) * 100 + extract("day", birthday),
+            persisted=True,
+        ),
+    )
+    # Lower-cased "first last", kept by the database for fuzzy search
+    search_text = Column(
+        String,
+        Computed(func.lower(first_name + " " + last_name), persisted=True),
+    )
+    # Key/value pairs as a JSON list of {"key", "value"} objects in the "jsonb"
+    # storage mode; None, stored as SQL NULL rather than a JSON null, while they
+    # are still additional_data rows
+    attributes = Column(
+        JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql"),
+        nullable=True,
+    )
     user_id = Column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )  # Foreign key to User table
+    # Database time of the last change to the contact or one of its children;
+    # the repository stamps it when only child rows changed
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
 
     emails = relationship(
         "Email", back_populates="contact", cascade="all, delete-orphan"
@@ -27,6 +82,69 @@ class Contact(Base):
     # Relationship with User
     user = relationship("User", back_populates="contacts")
 
+    @property
+    def additional_data_items(self) -> list:
+        """
+        The key/value pairs of the contact, whichever way they are stored.
+        """
+        if self.attributes is not None:
+            return [
+                Attribute(item["key"], item.get("value")) for item in self.attributes
+            ]
+        return list(self.additional_data)
+
+    __table_args__ = (
+        # Backs keyset pagination ordered by (user_id, id)
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        # Backs GET /api/contacts/changes/
+        Index("ix_contacts_user_id_updated_at", "user_id", "updated_at"),
+        # Backs the upcoming birthdays range scan
+        Index("ix_contacts_user_id_birthday_md", "user_id", "birthday_md"),
+        # Back the case-insensitive name search within one user's contacts
+        Index(
+            "ix_contacts_user_id_first_name_lower", "user_id", func.lower(first_name)
+        ),
+        Index("ix_contacts_user_id_last_name_lower", "user_id", func.lower(last_name)),
+        # Trigram index for substring and typo-tolerant search (PostgreSQL only,
+        # needs the pg_trgm and btree_gin extensions)
+        Index(
+            "ix_contacts_user_id_search_text_trgm",
+            "user_id",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Containment lookups on the key/value pairs (PostgreSQL only)
+        Index(
+            "ix_contacts_attributes",
+            "attributes",
+            postgresql_using="gin",
+            postgresql_ops={"attributes": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+class ContactTombstone(Base):
+    """
+    Marks a deleted contact so clients syncing changes learn about it.
+    """
+
+    __tablename__ = "contact_tombstones"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # No foreign key: the contact row is gone
+    contact_id = Column(Integer, nullable=False)
+    deleted_at = Column(
+        DateTime, nullable=False, default=func.now(), server_default=func.now()
+    )
+
+    __table_args__ = (
+        Index("ix_contact_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
 
 class Email(Base):
     __tablename__ = "emails"
@@ -40,6 +158,17 @@ class Email(Base):
 
     contact = relationship("Contact", back_populates="emails")
 
+    __table_args__ = (
+        Index("ix_emails_email_lower", func.lower(email)),
+        # Substring search on emails (PostgreSQL only, needs pg_trgm)
+        Index(
+            "ix_emails_email_lower_trgm",
+            func.lower(email).label("email_lower"),
+            postgresql_using="gin",
+            postgresql_ops={"email_lower": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
 
 class Phone(Base):
     __tablename__ = "phones"
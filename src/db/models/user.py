@@ -1,6 +1,15 @@
 from db.models.base import Base
 from sqlalchemy.orm import relationship
-from sqlalchemy import Column, DateTime, Integer, String, Boolean, func, Enum as SqlEnum
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    String,
+    Boolean,
+    Index,
+    func,
+    Enum as SqlEnum,
+)
 from enum import Enum
 
 
@@ -27,3 +36,9 @@ class User(Base):
     contacts = relationship(
         "Contact", back_populates="user", cascade="all, delete-orphan"
     )
+
+    __table_args__ = (
+        # Back the case-insensitive lookups of the auth path
+        Index("ix_users_username_lower", func.lower(username)),
+        Index("ix_users_email_lower", func.lower(email)),
+    )
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Optional
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    Thread-safe counters and a wait-time histogram for a connection pool.
+    """
+
+    # Upper bounds of the wait-time histogram buckets, in milliseconds
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.wait_buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+            self.wait_count = 0
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.timeouts = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        wait_ms = seconds * 1000
+        with self._lock:
+            for index, bound in enumerate(self.WAIT_BUCKETS_MS):
+                if wait_ms <= bound:
+                    self.wait_buckets[index] += 1
+                    break
+            else:
+                self.wait_buckets[-1] += 1
+            self.wait_count += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self, pool: Optional[Pool] = None) -> dict:
+        """
+        Return the current counters, plus the live pool state when given.
+        """
+        with self._lock:
+            buckets = {
+                f"le_{bound}ms": count
+                for bound, count in zip(self.WAIT_BUCKETS_MS, self.wait_buckets)
+            }
+            buckets["le_inf"] = self.wait_buckets[-1]
+            data = {
+                "wait_time_histogram": buckets,
+                "wait_count": self.wait_count,
+                "wait_avg_ms": (
+                    self.wait_sum_ms / self.wait_count if self.wait_count else 0.0
+                ),
+                "wait_max_ms": self.wait_max_ms,
+                "timeouts": self.timeouts,
+            }
+        if pool is not None:
+            data["pool"] = pool.status()
+            for name in ("size", "checkedout", "checkedin", "overflow"):
+                if hasattr(pool, name):
+                    data[name] = getattr(pool, name)()
+        return data
+
+
+class TimedPoolMixin:
+    """
+    Records how long each checkout waits for a connection.
+
+    Must precede the pool class in the bases. ``metrics`` is set on the class
+    by timed_pool_class so it survives Pool.recreate(), which instantiates
+    ``self.__class__`` again.
+    """
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        finally:
+            self.metrics.observe_wait(time.perf_counter() - start)
+
+
+def timed_pool_class(pool_class: type, metrics: PoolMetrics) -> type:
+    """
+    Build a subclass of pool_class that reports checkout waits to metrics.
+    """
+    return type(
+        f"Timed{pool_class.__name__}",
+        (TimedPoolMixin, pool_class),
+        {"metrics": metrics},
+    )
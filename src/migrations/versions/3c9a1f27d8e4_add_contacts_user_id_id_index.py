@@ -0,0 +1,45 @@
+"""Add composite (user_id, id) index on contacts for keyset pagination
+
+Revision ID: 3c9a1f27d8e4
+Revises: ff0ef6b3ae2b
+Create Date: 2025-05-03 10:14:21.540118
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3c9a1f27d8e4"
+down_revision: Union[str, None] = "ff0ef6b3ae2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so contact writes are not blocked while the index is
+    # created; that cannot happen inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_id",
+            "contacts",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_id",
+            table_name="contacts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
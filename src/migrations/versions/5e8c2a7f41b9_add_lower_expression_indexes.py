@@ -0,0 +1,63 @@
+"""Add lower() expression indexes for case-insensitive lookups
+
+Revision ID: 5e8c2a7f41b9
+Revises: 7b2e4d91c3a5
+Create Date: 2026-10-18 15:21:09.604117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8c2a7f41b9"
+down_revision: Union[str, None] = "7b2e4d91c3a5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name, table, indexed expressions
+INDEXES = [
+    ("ix_users_username_lower", "users", ["lower(username)"]),
+    ("ix_users_email_lower", "users", ["lower(email)"]),
+    (
+        "ix_contacts_user_id_first_name_lower",
+        "contacts",
+        ["user_id", "lower(first_name)"],
+    ),
+    (
+        "ix_contacts_user_id_last_name_lower",
+        "contacts",
+        ["user_id", "lower(last_name)"],
+    ),
+    ("ix_emails_email_lower", "emails", ["lower(email)"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so logins and contact writes are not blocked while
+    # the indexes are created; that cannot happen inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, expressions in INDEXES:
+            op.create_index(
+                name,
+                table,
+                [sa.text(expression) for expression in expressions],
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,60 @@
+"""Add generated birthday_md column and (user_id, birthday_md) index on contacts
+
+Revision ID: 7b2e4d91c3a5
+Revises: 3c9a1f27d8e4
+Create Date: 2026-10-18 12:05:43.218764
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7b2e4d91c3a5"
+down_revision: Union[str, None] = "3c9a1f27d8e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once; the database
+    # keeps it in sync with birthday from then on
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "birthday_md",
+            sa.SmallInteger(),
+            sa.Computed(
+                "EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday)",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    # Built without blocking writes to contacts; CONCURRENTLY cannot run in a
+    # transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_birthday_md",
+            "contacts",
+            ["user_id", "birthday_md"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_birthday_md",
+            table_name="contacts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("contacts", "birthday_md")
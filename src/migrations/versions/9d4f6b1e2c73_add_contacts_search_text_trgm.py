@@ -0,0 +1,72 @@
+"""Add generated search_text column and trigram indexes for contact search
+
+Revision ID: 9d4f6b1e2c73
+Revises: 5e8c2a7f41b9
+Create Date: 2026-10-18 18:31:52.740215
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "9d4f6b1e2c73"
+down_revision: Union[str, None] = "5e8c2a7f41b9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm provides the trigram operator classes; btree_gin lets user_id
+    # share the GIN index so a search only touches one user's entries
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "search_text",
+            sa.String(),
+            sa.Computed("lower(first_name || ' ' || last_name)", persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_search_text_trgm",
+            "contacts",
+            ["user_id", sa.text("search_text gin_trgm_ops")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_emails_email_lower_trgm",
+            "emails",
+            [sa.text("lower(email) gin_trgm_ops")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_emails_email_lower_trgm",
+            table_name="emails",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_contacts_user_id_search_text_trgm",
+            table_name="contacts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("contacts", "search_text")
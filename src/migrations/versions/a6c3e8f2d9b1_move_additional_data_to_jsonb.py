@@ -0,0 +1,108 @@
+"""Move contacts' additional data to an indexed JSONB attributes column
+
+Run this first, then deploy with CONTACTS_ADDITIONAL_DATA_STORAGE=jsonb: that
+mode writes to the attributes column this migration adds. Contacts written in
+"rows" mode in the meantime keep their additional_data rows, which reads still
+handle, and move to the column on their next update.
+
+Revision ID: a6c3e8f2d9b1
+Revises: 9d4f6b1e2c73
+Create Date: 2026-10-18 21:04:37.118520
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a6c3e8f2d9b1"
+down_revision: Union[str, None] = "9d4f6b1e2c73"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Contacts converted per transaction, small enough to keep row locks short
+BATCH_SIZE = 1000
+
+# Each batch is one statement: the rows it deletes are the rows it converts
+UPGRADE_BATCH = sa.text("""
+    WITH batch AS (
+        SELECT DISTINCT contact_id FROM additional_data
+        ORDER BY contact_id LIMIT :batch_size
+    ), moved AS (
+        DELETE FROM additional_data
+        WHERE contact_id IN (SELECT contact_id FROM batch)
+        RETURNING id, contact_id, key, value
+    ), pairs AS (
+        SELECT contact_id,
+               jsonb_agg(jsonb_build_object('key', key, 'value', value) ORDER BY id)
+                   AS attributes
+        FROM moved GROUP BY contact_id
+    )
+    UPDATE contacts SET attributes = pairs.attributes
+    FROM pairs WHERE contacts.id = pairs.contact_id
+    -- An array was written in "jsonb" mode after the rows, which are stale
+    AND (contacts.attributes IS NULL OR jsonb_typeof(contacts.attributes) <> 'array')
+    """)
+
+DOWNGRADE_BATCH = sa.text("""
+    WITH batch AS (
+        SELECT id, attributes FROM contacts
+        WHERE jsonb_typeof(attributes) = 'array'
+        ORDER BY id LIMIT :batch_size FOR UPDATE
+    ), cleared AS (
+        UPDATE contacts SET attributes = NULL
+        FROM batch WHERE contacts.id = batch.id
+        RETURNING batch.id, batch.attributes
+    )
+    INSERT INTO additional_data (contact_id, key, value)
+    SELECT cleared.id, item.value ->> 'key', item.value ->> 'value'
+    FROM cleared, jsonb_array_elements(cleared.attributes) WITH ORDINALITY AS item
+    ORDER BY cleared.id, item.ordinality
+    """)
+
+
+def _run_batches(statement: sa.TextClause, remaining: str) -> None:
+    # Outside the migration transaction every batch commits on its own, so a
+    # large table is converted without holding its locks until the end
+    bind = op.get_bind()
+    with op.get_context().autocommit_block():
+        while bind.execute(sa.text(remaining)).first() is not None:
+            bind.execute(statement, {"batch_size": BATCH_SIZE})
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "contacts",
+        sa.Column("attributes", postgresql.JSONB(), nullable=True),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_attributes",
+            "contacts",
+            [sa.text("attributes jsonb_path_ops")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+    _run_batches(UPGRADE_BATCH, "SELECT 1 FROM additional_data LIMIT 1")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _run_batches(
+        DOWNGRADE_BATCH,
+        "SELECT 1 FROM contacts WHERE jsonb_typeof(attributes) = 'array' LIMIT 1",
+    )
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_attributes",
+            table_name="contacts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_column("contacts", "attributes")
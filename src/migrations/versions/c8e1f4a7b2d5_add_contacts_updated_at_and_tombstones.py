@@ -0,0 +1,78 @@
+"""Add contacts.updated_at and contact tombstones for delta sync
+
+Revision ID: c8e1f4a7b2d5
+Revises: a6c3e8f2d9b1
+Create Date: 2026-10-18 22:16:03.452918
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "c8e1f4a7b2d5"
+down_revision: Union[str, None] = "a6c3e8f2d9b1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is stable, so PostgreSQL stores the default once instead of
+    # rewriting the table; existing contacts all get the migration time
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.create_table(
+        "contact_tombstones",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("contact_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_contact_tombstones_user_id_deleted_at",
+        "contact_tombstones",
+        ["user_id", "deleted_at"],
+        unique=False,
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_updated_at",
+            "contacts",
+            ["user_id", "updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_updated_at",
+            table_name="contacts",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_index(
+        "ix_contact_tombstones_user_id_deleted_at", table_name="contact_tombstones"
+    )
+    op.drop_table("contact_tombstones")
+    op.drop_column("contacts", "updated_at")
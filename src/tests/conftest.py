@@ -1,15 +1,16 @@
+from contextlib import contextmanager
 from unittest.mock import MagicMock, patch
 import logging
 import os
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
 from db.models import Base, User
-from db.database import get_db
+from db.database import get_db, get_session_factory
 from app.services.auth.jwt_manager import Hash, JWTManager
 from app.settings import settings
 from jose import jwt
@@ -101,6 +102,7 @@ def client():
             db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestingSessionLocal
 
     # Override the exact callable used in the route
     app.dependency_overrides[jwt_manager.get_current_admin_user] = get_mock_admin_user
@@ -125,3 +127,43 @@ def get_token():
     token = JWTManager().create_access_token(data={"sub": test_user["username"]})
     logger.debug("Fake token generated: %s", token)
     return token
+
+
+@pytest.fixture
+def record_statements():
+    """
+    Context manager recording the (statement, parameters) pairs a session runs.
+    """
+
+    @contextmanager
+    def record(db):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, *_):
+            statements.append((statement, parameters))
+
+        bind = db.get_bind()
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+    return record
+
+
+@pytest.fixture
+def query_plan():
+    """
+    Return the SQLite query plan of a recorded statement as one line.
+    """
+
+    def explain(db, statement, parameters):
+        return " ".join(
+            row[-1]
+            for row in db.connection().exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+        )
+
+    return explain
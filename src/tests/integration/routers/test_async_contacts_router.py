@@ -0,0 +1,67 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.routers.contacts import contacts, async_contacts
+from app.dependencies.auth import jwt_manager
+from db.database import get_async_db
+from conftest import get_mock_admin_user
+
+# Same file-based SQLite database as the sync integration tests
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+AsyncTestingSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
+@pytest.fixture(scope="module")
+def async_client():
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+
+    async_app = FastAPI()
+    async_app.include_router(async_contacts.router)
+    async_app.dependency_overrides[get_async_db] = override_get_async_db
+    async_app.dependency_overrides[jwt_manager.get_current_user_async] = (
+        get_mock_admin_user
+    )
+
+    yield TestClient(async_app)
+
+
+def test_async_create_and_read_contact(async_client):
+    contact_data = {
+        "first_name": "Async",
+        "last_name": "Contact",
+        "birthday": "1990-01-01",
+        "emails": [{"email": "async.contact@example.com"}],
+    }
+
+    create_response = async_client.post("/api/contacts/", json=contact_data)
+    assert create_response.status_code == 201, create_response.text
+    contact_id = create_response.json()["id"]
+
+    response = async_client.get(f"/api/contacts/{contact_id}")
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert data["first_name"] == contact_data["first_name"]
+    assert data["emails"][0]["email"] == "async.contact@example.com"
+
+
+def test_async_read_contacts(async_client):
+    response = async_client.get("/api/contacts/", params={"limit": 1})
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()) == 1
+    assert "X-Next-Cursor" in response.headers
+
+
+def test_async_router_serves_every_contacts_route():
+    def endpoints(router):
+        return {(route.path, frozenset(route.methods)) for route in router.routes}
+
+    assert endpoints(contacts.router) <= endpoints(async_contacts.router)
@@ -1,5 +1,17 @@
+import csv
+import io
+import json
+from datetime import datetime
 from unittest.mock import patch
 from conftest import test_user
+import pytest
+from app.repositories.contacts.crud import ContactsRepository
+from app.helpers.api.pagination import decode_sync_token, encode_sync_token
+from app.helpers.cache.response_cache import (
+    VERSION_SCRIPT,
+    ResponseCache,
+    contacts_response_cache,
+)
 
 
 def test_create_contact(client, get_token):
@@ -118,3 +130,383 @@ def test_delete_contact(client, get_token):
     assert data["id"] == contact_id
     assert data["first_name"] == contact_data["first_name"]
     assert data["last_name"] == contact_data["last_name"]
+
+
+def test_read_contacts_with_cursor(client, get_token):
+    token = get_token
+    headers = {"Authorization": f"Bearer {token}"}
+
+    for i in range(3):
+        contact_data = {
+            "first_name": f"Cursor{i}",
+            "last_name": "Paged",
+            "birthday": "1991-02-02",
+        }
+        create_response = client.post(
+            "/api/contacts/", headers=headers, json=contact_data
+        )
+        assert create_response.status_code == 201, create_response.text
+
+    # Walk the whole address book two contacts at a time
+    seen = []
+    response = client.get("/api/contacts/", headers=headers, params={"limit": 2})
+    while True:
+        assert response.status_code == 200, response.text
+        seen.extend(contact["id"] for contact in response.json())
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if next_cursor is None:
+            break
+        response = client.get(
+            "/api/contacts/",
+            headers=headers,
+            params={"limit": 2, "cursor": next_cursor},
+        )
+
+    assert seen == sorted(set(seen))
+    assert len(seen) >= 3
+
+
+def test_read_contacts_invalid_cursor(client, get_token):
+    token = get_token
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = client.get(
+        "/api/contacts/", headers=headers, params={"cursor": "not-a-cursor"}
+    )
+
+    assert response.status_code == 400, response.text
+
+
+def test_create_contacts_bulk(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    batch = [
+        {
+            "first_name": "Bulk",
+            "last_name": "One",
+            "birthday": None,
+            "emails": [{"email": "bulk.one@example.com"}],
+        },
+        {
+            "first_name": "Bulk",
+            "last_name": "Two",
+            "birthday": None,
+            "emails": [{"email": "bulk.one@example.com"}],
+        },
+    ]
+
+    response = client.post("/api/contacts/bulk", headers=headers, json=batch)
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert [item["index"] for item in data["created"]] == [0]
+    assert data["conflicts"] == [
+        {
+            "index": 1,
+            "field": "email",
+            "value": "bulk.one@example.com",
+            "detail": "Email already exists",
+        }
+    ]
+
+
+def test_create_contacts_bulk_too_large(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    batch = [{"first_name": "A", "last_name": "B", "birthday": None}] * 3
+
+    with patch("app.routers.contacts.contacts.settings.CONTACTS_BULK_MAX_ITEMS", 2):
+        response = client.post("/api/contacts/bulk", headers=headers, json=batch)
+
+    assert response.status_code == 422, response.text
+
+
+def test_export_contacts_ndjson(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.get("/api/contacts/export/", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines
+    assert {"id", "first_name", "emails", "phones", "additional_data"} <= set(lines[0])
+    assert [line["id"] for line in lines] == sorted(line["id"] for line in lines)
+
+
+def test_export_contacts_csv(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.get(
+        "/api/contacts/export/", headers=headers, params={"format": "csv"}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows
+    assert "bulk.one@example.com" in {row["emails"] for row in rows}
+
+
+def test_import_contacts(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    upload = (
+        "first_name,last_name,birthday,emails,phones,additional_data\n"
+        "Imported,One,1991-01-01,imported.one@example.com,,\n"
+    )
+    jobs = {}
+
+    def write(job_id, mapping):
+        jobs.setdefault(job_id, {}).update({k: str(v) for k, v in mapping.items()})
+
+    with (
+        patch(
+            "app.services.contacts.importer.ImportJobStore._write", side_effect=write
+        ),
+        patch(
+            "app.services.contacts.importer.ImportJobStore._read",
+            side_effect=lambda job_id: jobs.get(job_id, {}),
+        ),
+    ):
+        response = client.post(
+            "/api/contacts/import/",
+            headers=headers,
+            files={"file": ("contacts.csv", upload.encode(), "text/csv")},
+        )
+        assert response.status_code == 202, response.text
+        job_id = response.json()["job_id"]
+
+        # TestClient runs the background import before returning
+        progress = client.get(f"/api/contacts/import/{job_id}", headers=headers)
+
+    assert progress.status_code == 200, progress.text
+    assert progress.json()["status"] == "done"
+    assert progress.json()["created"] == 1
+
+
+def test_import_contacts_unsupported_file(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.post(
+        "/api/contacts/import/",
+        headers=headers,
+        files={"file": ("contacts.txt", b"hello", "text/plain")},
+    )
+
+    assert response.status_code == 422, response.text
+
+
+def test_search_contacts_free_text(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for first_name, last_name in [("Zelda", "Quixote"), ("Hilde", "Zelder")]:
+        client.post(
+            "/api/contacts/",
+            headers=headers,
+            json={"first_name": first_name, "last_name": last_name, "birthday": None},
+        )
+
+    response = client.get("/api/contacts/search/?q=zeld&limit=5", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert [c["first_name"] for c in response.json()] == ["Zelda", "Hilde"]
+
+
+def test_search_contacts_free_text_validation(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    response = client.get("/api/contacts/search/?q=", headers=headers)
+
+    assert response.status_code == 422, response.text
+
+
+def test_search_contacts_by_attribute(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.post(
+        "/api/contacts/",
+        headers=headers,
+        json={
+            "first_name": "Tagged",
+            "last_name": "Contact",
+            "birthday": None,
+            "additional_data": [{"key": "team", "value": "a=b"}],
+        },
+    )
+
+    response = client.get("/api/contacts/search/?attribute=team=a%3Db", headers=headers)
+    invalid = client.get("/api/contacts/search/?attribute=team", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert [c["first_name"] for c in response.json()] == ["Tagged"]
+    assert invalid.status_code == 422, invalid.text
+
+
+class DictRedis:
+    """Just enough of a Redis client for the response cache."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def register_script(self, script):
+        return self._version if script == VERSION_SCRIPT else self._bump
+
+    def _version(self, keys):
+        return self.data.setdefault(keys[0], 1000)
+
+    def _bump(self, keys):
+        if keys[0] in self.data:
+            self.data[keys[0]] += 1
+
+
+@pytest.fixture
+def response_cache():
+    """Serve the contacts response cache from a dict for one test."""
+    state = vars(ResponseCache(DictRedis(), ttl=300))
+    with patch.dict(vars(contacts_response_cache), state):
+        yield contacts_response_cache
+
+
+def test_contact_reads_are_cached_until_a_write(client, get_token, response_cache):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    created = client.post(
+        "/api/contacts/",
+        headers=headers,
+        json={"first_name": "Cached", "last_name": "Read", "birthday": None},
+    ).json()
+
+    with patch.object(
+        ContactsRepository,
+        "get_contact",
+        autospec=True,
+        side_effect=ContactsRepository.get_contact,
+    ) as get_contact:
+        url = f"/api/contacts/{created['id']}"
+        first = client.get(url, headers=headers)
+        second = client.get(url, headers=headers)
+        assert get_contact.call_count == 1
+        assert second.json() == first.json()
+
+        client.put(url, headers=headers, json={"last_name": "Changed"})
+        third = client.get(url, headers=headers)
+
+    assert third.json()["last_name"] == "Changed"
+
+
+def test_conditional_get_answers_304_until_a_write(client, get_token, response_cache):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    created = client.post(
+        "/api/contacts/",
+        headers=headers,
+        json={"first_name": "Tag", "last_name": "Ged", "birthday": "1990-01-01"},
+    ).json()
+    urls = [
+        "/api/contacts/",
+        f"/api/contacts/{created['id']}",
+        "/api/contacts/birthdays/",
+    ]
+
+    etags = {}
+    for url in urls:
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200, response.text
+        etags[url] = response.headers["ETag"]
+        assert etags[url].startswith('W/"')
+
+        conditional = {**headers, "If-None-Match": etags[url]}
+        unchanged = client.get(url, headers=conditional)
+        assert unchanged.status_code == 304
+        assert unchanged.content == b""
+        assert unchanged.headers["ETag"] == etags[url]
+
+    client.put(
+        f"/api/contacts/{created['id']}", headers=headers, json={"last_name": "New"}
+    )
+    for url in urls:
+        conditional = {**headers, "If-None-Match": etags[url]}
+        assert client.get(url, headers=conditional).status_code == 200
+
+
+def test_etag_is_exposed_to_cross_origin_clients(client, get_token):
+    headers = {
+        "Authorization": f"Bearer {get_token}",
+        "Origin": "http://localhost:3000",
+    }
+
+    response = client.get("/api/contacts/", headers=headers)
+
+    assert response.status_code == 200, response.text
+    exposed = response.headers["Access-Control-Expose-Headers"].split(",")
+    assert "ETag" in [header.strip() for header in exposed]
+
+
+def test_contact_changes_since_token(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    created = client.post(
+        "/api/contacts/",
+        headers=headers,
+        json={"first_name": "Delta", "last_name": "Sync", "birthday": None},
+    ).json()
+
+    full = client.get("/api/contacts/changes/", headers=headers)
+    assert full.status_code == 200, full.text
+    assert created["id"] in [c["id"] for c in full.json()["changed"]]
+
+    client.delete(f"/api/contacts/{created['id']}", headers=headers)
+    token = full.json()["next_token"]
+    delta = client.get(f"/api/contacts/changes/?since={token}", headers=headers)
+
+    assert delta.status_code == 200, delta.text
+    assert created["id"] in delta.json()["deleted"]
+    invalid = client.get("/api/contacts/changes/?since=nope", headers=headers)
+    assert invalid.status_code == 400
+    naive = encode_sync_token(datetime(2026, 1, 1))
+    invalid = client.get(f"/api/contacts/changes/?since={naive}", headers=headers)
+    assert invalid.status_code == 400
+
+
+def test_contact_changes_are_paged(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    for n in range(2):
+        client.post(
+            "/api/contacts/",
+            headers=headers,
+            json={"first_name": f"Paged{n}", "last_name": "Sync", "birthday": None},
+        )
+
+    first = client.get("/api/contacts/changes/?limit=1", headers=headers)
+    assert first.status_code == 200, first.text
+    assert len(first.json()["changed"]) == 1
+    assert first.json()["more"] is True
+
+    since, position = decode_sync_token(first.json()["next_token"])
+    assert since is None
+    assert position.contact_id == first.json()["changed"][0]["id"]
+    too_small = client.get("/api/contacts/changes/?limit=0", headers=headers)
+    assert too_small.status_code == 422
+
+
+def test_read_contacts_fast_json_matches_the_default(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    client.post(
+        "/api/contacts/",
+        headers=headers,
+        json={
+            "first_name": "Fast",
+            "last_name": "Json",
+            "birthday": "1991-02-03",
+            "emails": [{"email": "fast.json@example.com"}],
+            "additional_data": [{"key": "k", "value": "v"}],
+        },
+    )
+    url = "/api/contacts/?limit=2"
+
+    default = client.get(url, headers=headers)
+    with patch("app.routers.contacts.contacts.settings.CONTACTS_FAST_JSON", True):
+        fast = client.get(url, headers=headers)
+
+    assert fast.status_code == 200, fast.text
+    assert fast.json() == default.json()
+    assert fast.headers["X-Next-Cursor"] == default.headers["X-Next-Cursor"]
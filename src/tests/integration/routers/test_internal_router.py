@@ -0,0 +1,22 @@
+def test_db_pool_stats(client):
+    response = client.get("/api/internal/db/pool")
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert "wait_time_histogram" in data["sync"]
+    assert "pool" in data["sync"]
+
+
+def test_cache_stats(client):
+    response = client.get("/api/internal/cache")
+
+    assert response.status_code == 200, response.text
+    data = response.json()
+    assert set(data["principal"]["local"]) >= {"hits", "misses", "evictions"}
+
+
+def test_password_hasher_stats(client):
+    response = client.get("/api/internal/password-hasher")
+
+    assert response.status_code == 200, response.text
+    assert set(response.json()) >= {"running", "queued", "rejected"}
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 from conftest import test_user
+from app.helpers.api.rate_limiter import RateLimitState
 
 
 def test_get_me(client, get_token):
@@ -36,3 +37,28 @@ def test_update_avatar_user(mock_upload_file, client, get_token):
     assert data["avatar"] == fake_url
 
     mock_upload_file.assert_called_once()
+
+
+def test_get_me_rate_limit_headers(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    with patch("app.helpers.api.rate_limiter.limiter.storage") as storage:
+        storage.hit.return_value = RateLimitState(True, 5, 3, 42)
+        response = client.get("/api/users/me", headers=headers)
+
+    assert response.status_code == 200, response.text
+    assert response.headers["RateLimit-Limit"] == "5"
+    assert response.headers["RateLimit-Remaining"] == "3"
+    assert response.headers["RateLimit-Reset"] == "42"
+
+
+def test_get_me_rate_limited(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+
+    with patch("app.helpers.api.rate_limiter.limiter.storage") as storage:
+        storage.hit.return_value = RateLimitState(False, 5, 0, 42)
+        response = client.get("/api/users/me", headers=headers)
+
+    assert response.status_code == 429, response.text
+    assert response.headers["Retry-After"] == "42"
+    assert response.headers["RateLimit-Remaining"] == "0"
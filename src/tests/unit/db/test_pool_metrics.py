@@ -0,0 +1,62 @@
+import sqlite3
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+from db.pool_metrics import PoolMetrics, timed_pool_class
+
+
+def make_pool(metrics, **kwargs):
+    pool_class = timed_pool_class(QueuePool, metrics)
+    return pool_class(lambda: sqlite3.connect(":memory:"), **kwargs)
+
+
+def test_observe_wait_fills_histogram():
+    metrics = PoolMetrics()
+
+    metrics.observe_wait(0.0005)  # 0.5 ms
+    metrics.observe_wait(0.2)  # 200 ms
+    metrics.observe_wait(60)  # beyond the last bucket
+
+    snapshot = metrics.snapshot()
+    assert snapshot["wait_count"] == 3
+    assert snapshot["wait_time_histogram"]["le_1ms"] == 1
+    assert snapshot["wait_time_histogram"]["le_250ms"] == 1
+    assert snapshot["wait_time_histogram"]["le_inf"] == 1
+    assert snapshot["wait_max_ms"] == 60000
+
+
+def test_timed_pool_records_checkouts():
+    metrics = PoolMetrics()
+    pool = make_pool(metrics, pool_size=2, max_overflow=0)
+
+    first = pool.connect()
+    second = pool.connect()
+    snapshot = metrics.snapshot(pool)
+    first.close()
+    second.close()
+
+    assert snapshot["wait_count"] == 2
+    assert snapshot["checkedout"] == 2
+    assert snapshot["overflow"] == 0
+
+
+def test_timed_pool_counts_timeouts():
+    metrics = PoolMetrics()
+    pool = make_pool(metrics, pool_size=1, max_overflow=0, timeout=0.01)
+
+    connection = pool.connect()
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    connection.close()
+
+    assert metrics.snapshot()["timeouts"] == 1
+
+
+def test_timed_pool_keeps_metrics_after_recreate():
+    metrics = PoolMetrics()
+    pool = make_pool(metrics, pool_size=1, max_overflow=0)
+
+    recreated = pool.recreate()
+    recreated.connect().close()
+
+    assert metrics.snapshot()["wait_count"] == 1
@@ -0,0 +1,83 @@
+import json
+import time
+from unittest.mock import MagicMock
+from app.helpers.cache.lru import LRUCache
+from app.helpers.cache.invalidation import InvalidationBus
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" becomes the least recently used entry
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_lru_expires_entries():
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, ttl_seconds=0.01)
+
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_delete_tag():
+    cache = LRUCache(max_size=10, ttl_seconds=60)
+    cache.set("a", 1, tag="user:1")
+    cache.set("b", 2, tag="user:1")
+    cache.set("c", 3, tag="user:2")
+
+    cache.delete_tag("user:1")
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_bus_dispatches_messages_from_other_workers():
+    bus = InvalidationBus(MagicMock(), channel="test")
+    handler = MagicMock()
+    bus.subscribe("principal", handler)
+    message = {
+        "topic": "principal",
+        "origin": "another-worker",
+        "payload": {"user_id": 1},
+    }
+
+    bus._on_message({"data": json.dumps(message)})
+
+    handler.assert_called_once_with({"user_id": 1})
+
+
+def test_bus_skips_its_own_messages():
+    bus = InvalidationBus(MagicMock(), channel="test")
+    handler = MagicMock()
+    bus.subscribe("principal", handler)
+    message = {"topic": "principal", "origin": bus.origin, "payload": {"user_id": 1}}
+
+    bus._on_message({"data": json.dumps(message)})
+
+    handler.assert_not_called()
+
+
+def test_bus_publish_includes_origin():
+    client = MagicMock()
+    bus = InvalidationBus(client, channel="test")
+
+    bus.publish("principal", {"user_id": 1})
+
+    channel, raw = client.publish.call_args.args
+    assert channel == "test"
+    assert json.loads(raw) == {
+        "topic": "principal",
+        "origin": bus.origin,
+        "payload": {"user_id": 1},
+    }
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock
+import pytest
+from app.helpers.api.contact_events import (
+    RESYNC,
+    ContactEventBroker,
+    format_event,
+    stream_events,
+)
+
+
+def make_broker(buffer_size=10):
+    return ContactEventBroker(MagicMock(), buffer_size=buffer_size)
+
+
+@pytest.mark.asyncio
+async def test_events_reach_only_the_streams_of_the_user():
+    broker = make_broker()
+    mine, other = broker.open(1), broker.open(2)
+
+    broker.publish(1, "created", [5])
+
+    assert await mine.get(1) == {"type": "created", "ids": [5]}
+    assert await other.get(0.01) is None
+    broker.bus.publish.assert_called_once_with(
+        ContactEventBroker.TOPIC, {"user_id": 1, "type": "created", "ids": [5]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_events_from_other_workers_are_delivered_across_threads():
+    broker = make_broker()
+    stream = broker.open(1)
+
+    listener = threading.Thread(
+        target=broker._on_event, args=({"user_id": 1, "type": "deleted", "ids": [3]},)
+    )
+    listener.start()
+    listener.join()
+
+    assert await stream.get(1) == {"type": "deleted", "ids": [3]}
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_is_replaced_by_a_resync():
+    broker = make_broker(buffer_size=2)
+    stream = broker.open(1)
+
+    for contact_id in range(3):
+        broker.publish(1, "updated", [contact_id])
+    await asyncio.sleep(0)
+
+    assert await stream.get(1) == RESYNC
+    assert await stream.get(0.01) is None
+    assert broker.stats()["overflows"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_bus_connection_asks_every_stream_to_resync():
+    broker = make_broker()
+    streams = [broker.open(1), broker.open(2)]
+
+    broker._on_event(None)
+
+    for stream in streams:
+        assert await stream.get(1) == RESYNC
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_heartbeats_and_unregisters_on_close():
+    broker = make_broker()
+    events = stream_events(broker, 1, heartbeat=0.01)
+
+    assert await events.__anext__() == "retry: 5000\n\n"
+    assert await events.__anext__() == ": heartbeat\n\n"
+    assert broker.stats()["streams"] == 1
+    broker.publish(1, "created", [7])
+    assert await events.__anext__() == format_event({"type": "created", "ids": [7]})
+
+    await events.aclose()
+    assert broker.stats()["streams"] == 0
+
+
+def test_format_event():
+    assert format_event({"type": "created", "ids": [1, 2]}) == (
+        'event: created\ndata: {"ids": [1, 2]}\n\n'
+    )
+    assert format_event(RESYNC) == "event: resync\ndata: {}\n\n"
@@ -0,0 +1,19 @@
+from app.helpers.api.etag import make_etag, not_modified
+
+
+def test_etag_is_weak_and_built_from_the_version():
+    assert make_etag(7, 42) == 'W/"7.42"'
+    assert make_etag(7, 42, "2026-06-10") == 'W/"7.42.2026-06-10"'
+    assert make_etag(7, None) is None
+
+
+def test_not_modified_compares_tags_weakly():
+    etag = make_etag(7, 42)
+
+    response = not_modified(etag, '"other", "7.42"')
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert not_modified(etag, "*").status_code == 304
+    assert not_modified(etag, 'W/"7.41"') is None
+    assert not_modified(etag, None) is None
+    assert not_modified(None, "*") is None
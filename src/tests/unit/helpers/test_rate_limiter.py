@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pytest
+import redis
+from app.helpers.api.rate_limiter import (
+    HybridRateLimitStorage,
+    RateLimiter,
+    RateLimitExceeded,
+    RateLimitState,
+    RedisRateLimitStorage,
+    get_rate_limit_key,
+    parse_rate,
+)
+
+
+def make_request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+def test_parse_rate():
+    assert parse_rate("5/minute") == (5, 60)
+    assert parse_rate("100/15 minutes") == (100, 900)
+    with pytest.raises(ValueError):
+        parse_rate("5 per minute")
+
+
+def test_redis_storage_runs_one_script_call():
+    client = MagicMock()
+    script = client.register_script.return_value
+    script.return_value = [1, 4, 59_500]
+    storage = RedisRateLimitStorage(client, prefix="test")
+
+    state = storage.hit("me:user:1", 5, 60)
+
+    script.assert_called_once()
+    assert script.call_args.kwargs["keys"] == ["test:me:user:1"]
+    assert script.call_args.kwargs["args"][:2] == [5, 60_000]
+    assert state == RateLimitState(True, 5, 4, 60)
+
+
+def test_limiter_records_state_for_headers():
+    storage = MagicMock()
+    storage.hit.return_value = RateLimitState(True, 5, 4, 60)
+    limiter = RateLimiter(storage, key_func=lambda request: "user:1")
+    request = make_request()
+
+    limiter.check(request, "me", "5/minute")
+
+    storage.hit.assert_called_once_with("me:user:1", 5, 60)
+    assert request.state.rate_limit.headers() == {
+        "RateLimit-Limit": "5",
+        "RateLimit-Remaining": "4",
+        "RateLimit-Reset": "60",
+    }
+
+
+def test_limiter_raises_when_exhausted():
+    storage = MagicMock()
+    storage.hit.return_value = RateLimitState(False, 5, 0, 12)
+    limiter = RateLimiter(storage, key_func=lambda request: "user:1")
+
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        limiter.check(make_request(), "me", "5/minute")
+
+    assert exc_info.value.state.headers()["Retry-After"] == "12"
+
+
+def test_limiter_fails_open_when_redis_is_down():
+    storage = MagicMock()
+    storage.hit.side_effect = redis.ConnectionError("down")
+    limiter = RateLimiter(storage, key_func=lambda request: "ip:1.2.3.4")
+    request = make_request()
+
+    limiter.check(request, "me", "5/minute")
+
+    assert not hasattr(request.state, "rate_limit")
+
+
+def test_hybrid_storage_decides_locally():
+    client = MagicMock()
+    storage = HybridRateLimitStorage(client, sync_interval=60)
+
+    states = [storage.hit("me:user:1", 3, 60) for _ in range(4)]
+
+    assert [state.allowed for state in states] == [True, True, True, False]
+    assert states[2].remaining == 0
+    client.pipeline.assert_not_called()
+
+
+def test_hybrid_sync_pushes_pending_and_pulls_global_count():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    storage = HybridRateLimitStorage(client, sync_interval=60, prefix="test")
+    storage.hit("me:user:1", 5, 60)
+    storage.hit("me:user:1", 5, 60)
+    # Other workers consumed two more in the meantime
+    pipe.execute.return_value = [4, True]
+
+    storage.sync()
+
+    redis_key, pending = pipe.incrby.call_args.args
+    assert redis_key.startswith("test:me:user:1:")
+    assert pending == 2
+    state = storage.hit("me:user:1", 5, 60)
+    assert state.allowed
+    assert state.remaining == 0
+    assert not storage.hit("me:user:1", 5, 60).allowed
+
+
+def test_hybrid_sync_keeps_pending_hits_when_redis_is_down():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.side_effect = redis.ConnectionError("down")
+    storage = HybridRateLimitStorage(client, sync_interval=60)
+    storage.hit("me:user:1", 5, 60)
+
+    storage.sync()
+    pipe.execute.side_effect = None
+    pipe.execute.return_value = [1, True]
+    storage.sync()
+
+    assert pipe.incrby.call_args.args[1] == 1
+
+
+def test_rate_limit_key_uses_the_resolved_user_without_a_lookup():
+    request = make_request()
+    request.client = SimpleNamespace(host="1.2.3.4")
+    request.headers = {"Authorization": "Bearer unknown-token"}
+
+    # No user resolved yet: the bearer token alone does not name a user
+    assert get_rate_limit_key(request) == "ip:1.2.3.4"
+
+    request.state.user_id = 7
+    assert get_rate_limit_key(request) == "user:7"
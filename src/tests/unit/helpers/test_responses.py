@@ -0,0 +1,27 @@
+import json
+from datetime import date
+from unittest.mock import patch
+from app.helpers.api.responses import FastJSONResponse, dump_json
+
+ROWS = [{"id": 1, "birthday": date(1990, 1, 2), "name": "Žofia"}]
+
+
+def test_dump_json_encodes_dates():
+    assert json.loads(dump_json(ROWS)) == [
+        {"id": 1, "birthday": "1990-01-02", "name": "Žofia"}
+    ]
+
+
+def test_dump_json_falls_back_to_the_standard_library():
+    with patch("app.helpers.api.responses.orjson", None):
+        assert json.loads(dump_json(ROWS)) == [
+            {"id": 1, "birthday": "1990-01-02", "name": "Žofia"}
+        ]
+        assert b" " not in dump_json([1, 2])
+
+
+def test_fast_json_response():
+    response = FastJSONResponse({"ok": True})
+
+    assert response.body == b'{"ok":true}'
+    assert response.media_type == "application/json"
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from app.helpers.cache.search_index import ContactDocument, ContactSearchIndex
+
+
+def make_contact(contact_id, first_name, last_name, emails=(), phones=(), notes=()):
+    return SimpleNamespace(
+        id=contact_id,
+        first_name=first_name,
+        last_name=last_name,
+        emails=[SimpleNamespace(email=email) for email in emails],
+        phones=[SimpleNamespace(phone=phone) for phone in phones],
+        additional_data_items=[SimpleNamespace(value=note) for note in notes],
+    )
+
+
+CONTACTS = {
+    1: [
+        make_contact(1, "Maryjo", "Smith"),
+        make_contact(2, "Anna", "Johnson", phones=["+380501112233"]),
+        make_contact(3, "John", "Doe", emails=["jd@example.com"]),
+        make_contact(4, "Peter", "Parker", notes=["met at the JOB fair"]),
+        make_contact(5, "Bob", "Marley"),
+    ],
+    2: [make_contact(6, "Joanna", "Other"), make_contact(7, "Jim", "Other")],
+}
+
+
+def load(db, user_id, batch_size):
+    contacts = CONTACTS[user_id]
+    for start in range(0, len(contacts), batch_size):
+        yield contacts[start : start + batch_size]
+
+
+def make_index(**kwargs):
+    options = {"max_documents": 100, "background": False, "batch_size": 2}
+    options.update(kwargs)
+    return ContactSearchIndex(session_factory=MagicMock(), bus=MagicMock(), **options)
+
+
+def test_document_keeps_every_searchable_value():
+    document = ContactDocument.from_contact(CONTACTS[1][1])
+
+    assert document.name == "anna johnson"
+    assert "+380501112233" in document.text
+
+
+def test_search_ranks_like_the_sql_search():
+    index = make_index()
+
+    ids = index.search(1, "jo", 10, load)
+
+    # Name prefix, then word prefix, then any other substring
+    assert ids[:2] == [3, 2]
+    assert set(ids[2:]) == {1, 4}
+
+
+def test_search_matches_phones_notes_and_typos():
+    index = make_index()
+
+    assert index.search(1, "50111", 10, load) == [2]
+    assert index.search(1, "job fair", 10, load) == [4]
+    # Two of the three n-grams of "mraley" are missing, "marlye" keeps most
+    assert index.search(1, "marlye", 10, load) == [5]
+    assert index.search(1, "zzz", 10, load) == []
+
+
+def test_cold_user_falls_back_until_built_in_background():
+    index = make_index(background=True)
+
+    assert index.search(1, "john", 10, load) is None
+    index._executor.shutdown(wait=True)
+
+    assert index.search(1, "john", 10, load) == [3, 2]
+    assert index.stats()["builds"] == 1
+
+
+def test_writes_update_a_warm_index_and_notify_other_workers():
+    index = make_index()
+    index.search(1, "x", 10, load)
+
+    index.upsert(1, [make_contact(8, "Zelda", "New")])
+    index.upsert(1, [make_contact(3, "Johnny", "Doe")])
+    index.remove(1, 5)
+
+    assert index.search(1, "zelda", 10, load) == [8]
+    assert index.search(1, "johnny", 10, load)[0] == 3
+    assert index.search(1, "marley", 10, load) == []
+    assert index.stats()["documents"] == 5
+    index.bus.publish.assert_called_with(
+        ContactSearchIndex.TOPIC, {"user_id": 1, "remove": [5]}
+    )
+
+
+def test_cold_users_are_evicted_past_the_budget():
+    index = make_index(max_documents=6)
+    index.search(1, "x", 10, load)
+    index.search(2, "x", 10, load)
+
+    stats = index.stats()
+    assert stats["users"] == 1
+    assert stats["documents"] == 2
+    assert stats["evictions"] == 1
+
+
+def test_user_larger_than_the_budget_is_not_indexed():
+    index = make_index(max_documents=3)
+
+    assert index.search(1, "john", 10, load) is None
+    assert index.stats()["users"] == 0
+
+
+def test_write_during_a_build_discards_it():
+    index = make_index()
+
+    def load_with_concurrent_write(db, user_id, batch_size):
+        yield CONTACTS[user_id]
+        index.remove(user_id, 5)
+
+    assert index.search(1, "marley", 10, load_with_concurrent_write) is None
+    assert index.search(1, "marley", 10, load) == [5]
+
+
+def test_writes_of_another_worker_are_applied_to_the_warm_index():
+    writer, reader = make_index(), make_index()
+    reader.search(1, "x", 10, load)
+
+    writer.upsert(1, [make_contact(8, "Zelda", "New")])
+    writer.remove(1, 5)
+    for call in writer.bus.publish.call_args_list:
+        reader._on_invalidation(call.args[1])
+
+    assert reader.search(1, "zelda", 10, load) == [8]
+    assert reader.search(1, "marley", 10, load) == []
+    assert reader.stats()["builds"] == 1
+    assert reader.stats()["documents"] == 5
+
+
+def test_invalidation_from_another_worker_drops_the_user():
+    index = make_index()
+    index.search(1, "x", 10, load)
+
+    index._on_invalidation({"user_id": 1})
+
+    assert index.stats()["users"] == 0
@@ -0,0 +1,112 @@
+import pytest
+import pytest_asyncio
+from datetime import date
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from db.models.base import Base
+from db.models.user import User
+from app.repositories.contacts.async_crud import AsyncContactsRepository
+from app.repositories.users.async_users import AsyncUsersRepository
+from app.routers.contacts.schemas import ContactCreate, ContactUpdate
+from app.routers.contacts.schemas import Contact as ContactSchema
+
+# In-memory SQLite shared by every connection of the async engine
+DATABASE_URL = "sqlite+aiosqlite:///:memory:"
+
+
+@pytest_asyncio.fixture
+async def async_db():
+    """Fixture to set up and tear down the async test database."""
+    engine = create_async_engine(DATABASE_URL, poolclass=StaticPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = async_sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+    async with session_factory() as db:
+        yield db
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def test_user(async_db):
+    """Fixture to create a test user."""
+    user = User(username="asyncuser", email="async@example.com", password="hashed")
+    async_db.add(user)
+    await async_db.commit()
+    return user
+
+
+@pytest.mark.asyncio
+async def test_create_and_get_contact(async_db, test_user):
+    """The async repository creates and reads back a fully loaded contact."""
+    repository = AsyncContactsRepository()
+    contact_data = ContactCreate(
+        first_name="John",
+        last_name="Doe",
+        birthday=date(1990, 1, 1),
+        emails=[{"email": "john.async@example.com"}],
+        phones=[{"phone": "1234567890"}],
+        additional_data=[{"key": "note", "value": "async"}],
+    )
+
+    created = await repository.create_contact(async_db, contact_data, test_user.id)
+    fetched = await repository.get_contact(async_db, created.id, test_user.id)
+    (change,) = repository.pop_changes(async_db)
+    assert change.contact_ids == [created.id]
+
+    # Serialization happens outside of run_sync, so the children must be loaded
+    contact = ContactSchema.model_validate(fetched)
+    assert contact.first_name == "John"
+    assert contact.emails[0].email == "john.async@example.com"
+    assert contact.additional_data[0].value == "async"
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_contact(async_db, test_user):
+    """Updates and deletes go through the same run_sync bridge."""
+    repository = AsyncContactsRepository()
+    created = await repository.create_contact(
+        async_db,
+        ContactCreate(first_name="Jane", last_name="Smith", birthday=None),
+        test_user.id,
+    )
+
+    updated = await repository.update_contact(
+        async_db, created.id, ContactUpdate(first_name="Janet"), test_user.id
+    )
+    assert ContactSchema.model_validate(updated).first_name == "Janet"
+
+    deleted = await repository.delete_contact(async_db, created.id, test_user.id)
+    assert deleted.id == created.id
+    assert await repository.get_contact(async_db, created.id, test_user.id) is None
+
+
+@pytest.mark.asyncio
+async def test_get_contacts_after(async_db, test_user):
+    """Keyset pagination works on the async stack."""
+    repository = AsyncContactsRepository()
+    for i in range(3):
+        await repository.create_contact(
+            async_db,
+            ContactCreate(first_name=f"Name{i}", last_name="Last", birthday=None),
+            test_user.id,
+        )
+
+    first_page = await repository.get_contacts_after(async_db, test_user.id, None, 2)
+    second_page = await repository.get_contacts_after(
+        async_db, test_user.id, first_page[-1].id, 2
+    )
+
+    assert len(first_page) == 2
+    assert len(second_page) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_user_by_username(async_db, test_user):
+    """The async users repository is case-insensitive like the sync one."""
+    repository = AsyncUsersRepository()
+
+    user = await repository.get_user_by_username(async_db, "ASYNCUSER")
+
+    assert user.id == test_user.id
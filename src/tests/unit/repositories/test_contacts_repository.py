@@ -1,16 +1,27 @@
 import pytest
-from sqlalchemy import create_engine
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, func, select, type_coerce
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import sessionmaker
 from db.models.contact import Contact, Email, Phone, AdditionalData
 from db.models.user import User
 from app.repositories.contacts.crud import ContactsRepository
-from app.routers.contacts.schemas import ContactCreate, AdditionalDataCreate
+from app.helpers.cache.search_index import ContactSearchIndex
+from app.services.contacts.changes import apply_changes
+from app.routers.contacts.schemas import (
+    ContactCreate,
+    ContactUpdate,
+    AdditionalDataCreate,
+)
+from app.routers.contacts.schemas import Contact as ContactSchema
 from db.models.base import Base  # Import the Base from db.models to include all models
 
+import re
 import sys
 import os
 import uuid
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
 
@@ -173,3 +184,736 @@ def test_duplicate_user_creation(test_db):
     test_db.add(duplicate_user)
     with pytest.raises(Exception):  # Use specific exception if possible
         test_db.commit()
+
+
+def _add_contacts(test_db, user_id, count):
+    for i in range(count):
+        test_db.add(
+            Contact(
+                first_name=f"Name{i}",
+                last_name=f"Last{i}",
+                user_id=user_id,
+                emails=[Email(email=f"{uuid.uuid4().hex}@example.com")],
+                phones=[Phone(phone=uuid.uuid4().hex)],
+                additional_data=[AdditionalData(key="note", value=str(i))],
+            )
+        )
+    test_db.commit()
+
+
+@pytest.mark.parametrize("strategy", ["selectin", "joined", "subquery"])
+def test_get_contacts_statement_count_is_constant(
+    test_db, contacts_repository, test_user, strategy, record_statements
+):
+    """Serializing a page of contacts must not lazy-load the children per row."""
+    contacts_repository.load_strategy = strategy
+    _add_contacts(test_db, test_user.id, 30)
+
+    def read_page(limit):
+        contacts = contacts_repository.get_contacts(test_db, test_user.id, limit=limit)
+        return [ContactSchema.model_validate(c) for c in contacts]
+
+    with record_statements(test_db) as small:
+        small_page = read_page(2)
+    test_db.expire_all()
+    with record_statements(test_db) as large:
+        large_page = read_page(25)
+
+    assert len(small_page) == 2
+    assert len(large_page) == 25
+    assert all(len(c.emails) == 1 for c in large_page)
+    assert len(small) == len(large)
+
+
+def test_create_contact_returns_loaded_children(
+    test_db, contacts_repository, test_user, record_statements
+):
+    """The created contact is serializable without extra lazy loads."""
+    contact_data = ContactCreate(
+        first_name="John",
+        last_name="Doe",
+        birthday=date(1990, 1, 1),
+        emails=[{"email": "loaded@example.com"}],
+    )
+    contact = contacts_repository.create_contact(test_db, contact_data, test_user.id)
+
+    with record_statements(test_db) as statements:
+        ContactSchema.model_validate(contact)
+    assert statements == []
+
+
+def test_get_contacts_after_walks_all_pages(test_db, contacts_repository, test_user):
+    """Keyset pages are ordered by id and neither skip nor repeat contacts."""
+    _add_contacts(test_db, test_user.id, 7)
+
+    seen = []
+    after_id = None
+    while True:
+        page = contacts_repository.get_contacts_after(
+            test_db, test_user.id, after_id, limit=3
+        )
+        if not page:
+            break
+        seen.extend(contact.id for contact in page)
+        after_id = page[-1].id
+
+    assert len(seen) == 7
+    assert seen == sorted(seen)
+
+
+def _writes(statements):
+    """The INSERT/UPDATE/DELETE statements among recorded ones."""
+    return [
+        statement
+        for statement, _ in statements
+        if statement.lstrip().split(" ", 1)[0] in ("INSERT", "UPDATE", "DELETE")
+    ]
+
+
+def test_update_contact_unchanged_issues_no_writes(
+    test_db,
+    contacts_repository,
+    test_user,
+    test_contact,
+    record_statements,
+):
+    """A PUT repeating the stored contact writes and invalidates nothing."""
+    same_data = ContactCreate(
+        first_name="John",
+        last_name="Doe",
+        birthday=date(1990, 1, 1),
+        emails=[{"email": "john.doe@example.com"}],
+        phones=[{"phone": "1234567890"}],
+        additional_data=[{"key": "note", "value": "Test contact"}],
+    )
+
+    with record_statements(test_db) as statements:
+        contacts_repository.update_contact(
+            test_db, test_contact.id, same_data, test_user.id
+        )
+
+    assert _writes(statements) == []
+    assert contacts_repository.pop_changes(test_db) == []
+
+
+def test_update_contact_writes_only_the_difference(
+    test_db, contacts_repository, test_user, test_contact, record_statements
+):
+    """Only the changed children are written, and the parent is stamped."""
+    updated_data = ContactCreate(
+        first_name="John",
+        last_name="Doe",
+        birthday=date(1990, 1, 1),
+        emails=[{"email": "john.doe@example.com"}, {"email": "john@work.com"}],
+        phones=[{"phone": "5555555555"}],
+        additional_data=[{"key": "note", "value": "Changed"}],
+    )
+
+    with record_statements(test_db) as statements:
+        contacts_repository.update_contact(
+            test_db, test_contact.id, updated_data, test_user.id
+        )
+
+    targets = sorted(
+        re.match(r"(INSERT|UPDATE|DELETE)(?: INTO| FROM)? (\w+)", statement).groups()
+        for statement in _writes(statements)
+    )
+    assert targets == [
+        ("DELETE", "phones"),
+        ("INSERT", "emails"),
+        ("INSERT", "phones"),
+        ("UPDATE", "additional_data"),
+        ("UPDATE", "contacts"),
+    ]
+    contact = contacts_repository.get_contact(test_db, test_contact.id, test_user.id)
+    assert sorted(e.email for e in contact.emails) == [
+        "john.doe@example.com",
+        "john@work.com",
+    ]
+    assert [p.phone for p in contact.phones] == ["5555555555"]
+    assert [(d.key, d.value) for d in contact.additional_data] == [("note", "Changed")]
+
+
+def test_create_contacts_bulk(test_db, contacts_repository, test_user, test_contact):
+    """Conflicting items are reported and skipped, the rest is created."""
+    batch = [
+        ContactCreate(
+            first_name="Ann",
+            last_name="Lee",
+            birthday=None,
+            emails=[{"email": "ann@example.com"}],
+            phones=[{"phone": "111"}],
+            additional_data=[{"key": "note", "value": "first"}],
+        ),
+        # Email already stored by test_contact
+        ContactCreate(
+            first_name="Bob",
+            last_name="Ray",
+            birthday=None,
+            emails=[{"email": "john.doe@example.com"}],
+        ),
+        # Phone repeats the first item of the batch
+        ContactCreate(
+            first_name="Cid",
+            last_name="Moe",
+            birthday=None,
+            phones=[{"phone": "111"}],
+        ),
+        ContactCreate(first_name="Dan", last_name="Fox", birthday=None),
+    ]
+
+    result = contacts_repository.create_contacts_bulk(test_db, batch, test_user.id)
+
+    assert [item["index"] for item in result["created"]] == [0, 3]
+    assert [(c["index"], c["field"]) for c in result["conflicts"]] == [
+        (1, "email"),
+        (2, "phone"),
+    ]
+    ann = contacts_repository.get_contact(
+        test_db, result["created"][0]["id"], test_user.id
+    )
+    assert ann.first_name == "Ann"
+    assert [e.email for e in ann.emails] == ["ann@example.com"]
+    assert [p.phone for p in ann.phones] == ["111"]
+    assert [(d.key, d.value) for d in ann.additional_data] == [("note", "first")]
+
+
+def test_create_contacts_bulk_inserts_children_in_one_statement(
+    test_db, contacts_repository, test_user, record_statements
+):
+    """Children are inserted with one executemany per table, not per contact."""
+    batch = [
+        ContactCreate(
+            first_name=f"Name{i}",
+            last_name="Bulk",
+            birthday=None,
+            emails=[{"email": f"bulk{i}@example.com"}],
+            phones=[{"phone": f"bulk{i}"}],
+        )
+        for i in range(50)
+    ]
+
+    with record_statements(test_db) as statements:
+        contacts_repository.create_contacts_bulk(test_db, batch, test_user.id)
+
+    child_inserts = [
+        w for w in _writes(statements) if w.startswith(("INSERT INTO emails", "INSERT INTO phones"))
+    ]
+    assert len(child_inserts) == 2
+    assert test_db.query(Email).filter(Email.email.like("bulk%")).count() == 50
+
+
+def test_create_contacts_bulk_survives_a_lost_race(
+    test_db, contacts_repository, test_user, test_contact, monkeypatch
+):
+    """A unique violation missed by the pre-check only rejects its own item."""
+    monkeypatch.setattr(
+        ContactsRepository, "_find_bulk_conflicts", staticmethod(lambda db, c: {})
+    )
+    batch = [
+        ContactCreate(
+            first_name="Bob",
+            last_name="Ray",
+            birthday=None,
+            emails=[{"email": "john.doe@example.com"}],
+        ),
+        ContactCreate(first_name="Dan", last_name="Fox", birthday=None),
+    ]
+
+    result = contacts_repository.create_contacts_bulk(test_db, batch, test_user.id)
+
+    assert [item["index"] for item in result["created"]] == [1]
+    assert [conflict["index"] for conflict in result["conflicts"]] == [0]
+
+
+def test_iter_contacts_yields_every_contact_in_batches(
+    test_db, contacts_repository, test_user
+):
+    """Contacts come in id order, batch by batch, with their children loaded."""
+    _add_contacts(test_db, test_user.id, 7)
+
+    batches = list(contacts_repository.iter_contacts(test_db, test_user.id, 3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    ids = [contact.id for batch in batches for contact in batch]
+    assert ids == sorted(ids)
+    assert all(len(contact.emails) == 1 for batch in batches for contact in batch)
+
+
+def _add_birthdays(test_db, user_id, birthdays):
+    for i, birthday in enumerate(birthdays):
+        test_db.add(
+            Contact(
+                first_name=f"Born{i}",
+                last_name="Soon",
+                birthday=birthday,
+                user_id=user_id,
+            )
+        )
+    test_db.commit()
+
+
+@pytest.mark.parametrize(
+    "today, days, expected",
+    [
+        # Window inside one month, both ends included
+        (date(2026, 6, 10), 7, ["06-10", "06-17"]),
+        # Window across a month boundary
+        (date(2026, 6, 28), 7, ["06-28", "07-05"]),
+        # Window wrapping from December into January
+        (date(2026, 12, 28), 7, ["12-28", "01-04"]),
+        # Feb 29 birthdays fall inside a window over Feb 28 -> Mar 1
+        (date(2027, 2, 27), 2, ["02-29"]),
+    ],
+)
+def test_get_contacts_with_upcoming_birthdays_window(
+    test_db, contacts_repository, test_user, monkeypatch, today, days, expected
+):
+    """Upcoming birthdays are matched on the stored month/day, whatever the year."""
+    _add_birthdays(
+        test_db,
+        test_user.id,
+        [
+            date(1990, 6, 9),
+            date(1990, 6, 10),
+            date(1985, 6, 17),
+            date(1991, 6, 18),
+            date(1980, 6, 28),
+            date(1980, 7, 5),
+            date(1980, 12, 27),
+            date(1970, 12, 28),
+            date(1999, 1, 4),
+            date(1999, 1, 5),
+            date(1996, 2, 29),
+            None,
+        ],
+    )
+
+    class FrozenDate(date):
+        @classmethod
+        def today(cls):
+            return today
+
+    monkeypatch.setattr("app.repositories.contacts.crud.date", FrozenDate)
+
+    contacts = contacts_repository.get_contacts_with_upcoming_birthdays(
+        test_db, test_user.id, days=days
+    )
+
+    assert sorted(c.birthday.strftime("%m-%d") for c in contacts) == sorted(expected)
+
+
+def test_get_contacts_by_ids_only_loads_the_users_contacts(
+    test_db, contacts_repository, test_user
+):
+    """Contacts listed in a digest are loaded by id, scoped to their owner."""
+    _add_birthdays(test_db, test_user.id, [date(1990, 1, 1), date(1990, 6, 1)])
+    listed = test_db.query(Contact).filter(Contact.last_name == "Soon").first()
+
+    contacts = contacts_repository.get_contacts_by_ids(
+        test_db, test_user.id, [listed.id]
+    )
+
+    assert [c.id for c in contacts] == [listed.id]
+    assert contacts_repository.get_contacts_by_ids(test_db, test_user.id, []) == []
+    assert (
+        contacts_repository.get_contacts_by_ids(test_db, test_user.id + 1, [listed.id])
+        == []
+    )
+
+
+@pytest.mark.parametrize(
+    "criteria, index",
+    [
+        ({"name": "JOHN"}, "ix_contacts_user_id_first_name_lower"),
+        ({"lastname": "doe"}, "ix_contacts_user_id_last_name_lower"),
+        ({"email": "John.Doe@Example.com"}, "ix_emails_email_lower"),
+    ],
+)
+def test_contact_search_uses_lower_index(
+    test_db,
+    contacts_repository,
+    test_user,
+    test_contact,
+    criteria,
+    index,
+    record_statements,
+    query_plan,
+):
+    """Case-insensitive contact search is an index search, not a table scan."""
+    user_id = test_user.id
+    with record_statements(test_db) as statements:
+        contacts_repository.get_contact_by_name_lastname_email(
+            test_db, user_id, **criteria
+        )
+    plans = [
+        query_plan(test_db, statement, parameters)
+        for statement, parameters in statements
+        if statement.lstrip().startswith("SELECT")
+    ]
+
+    # The first statement is the search itself, the others load the children
+    assert f"USING INDEX {index}" in plans[0]
+    assert "SCAN" not in plans[0]
+
+
+def _add_named_contacts(test_db, user_id, names):
+    for first_name, last_name, email in names:
+        test_db.add(
+            Contact(
+                first_name=first_name,
+                last_name=last_name,
+                user_id=user_id,
+                emails=[Email(email=email)] if email else [],
+            )
+        )
+    test_db.commit()
+
+
+def test_search_contacts_ranks_prefix_matches_first(
+    test_db, contacts_repository, test_user
+):
+    _add_named_contacts(
+        test_db,
+        test_user.id,
+        [
+            ("Maryjo", "Smith", None),
+            ("Anna", "Johnson", None),
+            ("John", "Doe", None),
+            ("Peter", "Parker", "pj.joplin@example.com"),
+            ("Bob", "Marley", None),
+        ],
+    )
+
+    contacts = contacts_repository.search_contacts(test_db, test_user.id, " JO ")
+
+    # Name prefix, then word prefix, then substring of a name or an email
+    assert [c.first_name for c in contacts][:2] == ["John", "Anna"]
+    assert {c.first_name for c in contacts[2:]} == {"Maryjo", "Peter"}
+
+
+def test_search_contacts_is_scoped_limited_and_escaped(
+    test_db, contacts_repository, test_user
+):
+    other = User(username="other", email="other@example.com", password="x")
+    test_db.add(other)
+    test_db.commit()
+    _add_named_contacts(
+        test_db,
+        test_user.id,
+        [("Jo", f"Doe{i}", None) for i in range(5)] + [("100%", "Pure", None)],
+    )
+    _add_named_contacts(test_db, other.id, [("Joanna", "Other", None)])
+
+    contacts = contacts_repository.search_contacts(test_db, test_user.id, "jo", 3)
+    assert len(contacts) == 3
+    assert all(c.user_id == test_user.id for c in contacts)
+
+    # LIKE wildcards in the term are matched literally
+    percent = contacts_repository.search_contacts(test_db, test_user.id, "0%")
+    assert [c.first_name for c in percent] == ["100%"]
+
+
+def test_search_contacts_is_fuzzy_on_postgresql():
+    """PostgreSQL adds the trigram word-similarity match and ranking."""
+    where, rank = ContactsRepository._search_criteria("jhon", "postgresql")
+    sql = str(
+        select(Contact.id)
+        .where(where)
+        .order_by(*rank)
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert "<%% contacts.search_text" in sql
+    assert "word_similarity(" in sql
+
+
+def test_search_contacts_uses_the_memory_index_when_warm(
+    test_db, contacts_repository, test_user
+):
+    _add_named_contacts(
+        test_db,
+        test_user.id,
+        [("John", "Doe", None), ("Anna", "Johnson", "anna@example.com")],
+    )
+    contacts_repository.search_backend = "memory"
+    contacts_repository.search_index = ContactSearchIndex(
+        100, session_factory=TestingSessionLocal, bus=MagicMock(), background=False
+    )
+
+    contacts = contacts_repository.search_contacts(test_db, test_user.id, "JO")
+    assert [c.first_name for c in contacts] == ["John", "Anna"]
+    assert contacts[1].emails[0].email == "anna@example.com"
+    john_id, anna_id = (c.id for c in contacts)
+
+    # Writes go straight into the warm index
+    created = contacts_repository.create_contact(
+        test_db,
+        ContactCreate(first_name="Joseph", last_name="Quill", birthday=None),
+        test_user.id,
+    )
+    contacts_repository.delete_contact(test_db, john_id, test_user.id)
+    apply_changes(contacts_repository.pop_changes(test_db), contacts_repository)
+    contacts = contacts_repository.search_contacts(test_db, test_user.id, "jo")
+
+    assert [c.id for c in contacts] == [created.id, anna_id]
+    assert contacts_repository.search_index.stats()["builds"] == 1
+
+
+def test_additional_data_stored_as_json_attributes(
+    test_db, contacts_repository, test_user
+):
+    contacts_repository.additional_data_storage = "jsonb"
+    created = contacts_repository.create_contact(
+        test_db,
+        ContactCreate(
+            first_name="Jay",
+            last_name="Son",
+            birthday=None,
+            additional_data=[{"key": "team", "value": "red"}],
+        ),
+        test_user.id,
+    )
+
+    assert created.additional_data == []
+    assert created.attributes == [{"key": "team", "value": "red"}]
+    assert ContactSchema.model_validate(created).additional_data[0].model_dump() == {
+        "id": None,
+        "key": "team",
+        "value": "red",
+    }
+
+    contacts_repository.update_contact(
+        test_db,
+        created.id,
+        ContactUpdate(additional_data=[{"key": "team", "value": "blue"}]),
+        test_user.id,
+    )
+    assert created.attributes == [{"key": "team", "value": "blue"}]
+
+
+def test_updating_a_row_stored_contact_moves_it_to_json(
+    test_db, contacts_repository, test_user, test_contact
+):
+    contacts_repository.additional_data_storage = "jsonb"
+
+    contacts_repository.update_contact(
+        test_db,
+        test_contact.id,
+        ContactUpdate(additional_data=[{"key": "note", "value": "moved"}]),
+        test_user.id,
+    )
+
+    assert test_db.scalars(select(AdditionalData)).all() == []
+    assert [tuple(item) for item in test_contact.additional_data_items] == [
+        ("note", "moved")
+    ]
+
+
+def test_moving_a_contact_back_to_rows_clears_attributes_to_sql_null(
+    test_db, contacts_repository, test_user
+):
+    contacts_repository.additional_data_storage = "jsonb"
+    created = contacts_repository.create_contact(
+        test_db,
+        ContactCreate(
+            first_name="Back",
+            last_name="Rows",
+            birthday=None,
+            additional_data=[{"key": "team", "value": "red"}],
+        ),
+        test_user.id,
+    )
+    contacts_repository.additional_data_storage = "rows"
+
+    contacts_repository.update_contact(
+        test_db,
+        created.id,
+        ContactUpdate(additional_data=[{"key": "team", "value": "blue"}]),
+        test_user.id,
+    )
+
+    # A JSON 'null' would break the migration's array checks
+    assert test_db.scalar(
+        select(Contact.attributes.is_(None)).where(Contact.id == created.id)
+    )
+    assert [(d.key, d.value) for d in created.additional_data] == [("team", "blue")]
+
+
+def test_get_contacts_by_attribute_reads_both_storages(
+    test_db, contacts_repository, test_user, test_contact
+):
+    # test_contact keeps its pair in an additional_data row
+    contacts_repository.additional_data_storage = "jsonb"
+    result = contacts_repository.create_contacts_bulk(
+        test_db,
+        [
+            ContactCreate(
+                first_name="Ann",
+                last_name="Lee",
+                birthday=None,
+                additional_data=[{"key": "note", "value": "Test contact"}],
+            ),
+            ContactCreate(
+                first_name="Bob",
+                last_name="Ray",
+                birthday=None,
+                additional_data=[{"key": "note", "value": "other"}],
+            ),
+        ],
+        test_user.id,
+    )
+
+    contacts = contacts_repository.get_contacts_by_attribute(
+        test_db, test_user.id, "note", "Test contact"
+    )
+
+    assert [c.id for c in contacts] == [test_contact.id, result["created"][0]["id"]]
+    assert contacts_repository.get_contacts_by_attribute(
+        test_db, test_user.id + 1, "note", "Test contact"
+    ) == []
+
+
+def test_attribute_filter_uses_json_containment_on_postgresql():
+    sql = str(
+        select(Contact.id)
+        .where(type_coerce(Contact.attributes, JSONB).contains([{"key": "k"}]))
+        .compile(dialect=postgresql.dialect())
+    )
+
+    assert "contacts.attributes @>" in sql
+
+
+def test_writes_record_their_changes_after_commit(
+    test_db, contacts_repository, test_user
+):
+    created = contacts_repository.create_contact(
+        test_db,
+        ContactCreate(first_name="Ver", last_name="Sion", birthday=None),
+        test_user.id,
+    )
+    contacts_repository.update_contact(
+        test_db, created.id, ContactUpdate(last_name="Two"), test_user.id
+    )
+    contacts_repository.delete_contact(test_db, created.id, test_user.id)
+    contacts_repository.create_contacts_bulk(test_db, [], test_user.id)
+
+    changes = contacts_repository.pop_changes(test_db)
+    assert [(c.user_id, c.event, c.contact_ids) for c in changes] == [
+        (test_user.id, "created", [created.id]),
+        (test_user.id, "updated", [created.id]),
+        (test_user.id, "deleted", [created.id]),
+    ]
+    assert changes[0].contacts == [created]
+    assert contacts_repository.pop_changes(test_db) == []
+
+
+def test_get_changes_returns_changed_and_deleted_contacts(
+    test_db, contacts_repository, test_user, test_contact
+):
+    removed = contacts_repository.create_contact(
+        test_db,
+        ContactCreate(first_name="Gone", last_name="Soon", birthday=None),
+        test_user.id,
+    )
+    removed_id = removed.id
+
+    full = contacts_repository.get_changes(test_db, test_user.id, None)
+    assert {c.id for c in full["changed"]} == {test_contact.id, removed_id}
+    assert full["deleted"] == []
+
+    # Back-date the untouched contact so only the later changes qualify
+    test_contact.updated_at = datetime(2000, 1, 1)
+    test_db.commit()
+    now = test_db.scalar(select(func.now())).replace(tzinfo=timezone.utc)
+    since = now - timedelta(minutes=1)
+    contacts_repository.delete_contact(test_db, removed_id, test_user.id)
+    changes = contacts_repository.get_changes(test_db, test_user.id, since)
+
+    assert changes["changed"] == []
+    assert changes["deleted"] == [removed_id]
+    assert changes["until"] < now
+    assert changes["position"] is None
+
+    contacts_repository.update_contact(
+        test_db,
+        test_contact.id,
+        ContactUpdate(phones=[{"phone": "123"}]),
+        test_user.id,
+    )
+    changes = contacts_repository.get_changes(test_db, test_user.id, since)
+    assert [c.id for c in changes["changed"]] == [test_contact.id]
+
+
+def test_get_changes_rejects_a_since_older_than_the_tombstones(
+    test_db, contacts_repository, test_user
+):
+    expired = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+    assert contacts_repository.get_changes(test_db, test_user.id, expired) is None
+
+
+def test_get_changes_pages_through_contacts_and_tombstones(
+    test_db, contacts_repository, test_user
+):
+    now = test_db.scalar(select(func.now()))
+    since = now.replace(tzinfo=timezone.utc) - timedelta(days=1)
+    ids = [
+        contacts_repository.create_contact(
+            test_db,
+            ContactCreate(first_name=f"Page{n}", last_name="Sync", birthday=None),
+            test_user.id,
+        ).id
+        for n in range(5)
+    ]
+    # Two contacts share an updated_at, so the page boundary falls on the id
+    stamps = {ids[0]: now - timedelta(hours=1), ids[1]: now - timedelta(hours=2)}
+    stamps[ids[2]] = stamps[ids[1]]
+    for contact in test_db.query(Contact).filter(Contact.id.in_(ids[:3])):
+        contact.updated_at = stamps[contact.id]
+    test_db.commit()
+    for contact_id in ids[3:]:
+        contacts_repository.delete_contact(test_db, contact_id, test_user.id)
+
+    pages, position = [], None
+    while True:
+        page = contacts_repository.get_changes(
+            test_db, test_user.id, since, limit=2, position=position
+        )
+        pages.append(([c.id for c in page["changed"]], page["deleted"]))
+        position = page["position"]
+        if position is None:
+            break
+        assert position.until == page["until"]
+
+    assert pages == [(ids[1:3], ids[3:]), ([ids[0]], [])]
+
+
+def test_contact_rows_match_the_response_schema(
+    test_db, contacts_repository, test_user, test_contact
+):
+    contacts_repository.additional_data_storage = "jsonb"
+    contacts_repository.create_contact(
+        test_db,
+        ContactCreate(
+            first_name="Json",
+            last_name="Pairs",
+            birthday=None,
+            phones=[{"phone": "777"}],
+            additional_data=[{"key": "team", "value": "red"}],
+        ),
+        test_user.id,
+    )
+    expected = [
+        ContactSchema.model_validate(contact).model_dump()
+        for contact in contacts_repository.get_contacts(test_db, test_user.id)
+    ]
+
+    rows = contacts_repository.get_contact_rows(test_db, test_user.id)
+
+    assert rows == expected
+    assert [list(row) for row in rows] == [list(row) for row in expected]
+    after = contacts_repository.get_contact_rows(
+        test_db, test_user.id, after_id=test_contact.id
+    )
+    assert [row["first_name"] for row in after] == ["Json"]
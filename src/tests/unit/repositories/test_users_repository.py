@@ -1,3 +1,4 @@
+from unittest.mock import patch
 import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
@@ -100,3 +101,42 @@ def test_update_password(test_db, users_repository, test_user):
         test_db, test_user.email, new_password
     )
     assert updated_user.password == new_password
+
+
+def test_update_password_invalidates_principal_cache(
+    test_db, users_repository, test_user
+):
+    """Changing the password drops the cached principals of the user."""
+    with patch(
+        "app.repositories.users.users.principal_cache.invalidate_user"
+    ) as invalidate_user:
+        users_repository.update_password(test_db, test_user.email, "new_hash")
+
+    invalidate_user.assert_called_once_with(test_user.id)
+
+
+@pytest.mark.parametrize(
+    "lookup, value, index",
+    [
+        ("get_user_by_username", "DeadPool", "ix_users_username_lower"),
+        ("get_user_by_email", "DEADPOOL@example.com", "ix_users_email_lower"),
+    ],
+)
+def test_case_insensitive_lookups_use_lower_index(
+    test_db,
+    users_repository,
+    test_user,
+    lookup,
+    value,
+    index,
+    record_statements,
+    query_plan,
+):
+    """Username and email lookups search the lower() index instead of scanning."""
+    with record_statements(test_db) as statements:
+        getattr(users_repository, lookup)(test_db, value)
+    ((statement, parameters),) = statements
+    plan = query_plan(test_db, statement, parameters)
+
+    assert f"USING INDEX {index}" in plan
+    assert "SCAN" not in plan
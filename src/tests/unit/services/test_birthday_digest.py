@@ -0,0 +1,91 @@
+import json
+from datetime import date, datetime, time
+from unittest.mock import MagicMock
+import redis
+from app.helpers.cache.birthday_digest import BirthdayDigestCache
+from app.services.contacts.birthday_digest import (
+    BirthdayDigestWarmer,
+    warm_birthday_digests,
+)
+
+DAY = date(2026, 6, 10)
+
+
+def test_get_returns_ids_and_marks_user_active():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [json.dumps([3, 5]), 1]
+    cache = BirthdayDigestCache(client, active_days=7)
+
+    assert cache.get(7, 3, DAY) == [3, 5]
+    pipe.get.assert_called_once_with("birthday-digest:7:3:2026-06-10")
+    assert pipe.zadd.call_args.args[0] == "birthday-digest:active"
+    assert cache.stats() == {"hits": 1, "misses": 0}
+
+
+def test_get_is_a_miss_when_redis_is_down():
+    client = MagicMock()
+    client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+    cache = BirthdayDigestCache(client, active_days=7)
+
+    assert cache.get(7, 3, DAY) is None
+
+
+def test_empty_digest_is_a_hit():
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = [b"[]", 0]
+    cache = BirthdayDigestCache(client, active_days=7)
+
+    assert cache.get(7, 3, DAY) == []
+    assert cache.stats()["hits"] == 1
+
+
+def test_active_users_trims_idle_users():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [2, [b"1", b"4"]]
+    cache = BirthdayDigestCache(client, active_days=7)
+
+    assert cache.active_users() == [1, 4]
+    pipe.zremrangebyscore.assert_called_once()
+
+
+def test_warm_birthday_digests_writes_one_digest_per_active_user():
+    cache = MagicMock()
+    cache.active_users.return_value = [1, 4, 9]
+    response_cache = MagicMock()
+    # User 9 has no contacts version yet: its next read computes the window
+    response_cache.version.side_effect = {1: 2, 4: 6, 9: None}.get
+    repository = MagicMock()
+    repository.get_upcoming_birthday_ids.side_effect = lambda db, user_id, day: [
+        user_id * 10
+    ]
+    session_factory = MagicMock()
+
+    warmed = warm_birthday_digests(
+        session_factory, repository, cache, response_cache, DAY
+    )
+
+    assert warmed == 2
+    cache.set.assert_any_call(1, 2, DAY, [10])
+    cache.set.assert_any_call(4, 6, DAY, [40])
+    assert cache.set.call_count == 2
+
+
+def test_warmer_runs_once_per_day_across_workers():
+    cache = MagicMock()
+    cache.claim_warm_up.side_effect = [True, False]
+    job = MagicMock(return_value=3)
+    warmer = BirthdayDigestWarmer(time(0, 5), job=job, cache=cache)
+
+    warmer.run_once(DAY)
+    warmer.run_once(DAY)
+
+    job.assert_called_once_with(DAY)
+
+
+def test_warmer_schedules_the_next_run():
+    warmer = BirthdayDigestWarmer(time(0, 5), job=MagicMock(), cache=MagicMock())
+
+    assert warmer.seconds_until_next_run(datetime(2026, 6, 10, 0, 0)) == 300
+    assert warmer.seconds_until_next_run(datetime(2026, 6, 10, 0, 5)) == 86400
@@ -0,0 +1,51 @@
+import threading
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from app.repositories.contacts.crud import ContactChange
+from app.services.contacts.async_contact_service import AsyncContactService
+from app.services.contacts.changes import apply_changes
+
+
+def test_apply_changes_invalidates_caches_and_updates_the_index(monkeypatch):
+    cache, events = MagicMock(), MagicMock()
+    monkeypatch.setattr("app.services.contacts.changes.contacts_response_cache", cache)
+    monkeypatch.setattr("app.services.contacts.changes.contact_events", events)
+    repository = MagicMock(search_backend="memory")
+    contact = object()
+
+    apply_changes(
+        [
+            ContactChange(1, "created", [5], [contact]),
+            ContactChange(1, "deleted", [6], []),
+            ContactChange(2, "created", [7, 8], None),
+        ],
+        repository,
+    )
+
+    assert [c.args for c in cache.bump.call_args_list] == [(1,), (1,), (2,)]
+    assert [c.args for c in events.publish.call_args_list] == [
+        (1, "created", [5]),
+        (1, "deleted", [6]),
+        (2, "created", [7, 8]),
+    ]
+    repository.search_index.upsert.assert_called_once_with(1, [contact])
+    repository.search_index.remove.assert_called_once_with(1, 6)
+    repository.search_index.invalidate_user.assert_called_once_with(2)
+
+
+@pytest.mark.asyncio
+async def test_async_service_applies_changes_off_the_event_loop(monkeypatch):
+    threads = []
+    monkeypatch.setattr(
+        "app.services.contacts.async_contact_service.apply_changes",
+        lambda changes, repository: threads.append(threading.current_thread()),
+    )
+    repository = MagicMock()
+    repository.delete_contact = AsyncMock(return_value="contact")
+    repository.pop_changes.return_value = [ContactChange(1, "deleted", [5], [])]
+    service = AsyncContactService(contacts_repository=repository)
+
+    assert await service.delete_contact(None, 5, 1) == "contact"
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.current_thread()
@@ -0,0 +1,146 @@
+import io
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from db.models.base import Base
+from db.models.contact import Contact
+from db.models.user import User
+from app.repositories.contacts.crud import ContactsRepository
+from app.services.contacts.importer import (
+    ImportJobStore,
+    detect_format,
+    parse_csv,
+    parse_vcard,
+    run_import,
+)
+
+engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+class MemoryJobStore(ImportJobStore):
+    """ImportJobStore keeping the job hashes in a dict instead of Redis."""
+
+    def __init__(self):
+        super().__init__(client=None, ttl_seconds=60)
+        self.jobs = {}
+        self.updates = 0
+
+    def _write(self, job_id, mapping):
+        self.updates += 1
+        self.jobs.setdefault(job_id, {}).update(
+            {key: str(value) for key, value in mapping.items()}
+        )
+
+    def _read(self, job_id):
+        return self.jobs.get(job_id, {})
+
+
+@pytest.fixture
+def user_id():
+    Base.metadata.create_all(bind=engine)
+    with TestingSessionLocal() as db:
+        user = User(username="importer", email="importer@example.com", password="x")
+        db.add(user)
+        db.commit()
+        yield user.id
+    Base.metadata.drop_all(bind=engine)
+
+
+CSV_FILE = (
+    "id,first_name,last_name,birthday,emails,phones,additional_data\n"
+    '1,Ann,Lee,1990-02-03,ann@example.com;ann@work.com,111,"[{""key"": ""note"", ""value"": ""hi""}]"\n'
+    "2,Bob,Ray,,not-an-email,,\n"
+    "3,Cid,Moe,,ann@example.com,,\n"
+    "4,Dan,Fox,,,222,\n"
+)
+
+VCARD_FILE = (
+    "BEGIN:VCARD\r\n"
+    "VERSION:3.0\r\n"
+    "N:Lee;Ann;;;\r\n"
+    "FN:Ann Lee\r\n"
+    "BDAY:19900203\r\n"
+    "EMAIL;TYPE=work:ann@example.com\r\n"
+    "TEL;TYPE=cell:111\r\n"
+    "NOTE:first line\\nsecond\r\n"
+    "  line\r\n"
+    "END:VCARD\r\n"
+    "BEGIN:VCARD\r\n"
+    "FN:Bob Ray\r\n"
+    "END:VCARD\r\n"
+)
+
+
+def test_detect_format():
+    assert detect_format("contacts.CSV") == "csv"
+    assert detect_format("people.vcf") == "vcard"
+    assert detect_format("notes.txt") is None
+
+
+def test_parse_csv_reads_the_export_layout():
+    rows = list(parse_csv(io.BytesIO(CSV_FILE.encode())))
+
+    assert len(rows) == 4
+    assert rows[0] == {
+        "first_name": "Ann",
+        "last_name": "Lee",
+        "birthday": "1990-02-03",
+        "emails": [{"email": "ann@example.com"}, {"email": "ann@work.com"}],
+        "phones": [{"phone": "111"}],
+        "additional_data": [{"key": "note", "value": "hi"}],
+    }
+    assert rows[3]["birthday"] is None
+
+
+def test_parse_vcard_unfolds_lines():
+    cards = list(parse_vcard(io.BytesIO(VCARD_FILE.encode())))
+
+    assert len(cards) == 2
+    assert cards[0]["first_name"] == "Ann"
+    assert cards[0]["last_name"] == "Lee"
+    assert cards[0]["birthday"] == "1990-02-03"
+    assert cards[0]["emails"] == [{"email": "ann@example.com"}]
+    assert cards[0]["additional_data"] == [
+        {"key": "note", "value": "first line\nsecond line"}
+    ]
+    assert (cards[1]["first_name"], cards[1]["last_name"]) == ("Bob", "Ray")
+
+
+def test_run_import_commits_in_chunks_and_reports_progress(user_id, tmp_path):
+    path = tmp_path / "contacts.csv"
+    path.write_text(CSV_FILE)
+    jobs = MemoryJobStore()
+    job_id = jobs.create(user_id)
+
+    run_import(
+        TestingSessionLocal,
+        ContactsRepository(),
+        jobs,
+        job_id,
+        str(path),
+        "csv",
+        user_id,
+        chunk_size=2,
+    )
+
+    job = jobs.get(job_id, user_id)
+    assert job["status"] == "done"
+    assert job["rows_read"] == 4
+    assert job["invalid"] == 1
+    assert job["conflicts"] == 1  # row 3 reuses the email of row 1
+    assert job["created"] == 2
+    assert job["errors"][0].startswith("Row 2:")
+    assert not path.exists()
+    with TestingSessionLocal() as db:
+        names = {c.first_name for c in db.query(Contact).filter_by(user_id=user_id)}
+    assert names == {"Ann", "Dan"}
+
+
+def test_import_job_is_private_to_its_user():
+    jobs = MemoryJobStore()
+    job_id = jobs.create(user_id=1)
+
+    assert jobs.get(job_id, user_id=1)["status"] == "pending"
+    assert jobs.get(job_id, user_id=2) is None
+    assert jobs.get("unknown", user_id=1) is None
@@ -110,4 +110,67 @@ def test_get_contacts_with_upcoming_birthdays():
     # Assert
     assert len(result) == 1
     assert result[0]["birthday"] == "1990-01-01"
-    mock_repository.get_contacts_with_upcoming_birthdays.assert_called_once_with(None, 1)
\ No newline at end of file
+    mock_repository.get_contacts_with_upcoming_birthdays.assert_called_once_with(None, 1)
+
+
+def test_upcoming_birthdays_are_served_from_the_digest(monkeypatch):
+    # Arrange
+    digest = MagicMock()
+    digest.get.return_value = [3, 5]
+    monkeypatch.setattr(
+        "app.services.contacts.contact_service.birthday_digest_cache", digest
+    )
+    mock_repository = MagicMock()
+    mock_repository.get_contacts_by_ids.return_value = ["contact 3", "contact 5"]
+    contact_service = ContactService(contacts_repository=mock_repository)
+
+    # Act
+    result = contact_service.get_contacts_with_upcoming_birthdays(None, 1, version=4)
+
+    # Assert
+    assert result == ["contact 3", "contact 5"]
+    assert digest.get.call_args.args[:2] == (1, 4)
+    mock_repository.get_contacts_by_ids.assert_called_once_with(None, 1, [3, 5])
+    mock_repository.get_contacts_with_upcoming_birthdays.assert_not_called()
+    digest.set.assert_not_called()
+
+
+def test_upcoming_birthdays_digest_miss_stores_the_window(monkeypatch):
+    # Arrange
+    digest = MagicMock()
+    digest.get.return_value = None
+    monkeypatch.setattr(
+        "app.services.contacts.contact_service.birthday_digest_cache", digest
+    )
+    mock_repository = MagicMock()
+    mock_repository.get_contacts_with_upcoming_birthdays.return_value = [
+        MagicMock(id=3)
+    ]
+    contact_service = ContactService(contacts_repository=mock_repository)
+
+    # Act
+    result = contact_service.get_contacts_with_upcoming_birthdays(None, 1, version=4)
+
+    # Assert
+    assert [c.id for c in result] == [3]
+    today = digest.get.call_args.args[2]
+    mock_repository.get_contacts_with_upcoming_birthdays.assert_called_once_with(
+        None, 1, today=today
+    )
+    # Stored under the version read before the query, so a write racing it
+    # bumps the version and the stale digest is never read
+    digest.set.assert_called_once_with(1, 4, today, [3])
+
+
+def test_get_contacts_after():
+    # Arrange
+    mock_repository = MagicMock()
+    mock_repository.get_contacts_after.return_value = [{"id": 6, "name": "John Doe"}]
+    contact_service = ContactService(contacts_repository=mock_repository)
+
+    # Act
+    result = contact_service.get_contacts_after(None, 1, after_id=5, limit=10)
+
+    # Assert
+    assert result[0]["id"] == 6
+    mock_repository.get_contacts_after.assert_called_once_with(None, 1, 5, 10)
@@ -0,0 +1,27 @@
+from app.services.auth.hash_calibration import calibrate_rounds
+
+
+def fake_measure(rounds):
+    # Every round doubles the cost: 10 -> 50 ms, 11 -> 100 ms, 12 -> 200 ms ...
+    return 50 * 2 ** (rounds - 10)
+
+
+def test_calibrate_picks_highest_cost_within_target():
+    rounds, timings = calibrate_rounds(250, measure=fake_measure)
+
+    assert rounds == 12
+    # Stops at the first cost over the target
+    assert list(timings) == [10, 11, 12, 13]
+
+
+def test_calibrate_never_goes_below_minimum():
+    rounds, timings = calibrate_rounds(10, measure=fake_measure)
+
+    assert rounds == 10
+    assert list(timings) == [10]
+
+
+def test_calibrate_is_capped_by_maximum():
+    rounds, _ = calibrate_rounds(10_000, max_rounds=13, measure=fake_measure)
+
+    assert rounds == 13
@@ -0,0 +1,93 @@
+import threading
+from unittest.mock import MagicMock
+import pytest
+from fastapi import HTTPException, status
+from app.services.auth.jwt_manager import Hash
+from app.services.auth.password_hasher import PasswordHasher
+
+
+def test_hash_and_verify_round_trip():
+    hasher = PasswordHasher(Hash(), max_workers=1, max_queue=1)
+
+    hashed = hasher.get_password_hash("secret")
+
+    assert hasher.verify_password("secret", hashed)
+    assert not hasher.verify_password("wrong", hashed)
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
+
+
+def test_rejects_with_503_when_saturated():
+    release = threading.Event()
+    started = threading.Event()
+    blocking_hash = MagicMock()
+
+    def slow_hash(password):
+        started.set()
+        release.wait(5)
+        return "hashed"
+
+    blocking_hash.get_password_hash.side_effect = slow_hash
+    hasher = PasswordHasher(blocking_hash, max_workers=1, max_queue=0)
+
+    worker = threading.Thread(target=hasher.get_password_hash, args=("first",))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            hasher.get_password_hash("second")
+    finally:
+        release.set()
+        worker.join(5)
+
+    assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert hasher.stats()["rejected"] == 1
+    assert hasher.stats()["completed"] == 1
+
+
+def test_verify_and_update_rehashes_outdated_cost():
+    old_hash = Hash(rounds=4).get_password_hash("secret")
+    hasher = PasswordHasher(Hash(rounds=5), max_workers=1, max_queue=1)
+
+    verified, new_hash = hasher.verify_and_update("secret", old_hash)
+
+    assert verified
+    assert new_hash is not None
+    assert not Hash(rounds=5).needs_update(new_hash)
+    assert Hash(rounds=5).verify_password("secret", new_hash)
+
+
+def test_verify_and_update_keeps_current_hash():
+    current = Hash(rounds=4).get_password_hash("secret")
+    hasher = PasswordHasher(Hash(rounds=4), max_workers=1, max_queue=1)
+
+    assert hasher.verify_and_update("secret", current) == (True, None)
+    assert hasher.verify_and_update("wrong", current) == (False, None)
+
+
+@pytest.mark.asyncio
+async def test_async_entry_points_hash_on_the_executor():
+    hasher = PasswordHasher(Hash(rounds=4), max_workers=1, max_queue=0)
+
+    hashed = await hasher.get_password_hash_async("secret")
+
+    assert await hasher.verify_and_update_async("secret", hashed) == (True, None)
+    stats = hasher.stats()
+    assert stats["completed"] == 2
+    assert stats["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_async_entry_point_releases_its_slot_on_error():
+    failing_hash = MagicMock()
+    failing_hash.get_password_hash.side_effect = ValueError("bad input")
+    hasher = PasswordHasher(failing_hash, max_workers=1, max_queue=0)
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            await hasher.get_password_hash_async("secret")
+
+    assert hasher.stats()["rejected"] == 0
@@ -0,0 +1,126 @@
+import json
+import time
+from datetime import datetime
+from unittest.mock import MagicMock
+import redis
+from app.helpers.cache.lru import LRUCache
+from app.helpers.cache.principal_cache import PrincipalCache
+from db.models.user import User, UserRole
+
+
+def make_user():
+    return User(
+        id=7,
+        username="deadpool",
+        email="deadpool@example.com",
+        password="hashed_password",
+        avatar=None,
+        created_at=datetime(2025, 1, 1, 12, 0),
+        confirmed=True,
+        role=UserRole.admin,
+    )
+
+
+def make_cache(client, bus=None):
+    return PrincipalCache(
+        client,
+        ttl_seconds=300,
+        local=LRUCache(max_size=100, ttl_seconds=60),
+        bus=bus or MagicMock(),
+    )
+
+
+def test_snapshot_round_trip_skips_password():
+    raw = PrincipalCache.serialize(make_user())
+    user = PrincipalCache.deserialize(raw)
+
+    assert "hashed_password" not in raw
+    assert user.id == 7
+    assert user.username == "deadpool"
+    assert user.created_at == datetime(2025, 1, 1, 12, 0)
+    assert user.role == UserRole.admin.value
+    assert user.password is None
+
+
+def test_get_returns_user_from_redis_and_fills_local_tier():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [PrincipalCache.serialize(make_user()), 120]
+    cache = make_cache(client)
+
+    first = cache.get("token")
+    second = cache.get("token")
+
+    assert first.email == "deadpool@example.com"
+    assert second.email == "deadpool@example.com"
+    # The second lookup is served in-process
+    pipe.execute.assert_called_once()
+    assert cache.stats()["redis_hits"] == 1
+    assert cache.stats()["local"]["hits"] == 1
+
+
+def test_get_miss_returns_none():
+    client = MagicMock()
+    client.pipeline.return_value.execute.return_value = [None, -2]
+    cache = make_cache(client)
+
+    assert cache.get("token") is None
+    assert cache.stats()["redis_misses"] == 1
+
+
+def test_set_ttl_is_bounded_by_token_expiry():
+    client = MagicMock()
+    pipe = client.pipeline.return_value
+    cache = make_cache(client)
+
+    cache.set("token", make_user(), expires_at=time.time() + 60)
+
+    ttl = pipe.set.call_args.kwargs["ex"]
+    assert 0 < ttl <= 60
+    pipe.sadd.assert_called_once_with(cache._user_key(7), cache._token_key("token"))
+    pipe.execute.assert_called_once()
+    assert cache.get("token").id == 7
+
+
+def test_set_skips_expired_token():
+    client = MagicMock()
+    cache = make_cache(client)
+
+    cache.set("token", make_user(), expires_at=time.time() - 1)
+
+    client.pipeline.assert_not_called()
+
+
+def test_invalidate_user_drops_every_token_and_broadcasts():
+    client = MagicMock()
+    client.smembers.return_value = {b"principal:token:a", b"principal:token:b"}
+    bus = MagicMock()
+    cache = make_cache(client, bus)
+    cache.set("token", make_user())
+
+    cache.invalidate_user(7)
+
+    args = client.delete.call_args.args
+    assert args[0] == cache._user_key(7)
+    assert set(args[1:]) == {b"principal:token:a", b"principal:token:b"}
+    bus.publish.assert_called_once_with(PrincipalCache.TOPIC, {"user_id": 7})
+    assert len(cache.local) == 0
+
+
+def test_invalidation_message_drops_local_entries():
+    client = MagicMock()
+    cache = make_cache(client)
+    cache.set("token", make_user())
+    client.pipeline.return_value.execute.return_value = [None, -2]
+
+    cache._on_invalidation({"user_id": 7})
+
+    assert cache.get("token") is None
+
+
+def test_redis_errors_are_treated_as_misses():
+    client = MagicMock()
+    client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+    cache = make_cache(client)
+
+    assert cache.get("token") is None
@@ -0,0 +1,87 @@
+import json
+from unittest.mock import MagicMock
+import redis
+from app.helpers.cache.response_cache import ResponseCache
+
+PARAMS = {"skip": 0, "limit": 10, "cursor": None}
+
+
+def test_key_carries_the_user_version_and_query():
+    client = MagicMock()
+    client.get.return_value = None
+    cache = ResponseCache(client, ttl=300)
+
+    assert cache.get(7, 3, "list", PARAMS) is None
+    client.get.assert_called_once_with("contacts-response:7:3:list:limit=10&skip=0")
+    assert cache.stats()["misses"] == 1
+
+
+def test_hit_returns_the_stored_body_and_headers():
+    client = MagicMock()
+    client.get.return_value = json.dumps({"X-Next-Cursor": "abc"}).encode() + b"\n[]"
+    cache = ResponseCache(client, ttl=300)
+
+    response = cache.get(7, 3, "list", PARAMS)
+
+    assert response.body == b"[]"
+    assert response.headers["X-Next-Cursor"] == "abc"
+    assert cache.stats() == {
+        "hits": 1,
+        "misses": 0,
+        "hit_ratio": 1.0,
+        "version_bumps": 0,
+    }
+
+
+def test_store_writes_with_the_ttl():
+    client = MagicMock()
+    cache = ResponseCache(client, ttl=300)
+
+    response = cache.store(7, 3, "detail", {"id": 5}, b"{}")
+
+    assert response.body == b"{}"
+    key, value = client.set.call_args.args
+    assert key == "contacts-response:7:3:detail:id=5"
+    assert value == b"{}\n{}"
+    assert client.set.call_args.kwargs == {"ex": 300}
+
+
+def test_version_is_read_and_bumped_atomically():
+    client = MagicMock()
+    version_script, bump_script = MagicMock(return_value=b"4"), MagicMock()
+    client.register_script.side_effect = [version_script, bump_script]
+    cache = ResponseCache(client, ttl=300)
+
+    assert cache.version(7) == 4
+    cache.bump(7)
+
+    version_script.assert_called_once_with(keys=["contacts-response:version:7"])
+    bump_script.assert_called_once_with(keys=["contacts-response:version:7"])
+    assert cache.stats()["version_bumps"] == 1
+
+
+def test_redis_errors_bypass_the_cache():
+    client = MagicMock()
+    client.register_script.return_value.side_effect = redis.ConnectionError("down")
+    client.get.side_effect = redis.ConnectionError("down")
+    client.set.side_effect = redis.ConnectionError("down")
+    cache = ResponseCache(client, ttl=300)
+
+    assert cache.version(7) is None
+    assert cache.get(7, None, "list", PARAMS) is None
+    assert cache.store(7, 1, "list", PARAMS, b"[]").body == b"[]"
+
+
+def test_zero_ttl_disables_caching_but_keeps_versions():
+    client = MagicMock()
+    client.register_script.return_value.return_value = 4
+    cache = ResponseCache(client, ttl=0)
+
+    assert cache.version(7) == 4
+    cache.bump(7)
+    assert cache.get(7, 4, "list", PARAMS) is None
+    cache.store(7, 4, "list", PARAMS, b"[]")
+
+    client.get.assert_not_called()
+    client.set.assert_not_called()
+    assert cache.stats()["version_bumps"] == 1